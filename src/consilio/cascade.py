@@ -0,0 +1,146 @@
+"""Try cheap models first and escalate only when their answer is not good enough
+
+A response escalates to the next model in `Config.cascade` when it fails schema
+validation, is truncated, or trips one of the HEURISTICS. Every attempt is
+appended to the topic's cascade-stats.jsonl so hit rates and latency per model
+can be reviewed with `cons cascade-stats`.
+"""
+
+import json
+import logging
+import statistics
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+from pydantic import ValidationError
+
+from consilio.models import Config, Discussion, Topic
+from consilio.pruning import is_pass
+from consilio.utils import LLMSession, TruncatedResponseError, get_llm_response
+
+CASCADE_STATS_FILE = "cascade-stats.jsonl"
+ACCEPTED = "accepted"
+
+_cascade_stats_lock = threading.Lock()
+
+
+def too_many_passes(response: Any, config: Config) -> str | None:  # noqa: ANN401
+    """Flag discussion rounds where most perspectives passed"""
+    if not isinstance(response, list) or not response:
+        return None
+    if not all(isinstance(d, Discussion) for d in response):
+        return None
+    passes = sum(is_pass(d.opinion) for d in response)
+    if passes / len(response) > config.cascade_max_pass_ratio:
+        return f"{passes}/{len(response)} passes"
+    return None
+
+
+HEURISTICS: list[Callable[[Any, Config], str | None]] = [too_many_passes]
+
+
+def _record(topic: Topic, model: str, outcome: str, started: float) -> None:
+    entry = {
+        "model": model,
+        "outcome": outcome,
+        "latency_ms": round((time.perf_counter() - started) * 1000),
+    }
+    with _cascade_stats_lock, (topic.directory / CASCADE_STATS_FILE).open("a") as stats:
+        stats.write(json.dumps(entry) + "\n")
+
+
+def _attempt(
+    topic: Topic,
+    model: str,
+    prompt: str,
+    response_definition: Any,  # noqa: ANN401
+    session: LLMSession | None,
+) -> tuple[Any, str]:
+    """Ask one model; return its response and the outcome ("accepted" or why not)"""
+    try:
+        response = get_llm_response(
+            prompt,
+            response_definition,
+            session=session,
+            model=model,
+        )
+    except ValidationError:
+        return None, "invalid"
+    except TruncatedResponseError:
+        return None, "truncated"
+
+    reasons = (h(response, topic.config) for h in HEURISTICS)
+    return response, next((r for r in reasons if r), ACCEPTED)
+
+
+def get_cascaded_response(
+    topic: Topic,
+    prompt: str,
+    response_definition: Any,  # noqa: ANN401
+    session: LLMSession | None = None,
+) -> Any:  # noqa: ANN401
+    """Get a response, escalating through the topic's model cascade if configured"""
+    logger = logging.getLogger("consilio.cascade")
+    models = topic.config.cascade
+    if not models:
+        return get_llm_response(prompt, response_definition, session=session)
+
+    response, outcome = None, ACCEPTED
+    for model in models:
+        started = time.perf_counter()
+        response, outcome = _attempt(topic, model, prompt, response_definition, session)
+        _record(topic, model, outcome, started)
+        if outcome == ACCEPTED:
+            return response
+        logger.info("Escalating past %s: %s", model, outcome)
+
+    # The strongest model's answer stands, unless there is nothing usable at all
+    if response is None:
+        raise click.ClickException(f"No model produced a usable response ({outcome})")
+    return response
+
+
+def percentile(values: list[float], pct: int) -> float:
+    """Inclusive percentile that also works for a single value"""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+def summarise_cascade_stats(path: Path) -> dict[str, dict[str, float]]:
+    """Per-model attempts, hit rate and latency from a cascade stats file"""
+    attempts: dict[str, list[dict]] = {}
+    for line in path.read_text().splitlines():
+        entry = json.loads(line)
+        attempts.setdefault(entry["model"], []).append(entry)
+
+    summary = {}
+    for model, entries in attempts.items():
+        latencies = [e["latency_ms"] for e in entries]
+        summary[model] = {
+            "attempts": len(entries),
+            "hit_rate": sum(e["outcome"] == ACCEPTED for e in entries) / len(entries),
+            "median_ms": statistics.median(latencies),
+            "p95_ms": percentile(latencies, 95),
+        }
+    return summary
+
+
+@click.command("cascade-stats")
+def cascade_stats() -> None:
+    """Show per-model hit rates and latency of the model cascade"""
+    path = Topic.load().directory / CASCADE_STATS_FILE
+    if not path.exists():
+        msg = "No cascade statistics recorded for this topic"
+        raise click.ClickException(msg)
+
+    for model, stats in summarise_cascade_stats(path).items():
+        click.echo(
+            f"{model}: {stats['attempts']:.0f} attempts, "
+            f"{stats['hit_rate']:.0%} accepted, "
+            f"median {stats['median_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms",
+        )
@@ -0,0 +1,139 @@
+from typing import Any
+
+import click
+import pytest
+from pydantic import ValidationError
+
+from consilio import cascade
+from consilio.cascade import (
+    CASCADE_STATS_FILE,
+    get_cascaded_response,
+    percentile,
+    summarise_cascade_stats,
+    too_many_passes,
+)
+from consilio.models import Config, Discussion, Topic
+from consilio.utils import TruncatedResponseError
+
+SPOKE = Discussion(perspective="CFO", opinion="Hiring now shortens the runway.")
+PASSED = Discussion(perspective="CTO", opinion="Pass")
+
+
+@pytest.mark.parametrize(
+    ("response", "flagged"),
+    [
+        ([SPOKE, PASSED], False),
+        ([PASSED, PASSED, SPOKE], True),
+        ([], False),
+        (SPOKE, False),
+    ],
+)
+def test_too_many_passes(response: Any, flagged: bool) -> None:
+    assert (too_many_passes(response, Config()) is not None) is flagged
+
+
+def answer_with(
+    monkeypatch: pytest.MonkeyPatch,
+    answers: dict[str, Any],
+) -> list[str]:
+    """Make each model give a canned answer (or raise it); return the models asked"""
+    asked = []
+
+    def fake_response(
+        prompt: str,  # noqa: ARG001
+        response_definition: Any,  # noqa: ARG001
+        session: Any = None,  # noqa: ARG001
+        model: str = "default",
+    ) -> Any:
+        asked.append(model)
+        answer = answers[model]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(cascade, "get_llm_response", fake_response)
+    return asked
+
+
+def with_cascade(topic: Topic, *models: str) -> Topic:
+    return topic.model_copy(
+        update={"config": topic.config.model_copy(update={"cascade": list(models)})},
+    )
+
+
+def validation_error() -> ValidationError:
+    try:
+        Discussion.model_validate({})
+    except ValidationError as e:
+        return e
+    raise AssertionError
+
+
+def test_without_cascade_the_default_model_answers(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    asked = answer_with(monkeypatch, {"default": [SPOKE]})
+    assert get_cascaded_response(topic, "prompt", list[Discussion]) == [SPOKE]
+    assert asked == ["default"]
+    assert not (topic.directory / CASCADE_STATS_FILE).exists()
+
+
+def test_cheap_model_answer_is_accepted(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    asked = answer_with(monkeypatch, {"cheap": [SPOKE], "strong": [SPOKE]})
+    topic = with_cascade(topic, "cheap", "strong")
+    assert get_cascaded_response(topic, "prompt", list[Discussion]) == [SPOKE]
+    assert asked == ["cheap"]
+
+
+def test_escalates_on_invalid_truncated_and_weak_answers(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    asked = answer_with(
+        monkeypatch,
+        {
+            "invalid": validation_error(),
+            "truncated": TruncatedResponseError("cut off"),
+            "weak": [PASSED, PASSED],
+            "strong": [SPOKE],
+        },
+    )
+    topic = with_cascade(topic, "invalid", "truncated", "weak", "strong")
+
+    assert get_cascaded_response(topic, "prompt", list[Discussion]) == [SPOKE]
+    assert asked == ["invalid", "truncated", "weak", "strong"]
+
+    stats = summarise_cascade_stats(topic.directory / CASCADE_STATS_FILE)
+    assert {model: s["hit_rate"] for model, s in stats.items()} == {
+        "invalid": 0.0,
+        "truncated": 0.0,
+        "weak": 0.0,
+        "strong": 1.0,
+    }
+
+
+def test_strongest_answer_stands_even_if_weak(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    answer_with(monkeypatch, {"cheap": [PASSED], "strong": [PASSED]})
+    topic = with_cascade(topic, "cheap", "strong")
+    assert get_cascaded_response(topic, "prompt", list[Discussion]) == [PASSED]
+
+
+def test_fails_when_no_model_answers(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    answer_with(monkeypatch, {"cheap": validation_error()})
+    with pytest.raises(click.ClickException, match="invalid"):
+        get_cascaded_response(with_cascade(topic, "cheap"), "prompt", list[Discussion])
+
+
+def test_percentile() -> None:
+    assert percentile([5.0], 95) == 5.0
+    assert percentile([float(v) for v in range(1, 101)], 50) == pytest.approx(50.5)
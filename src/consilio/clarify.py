@@ -1,35 +1,48 @@
-import json
 import logging
-from typing import Any
+from collections.abc import Callable
 
 import click
-from rich.console import Console
 from rich.markdown import Markdown
 
-from .models import Clarification, Topic
-from .utils import get_llm_response, render_template
+from .cascade import get_cascaded_response
+from .executor import save_response
+from .manifest import record_build
+from .models import Clarification, Topic, get_console
+from .storage import CLARIFICATION
+from .utils import render_template
 
 
-def display_clarification(clarification: dict[str, Any]) -> None:
+def display_clarification(clarification: Clarification) -> None:
     """Display clarification in markdown format using rich"""
-    console = Console()
-
-    # Convert to Clarification object if it's a dict
-    message = Clarification.model_validate(clarification).to_markdown()
+    console = get_console()
+    message = clarification.to_markdown()
 
     # Display using rich markdown
     console.print(Markdown(message))
 
 
-def save_clarification(topic: Topic, clarification: dict[str, Any]) -> None:
+def save_clarification(topic: Topic, clarification: Clarification) -> None:
     """Save clarification response to file"""
     logger = logging.getLogger("consilio.clarify")
     logger.info("Saving clarification response")
-    clarification_file = topic.clarification_answers_file
-    clarification_file.write_text(
-        json.dumps(Clarification.model_validate(clarification).to_json(), indent=2),
-    )
-    click.echo(f"Clarification saved to: {clarification_file}")
+    save_response(topic, clarification, CLARIFICATION)
+
+
+def run_clarification(
+    topic: Topic,
+    display_fn: Callable[[Clarification], None] = display_clarification,
+) -> Clarification:
+    """Generate, save and display the clarification for a topic"""
+    # Generate clarification using template
+    prompt = render_template("clarify.j2", topic=topic)
+
+    clarification = get_cascaded_response(topic, prompt, Clarification)
+    save_clarification(topic, clarification)
+    record_build(topic, CLARIFICATION)
+
+    # Display the clarification
+    display_fn(clarification)
+    return clarification
 
 
 @click.command()
@@ -40,16 +53,8 @@ def clarify() -> None:
 
     topic = Topic.load()
 
-    # Generate clarification using template
-    prompt = render_template("clarify.j2", topic=topic)
-
     try:
-        clarification = get_llm_response(prompt, response_definition=Clarification)
-
-        save_clarification(topic, clarification)
-
-        # Display the clarification
-        display_clarification(clarification)
-
+        run_clarification(topic)
     except Exception as e:
         raise click.ClickException(f"Error getting clarification: {e!s}") from e
+    click.echo(f"Clarification saved to: {CLARIFICATION}")
@@ -0,0 +1,26 @@
+from pathlib import Path
+
+import pytest
+
+from consilio.models import Config, Topic
+from consilio.storage import DESCRIPTION, ENGINES
+
+
+@pytest.fixture(autouse=True)
+def consilio_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep shared state (search index, caches, stats) out of the real home"""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("CONSILIO_HOME", str(home))
+    return home
+
+
+@pytest.fixture(params=ENGINES)
+def topic(request: pytest.FixtureRequest, tmp_path: Path) -> Topic:
+    """A topic with a description, once per storage engine"""
+    directory = tmp_path / "topic"
+    directory.mkdir()
+    Config(storage=request.param).save(directory / "cons.toml")
+    topic = Topic.load(directory)
+    topic.storage.write(DESCRIPTION, "Should we open a second warehouse?")
+    return topic
@@ -0,0 +1,119 @@
+"""History as conversation turns instead of one re-flattened prompt
+
+In the "turns" prompt mode every discussion round is a user turn (the round's
+prompt) followed by a model turn (the stored response). An interview continues
+the discussion conversation with its own turns. Each round's prompt is stored
+next to its response and both are replayed verbatim, so the turns sent for
+round N are a prefix of the ones sent for round N + 1 and only the new turn is
+rendered. A hierarchical round (see consilio.panels) stores the synthesis
+prompt that was sent to the whole panel.
+
+Rounds from before a topic switched to turns have no stored prompt. Their
+turn is rendered from the round's input and the perspectives that answered.
+"""
+
+from google.genai import types
+
+from consilio.models import Discussion, Perspective, Topic, response_adapter
+from consilio.perspective_utils import get_perspective
+from consilio.utils import model_turn, render_template, user_turn
+
+
+def uses_turns(topic: Topic) -> bool:
+    """Whether a topic sends its history as conversation turns"""
+    return topic.config.prompt_mode == "turns"
+
+
+def _participants(topic: Topic, response: str) -> list[Perspective]:
+    """Perspectives that spoke in a stored round (all of them if none matched)"""
+    discussions = response_adapter(list[Discussion]).validate_json(response)
+    spoke = {d.perspective for d in discussions}
+    perspectives = topic.perspectives
+    return [p for p in perspectives if p.title in spoke] or perspectives
+
+
+def discussion_turn_prompt(
+    topic: Topic,
+    round_num: int,
+    user_input: str,
+    perspectives: list[Perspective],
+) -> str:
+    """The user turn opening a discussion round"""
+    if round_num == 1:
+        return render_template(
+            "first_round.j2",
+            topic=topic,
+            perspectives=perspectives,
+        )
+    return render_template(
+        "round_turn.j2",
+        round_num=round_num,
+        user_input=user_input,
+        perspectives=perspectives,
+    )
+
+
+def interview_turn_prompt(
+    topic: Topic,
+    perspective_index: int,
+    round_num: int,
+    user_input: str,
+) -> str:
+    """The user turn of an interview round"""
+    return render_template(
+        "interview_turn.j2",
+        topic=topic,
+        perspective=get_perspective(topic, perspective_index),
+        round_num=round_num,
+        user_input=user_input,
+    )
+
+
+def discussion_turns(topic: Topic, last_round: int) -> list[types.Content]:
+    """Conversation turns of discussion rounds 1 to last_round"""
+    turns = []
+    for round_num in range(1, last_round + 1):
+        response = topic.storage.read(topic.discussion_response_name(round_num))
+        if response is None:
+            continue
+        prompt = topic.storage.read(topic.discussion_prompt_name(round_num))
+        if prompt is None:
+            user_input = topic.storage.read(topic.discussion_input_name(round_num))
+            prompt = discussion_turn_prompt(
+                topic,
+                round_num,
+                user_input or "",
+                _participants(topic, response),
+            )
+        turns += [user_turn(prompt), model_turn(response)]
+    return turns
+
+
+def interview_turns(
+    topic: Topic,
+    perspective_index: int,
+    last_round: int,
+) -> list[types.Content]:
+    """The discussion's turns followed by an interview's rounds 1 to last_round"""
+    turns = discussion_turns(topic, topic.latest_discussion_round)
+    for round_num in range(1, last_round + 1):
+        response = topic.storage.read(
+            topic.interview_response_name(perspective_index, round_num),
+        )
+        if response is None:
+            continue
+        prompt = topic.storage.read(
+            topic.interview_prompt_name(perspective_index, round_num),
+        )
+        if prompt is None:
+            user_input = topic.storage.read(
+                topic.interview_input_name(perspective_index, round_num),
+            )
+            prompt = interview_turn_prompt(
+                topic,
+                perspective_index,
+                round_num,
+                user_input or "",
+            )
+        turns += [user_turn(prompt), model_turn(response)]
+    return turns
@@ -0,0 +1,91 @@
+import pytest
+from pydantic_core import to_json
+
+from consilio.conversations import discussion_turns, interview_turns
+from consilio.discuss import run_discussion_round
+from consilio.interview import run_interview_round
+from consilio.loadtest import stub_llm
+from consilio.models import Perspective, Topic
+from consilio.storage import PERSPECTIVES
+
+PANEL = [
+    Perspective(title="Chief Financial Officer", expertise="", goal="", role=""),
+    Perspective(title="Head of Operations", expertise="", goal="", role=""),
+]
+
+
+@pytest.fixture
+def turns_topic(topic: Topic) -> Topic:
+    config = topic.config.model_copy(update={"prompt_mode": "turns"})
+    config.save(topic.config_file)
+    topic = Topic.load(topic.directory)
+    topic.storage.write(PERSPECTIVES, to_json(PANEL).decode())
+    return topic
+
+
+def texts(turns: list) -> list[str]:
+    return [part.text for turn in turns for part in turn.parts]
+
+
+def test_rounds_replay_their_stored_prompts(turns_topic: Topic) -> None:
+    topic = turns_topic
+    topic.storage.write(topic.discussion_input_name(2), "Focus on costs")
+    with stub_llm(latency=0.0, error_rate=0.0, seed=1):
+        for round_num in (1, 2):
+            run_discussion_round(topic, round_num, display_fn=lambda _: None)
+
+    prompts = [topic.storage.read(topic.discussion_prompt_name(r)) for r in (1, 2)]
+    responses = [topic.storage.read(topic.discussion_response_name(r)) for r in (1, 2)]
+    assert "Focus on costs" in (prompts[1] or "")
+    assert texts(discussion_turns(topic, 2)) == [
+        prompts[0],
+        responses[0],
+        prompts[1],
+        responses[1],
+    ]
+
+    # Replayed verbatim, even when re-rendering would now give another prompt
+    topic.storage.write(PERSPECTIVES, to_json(PANEL[:1]).decode())
+    assert texts(discussion_turns(topic, 2))[2] == prompts[1]
+
+
+def test_interviews_continue_the_discussion(turns_topic: Topic) -> None:
+    topic = turns_topic
+    topic.storage.write(topic.interview_input_name(1, 1), "What does it cost?")
+    with stub_llm(latency=0.0, error_rate=0.0, seed=1):
+        run_discussion_round(topic, 1, display_fn=lambda _: None)
+        run_interview_round(topic, 1, 1, display_fn=lambda _: None)
+
+    prompt = topic.storage.read(topic.interview_prompt_name(1, 1))
+    assert "What does it cost?" in (prompt or "")
+    assert texts(interview_turns(topic, 1, 1))[2] == prompt
+
+
+def test_rounds_without_a_stored_prompt_are_rendered(turns_topic: Topic) -> None:
+    topic = turns_topic
+    topic.storage.write(topic.discussion_input_name(2), "Focus on costs")
+    topic.storage.write_many(
+        {
+            topic.discussion_response_name(1): "[]",
+            topic.discussion_response_name(2): to_json(
+                [{"perspective": "Head of Operations", "opinion": "Lease it"}],
+            ).decode(),
+        },
+    )
+
+    _, _, prompt, _ = texts(discussion_turns(topic, 2))
+
+    assert "Focus on costs" in prompt
+    assert "Taking part in this round: Head of Operations." in prompt
+
+
+def test_hierarchical_rounds_replay_the_synthesis_prompt(turns_topic: Topic) -> None:
+    config = turns_topic.config.model_copy(update={"panel_size": 1})
+    config.save(turns_topic.config_file)
+    topic = Topic.load(turns_topic.directory)
+    with stub_llm(latency=0.0, error_rate=0.0, seed=1):
+        run_discussion_round(topic, 1, display_fn=lambda _: None)
+
+    prompt = topic.storage.read(topic.discussion_prompt_name(1)) or ""
+    assert "sub-panels" in prompt
+    assert texts(discussion_turns(topic, 1))[0] == prompt
@@ -0,0 +1,202 @@
+"""Warm fork server behind `cons daemon`
+
+The daemon imports every command module, compiles the prompt templates and
+creates the LLM client once, then forks a child per forwarded command. The
+child takes over the caller's stdin, stdout and stderr, working directory and
+environment, runs the CLI as usual and reports the exit code back.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+from pathlib import Path
+
+import click
+
+from consilio.launcher import socket_path
+from consilio.logging import stop_transcript
+from consilio.storage import consilio_home
+from consilio.utils import _template_environment, get_client
+
+PID_FILE = "daemon.pid"
+BACKLOG = 16
+BUFSIZE = 64 * 1024
+API_KEY_VARIABLES = ("GOOGLE_API_KEY", "GEMINI_API_KEY")
+
+
+def _warm_up() -> None:
+    """Do the per-process work every command would otherwise repeat"""
+    logger = logging.getLogger("consilio.daemon")
+    environment = _template_environment()
+    for name in environment.list_templates():
+        environment.get_template(name)
+    try:
+        get_client()
+    except click.ClickException:
+        logger.warning("No API key set; each command will create its own client")
+
+
+def _receive(conn: socket.socket) -> tuple[dict, list[int]]:
+    data, fds, _, _ = socket.recv_fds(conn, BUFSIZE, 3)
+    while data and not data.endswith(b"\n"):
+        chunk = conn.recv(BUFSIZE)
+        if not chunk:
+            break
+        data += chunk
+    return json.loads(data), fds
+
+
+def _adopt_environment(env: dict[str, str]) -> None:
+    before = [os.environ.get(k) for k in API_KEY_VARIABLES]
+    os.environ.clear()
+    os.environ.update(env)
+    if before != [os.environ.get(k) for k in API_KEY_VARIABLES]:
+        get_client.cache_clear()
+
+
+def _interrupt_on_hangup(conn: socket.socket) -> None:
+    # The launcher only ever closes the connection, which it does on Ctrl-C
+    conn.recv(1)
+    os.kill(os.getpid(), signal.SIGINT)
+
+
+def _exit_status(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    click.echo(code, err=True)
+    return 1
+
+
+def _run_forwarded(conn: socket.socket, request: dict, fds: list[int]) -> int:
+    """Run one command in a forked child as if it had been started directly"""
+    from consilio.main import main  # noqa: PLC0415
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    os.chdir(request["cwd"])
+    _adopt_environment(request["env"])
+    threading.Thread(target=_interrupt_on_hangup, args=(conn,), daemon=True).start()
+
+    sys.argv = ["cons", *request["argv"]]
+    try:
+        main()
+    except SystemExit as e:
+        return _exit_status(e.code)
+    return 0
+
+
+def _handle(server: socket.socket, conn: socket.socket) -> None:
+    logger = logging.getLogger("consilio.daemon")
+    request, fds = _receive(conn)
+    if len(fds) != 3:  # noqa: PLR2004
+        logger.warning("Ignoring a request without stdin, stdout and stderr")
+        for fd in fds:
+            os.close(fd)
+        conn.close()
+        return
+
+    logger.info("Running: cons %s", " ".join(request["argv"]))
+    sys.stdout.flush()
+    sys.stderr.flush()
+    if os.fork() == 0:
+        server.close()
+        exit_code = 1
+        try:
+            exit_code = _run_forwarded(conn, request, fds)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            with contextlib.suppress(OSError):
+                conn.sendall(str(exit_code).encode())
+            # os._exit skips atexit, so flush the transcript and log files here
+            stop_transcript()
+            logging.shutdown()
+            os._exit(exit_code)
+
+    for fd in fds:
+        os.close(fd)
+    conn.close()
+
+
+def _terminate(*_: object) -> None:
+    raise SystemExit(0)
+
+
+def serve(path: Path) -> None:
+    """Listen on a Unix socket and fork a warm child per forwarded command"""
+    logger = logging.getLogger("consilio.daemon")
+    _warm_up()
+    pid_file = consilio_home() / PID_FILE
+
+    # Children are reaped automatically; SIGTERM still runs the cleanup below
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _terminate)
+    path.unlink(missing_ok=True)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen(BACKLOG)
+        pid_file.write_text(str(os.getpid()))
+        logger.info("Listening on %s", path)
+        try:
+            while True:
+                conn, _ = server.accept()
+                _handle(server, conn)
+        finally:
+            path.unlink(missing_ok=True)
+            pid_file.unlink(missing_ok=True)
+
+
+def _is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+    return True
+
+
+def stop_daemon(path: Path) -> None:
+    """Signal the daemon listening on path, clearing a PID file it left behind"""
+    pid_file = consilio_home() / PID_FILE
+    if _is_listening(path) and pid_file.exists():
+        try:
+            os.kill(int(pid_file.read_text()), signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        else:
+            return
+    # A daemon killed with SIGKILL never removed its PID file
+    pid_file.unlink(missing_ok=True)
+    msg = "No daemon is running"
+    raise click.ClickException(msg)
+
+
+@click.command()
+@click.option("--stop", is_flag=True, help="Stop the running daemon")
+def daemon(*, stop: bool) -> None:
+    """Keep a warm process that runs commands without startup cost"""
+    if not hasattr(socket, "send_fds"):
+        msg = "The daemon needs Unix sockets with file descriptor passing"
+        raise click.ClickException(msg)
+
+    path = socket_path()
+    if stop:
+        stop_daemon(path)
+        click.echo("Daemon stopped")
+        return
+
+    if _is_listening(path):
+        msg = f"A daemon is already listening on {path}"
+        raise click.ClickException(msg)
+    click.echo(f"Daemon listening on {path} (stop with 'cons daemon --stop')")
+    serve(path)
@@ -0,0 +1,53 @@
+import signal
+import socket
+import subprocess
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import click
+import pytest
+
+from consilio.daemon import PID_FILE, stop_daemon
+
+
+@pytest.fixture
+def listening() -> Iterator[Path]:
+    """A socket something listens on (short path: Unix sockets cap its length)"""
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server,
+    ):
+        path = Path(directory) / "d.sock"
+        server.bind(str(path))
+        server.listen(1)
+        yield path
+
+
+def test_stop_signals_the_daemon(consilio_home: Path, listening: Path) -> None:
+    with subprocess.Popen(["sleep", "30"]) as process:
+        (consilio_home / PID_FILE).write_text(str(process.pid))
+        stop_daemon(listening)
+        assert process.wait(timeout=5) == -signal.SIGTERM
+
+
+def test_stop_without_a_daemon_clears_the_pid_file(
+    consilio_home: Path,
+    tmp_path: Path,
+) -> None:
+    (consilio_home / PID_FILE).write_text("1")
+    with pytest.raises(click.ClickException, match="No daemon is running"):
+        stop_daemon(tmp_path / "missing.sock")
+    assert not (consilio_home / PID_FILE).exists()
+
+
+def test_stop_with_a_dead_pid_clears_the_pid_file(
+    consilio_home: Path,
+    listening: Path,
+) -> None:
+    with subprocess.Popen(["true"]) as process:
+        process.wait()
+    (consilio_home / PID_FILE).write_text(str(process.pid))
+    with pytest.raises(click.ClickException, match="No daemon is running"):
+        stop_daemon(listening)
+    assert not (consilio_home / PID_FILE).exists()
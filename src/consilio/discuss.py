@@ -1,14 +1,25 @@
-import json
 import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 import click
 
-from consilio.executor import execute
-from consilio.models import Discussion, Topic, display_discussions
+from consilio.conversations import (
+    discussion_turn_prompt,
+    discussion_turns,
+    uses_turns,
+)
+from consilio.executor import execute, read_user_input, store_response
+from consilio.locking import reserve_round
+from consilio.manifest import record_options
+from consilio.models import Discussion, Perspective, Topic, display_discussions
+from consilio.panels import prepare_panels, run_hierarchical_round
+from consilio.pruning import plan_round
+from consilio.storage import PERSPECTIVES
 from consilio.utils import render_template
 
 
-def _build_first_round_prompt(topic: Topic) -> str:
+def _build_first_round_prompt(topic: Topic, perspectives: list[Perspective]) -> str:
     """Build prompt for the first discussion round"""
     logger = logging.getLogger("consilio.discuss")
     logger.debug("Building first round prompt")
@@ -16,7 +27,7 @@ def _build_first_round_prompt(topic: Topic) -> str:
     return render_template(
         "first_round.j2",
         topic=topic,
-        perspectives=topic.perspectives,
+        perspectives=perspectives,
     )
 
 
@@ -24,6 +35,7 @@ def _build_subsequent_round_prompt(
     topic: Topic,
     round_num: int,
     user_input: str | None,
+    perspectives: list[Perspective],
 ) -> str:
     """Build prompt including previous rounds' context"""
     logger = logging.getLogger("consilio.discuss")
@@ -33,14 +45,14 @@ def _build_subsequent_round_prompt(
     # Gather all previous rounds
     for i in range(1, round_num):
         try:
-            input_file = topic.discussion_input_file(i)
-            response_file = topic.discussion_response_file(i)
+            round_input = topic.storage.read(topic.discussion_input_name(i))
+            round_response = topic.storage.read(topic.discussion_response_name(i))
 
             history.append(f"<Discussion round='{i}'>")
-            if input_file.exists():
-                history.append(f"<input>{input_file.read_text()}</input>\n")
-            if response_file.exists():
-                history.append(f"<response>\n{response_file.read_text()}</response>\n")
+            if round_input is not None:
+                history.append(f"<input>{round_input}</input>\n")
+            if round_response is not None:
+                history.append(f"<response>\n{round_response}</response>\n")
             history.append("</Discussion>\n")
         except Exception as e:
             click.echo(f"Warning: Error reading round {i}: {e!s}")
@@ -50,11 +62,40 @@ def _build_subsequent_round_prompt(
         "subsequent_round.j2",
         context=context,
         topic=topic,
+        perspectives=perspectives,
         round_num=round_num,
         user_input=user_input,
     )
 
 
+def _round_prompt_builder(
+    current_round: int,
+    perspectives: list[Perspective],
+    *,
+    turns: bool,
+) -> Callable[[Topic, str], str]:
+    """Get the function building this round's prompt from the user's input"""
+
+    def build_prompt(topic: Topic, user_input: str = "") -> str:
+        if turns:
+            return discussion_turn_prompt(
+                topic,
+                current_round,
+                user_input,
+                perspectives,
+            )
+        if current_round == 1:
+            return _build_first_round_prompt(topic, perspectives)
+        return _build_subsequent_round_prompt(
+            topic,
+            round_num=current_round,
+            user_input=user_input,
+            perspectives=perspectives,
+        )
+
+    return build_prompt
+
+
 def _prepare_input_template(topic: Topic, current_round: int) -> list[str]:
     """Prepare input template for user guidance"""
     if current_round == 1:
@@ -66,11 +107,7 @@ def _prepare_input_template(topic: Topic, current_round: int) -> list[str]:
 
     # Load previous discussions for subsequent rounds
     input_template: list[str] = []
-    prev_response_file = topic.discussion_response_file(current_round - 1)
-    prev_discussions = json.loads(prev_response_file.read_text())
-
-    for d in prev_discussions:
-        discussion = Discussion.model_validate(d)
+    for discussion in topic.discussions(current_round - 1):
         input_template.extend(
             f"> {line}" for line in discussion.to_markdown().splitlines()
         )
@@ -78,6 +115,48 @@ def _prepare_input_template(topic: Topic, current_round: int) -> list[str]:
     return input_template
 
 
+def _run_hierarchical_discussion(
+    topic: Topic,
+    current_round: int,
+    perspectives: list[Perspective],
+    *,
+    user_input_name: str | None,
+    user_input_template: str,
+    display_fn: Callable[[list[Discussion]], None],
+) -> list[Discussion]:
+    """Run a round too large for one prompt in parallel sub-panels"""
+    # Prepare the sub-panels' requests while the user edits their input
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        warm_up = pool.submit(
+            prepare_panels,
+            topic,
+            current_round,
+            perspectives,
+            topic.config.panel_size,
+        )
+        user_input = read_user_input(topic, user_input_name, user_input_template)
+        panels = warm_up.result()
+
+    discussions, synthesis_prompt = run_hierarchical_round(
+        topic,
+        current_round,
+        user_input,
+        panels,
+    )
+    # Later rounds in turns mode replay the one prompt sent to the whole panel
+    store_response(
+        topic,
+        discussions,
+        topic.discussion_response_name(current_round),
+        prompt_name=(
+            topic.discussion_prompt_name(current_round) if uses_turns(topic) else None
+        ),
+        prompt=synthesis_prompt,
+    )
+    display_fn(discussions)
+    return discussions
+
+
 @click.command()
 @click.option(
     "--round",
@@ -85,42 +164,103 @@ def _prepare_input_template(topic: Topic, current_round: int) -> list[str]:
     type=int,
     help="Round number to re-run (defaults to next round)",
 )
-def discuss(round_num: int | None = None) -> None:
+@click.option(
+    "--prune-after",
+    type=click.IntRange(min=0),
+    default=2,
+    help="Rotate out perspectives that passed or repeated themselves this many rounds in a row (0 disables)",
+)
+@click.option(
+    "--keep",
+    multiple=True,
+    help="Perspective title that always takes part (repeatable)",
+)
+@click.option(
+    "--drop",
+    multiple=True,
+    help="Perspective title that sits this round out (repeatable)",
+)
+def discuss(
+    round_num: int | None = None,
+    prune_after: int = 2,
+    keep: tuple[str, ...] = (),
+    drop: tuple[str, ...] = (),
+) -> None:
     """Main handler for the discuss command"""
     topic = Topic.load()
-    current_round = (
-        round_num if round_num is not None else topic.latest_discussion_round + 1
-    )
 
-    if current_round == 1 and not topic.perspectives_file.exists():
-        msg = "No perspectives found. Generate perspectives first with 'cons perspectives'"
-        raise click.ClickException(
-            msg,
+    # Hold the round so concurrent workers on this topic pick other numbers
+    with reserve_round(topic, "discussion", round_num=round_num) as current_round:
+        if current_round == 1 and not topic.storage.exists(PERSPECTIVES):
+            msg = "No perspectives found. Generate perspectives first with 'cons perspectives'"
+            raise click.ClickException(
+                msg,
+            )
+
+        run_discussion_round(
+            topic,
+            current_round,
+            prune_after=prune_after,
+            keep=keep,
+            drop=drop,
         )
 
+
+def run_discussion_round(
+    topic: Topic,
+    current_round: int,
+    *,
+    prune_after: int = 2,
+    keep: tuple[str, ...] = (),
+    drop: tuple[str, ...] = (),
+    display_fn: Callable[[list[Discussion]], None] = display_discussions,
+) -> list[Discussion]:
+    """Run one discussion round, asking for user input unless it is stored"""
     # Prepare input_template for user input
     input_template = _prepare_input_template(topic, current_round)
 
-    # Build prompt based on round
-    def build_prompt(topic: Topic, user_input: str = "") -> str:
-        if current_round == 1:
-            return _build_first_round_prompt(topic)
-        return _build_subsequent_round_prompt(
-            topic,
-            round_num=current_round,
-            user_input=user_input,
+    plan = plan_round(topic, current_round, prune_after, keep, drop)
+    if plan.pruned:
+        titles = ", ".join(p.title for p in plan.pruned)
+        click.echo(
+            f"Sitting out round {current_round}: {titles} (~{plan.tokens_saved} tokens saved)",
         )
 
-    user_input_filepath = (
-        None if current_round == 1 else topic.discussion_input_file(current_round)
+    turns = uses_turns(topic)
+    build_prompt = _round_prompt_builder(current_round, plan.active, turns=turns)
+
+    user_input_name = (
+        None if current_round == 1 else topic.discussion_input_name(current_round)
     )
 
-    execute(
-        topic=topic,
-        user_input_filepath=user_input_filepath,
-        user_input_template="\n".join(input_template),
-        build_prompt_fn=build_prompt,
-        response_definition=None,
-        response_filepath=topic.discussion_response_file(current_round),
-        display_fn=display_discussions,
+    if len(plan.active) > topic.config.panel_size:
+        discussions = _run_hierarchical_discussion(
+            topic,
+            current_round,
+            plan.active,
+            user_input_name=user_input_name,
+            user_input_template="\n".join(input_template),
+            display_fn=display_fn,
+        )
+    else:
+        discussions = execute(
+            topic=topic,
+            user_input_name=user_input_name,
+            user_input_template="\n".join(input_template),
+            build_prompt_fn=build_prompt,
+            response_definition=list[Discussion],
+            response_name=topic.discussion_response_name(current_round),
+            display_fn=display_fn,
+            history_fn=(
+                (lambda t: discussion_turns(t, current_round - 1)) if turns else None
+            ),
+            prompt_name=topic.discussion_prompt_name(current_round) if turns else None,
+        )
+
+    # Pruning decides who answers, so a rebuild has to prune the same way
+    record_options(
+        topic,
+        topic.discussion_response_name(current_round),
+        {"prune_after": prune_after, "keep": list(keep), "drop": list(drop)},
     )
+    return discussions
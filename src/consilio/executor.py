@@ -1,52 +1,140 @@
-import json
 import logging
 from collections.abc import Callable
-from pathlib import Path
-from typing import TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 
 import click
+from google.genai import types
+from pydantic_core import to_json
 
+from consilio.cascade import get_cascaded_response
+from consilio.locking import artifact_lock
+from consilio.manifest import record_build
 from consilio.models import BaseModel, Topic
-from consilio.utils import get_llm_response
+from consilio.search import update_search_index
+from consilio.utils import MODEL, LLMSession, open_llm_session
 
 T = TypeVar("T", bound=BaseModel)
 
+# Stands in for the user's input while the prompt is rendered ahead of time
+USER_INPUT_PLACEHOLDER = "<<consilio:user-input>>"
 
-def save_response(response: dict | list | str, file: Path) -> None:
-    """Generic response saver for model objects"""
-    json_str = json.dumps(response, indent=2)
-    file.write_text(json_str)
+
+def quiet(_: Any) -> None:  # noqa: ANN401
+    """Display function that shows nothing, for unattended runs"""
+
+
+def save_response(topic: Topic, response: Any, name: str) -> None:  # noqa: ANN401
+    """Generic response saver for validated model objects (or lists of them)"""
+    content = to_json(response, indent=2).decode()
+    topic.storage.write(name, content)
+    update_search_index(topic, name, content)
+
+
+def store_response(
+    topic: Topic,
+    response: Any,  # noqa: ANN401
+    name: str,
+    postprocess_fn: Callable[[Any], Any] | None = None,
+    *,
+    prompt_name: str | None = None,
+    prompt: str = "",
+) -> Any:  # noqa: ANN401
+    """Post-process, save and record the inputs of a generated response
+
+    With a prompt_name the prompt is kept too, so that later rounds can replay
+    it verbatim as a conversation turn.
+    """
+    # Post-processing may merge with what is stored, so it shares the write lock
+    with artifact_lock(topic, name):
+        if postprocess_fn is not None:
+            response = postprocess_fn(response)
+        # Prompt first: a stored response always has its prompt next to it
+        if prompt_name is not None:
+            topic.storage.write(prompt_name, prompt)
+        save_response(topic, response, name)
+    record_build(topic, name)
+    return response
+
+
+def prewarm(
+    topic: Topic,
+    build_prompt_fn: Callable[[Topic, str], str],
+    history_fn: Callable[[Topic], list[types.Content]] | None = None,
+) -> tuple[str, LLMSession]:
+    """Do all input-independent work: history, template, client and prefix cache"""
+    prompt_template = build_prompt_fn(topic, USER_INPUT_PLACEHOLDER)
+    # Warm up the model that is asked first
+    model = next(iter(topic.config.cascade), MODEL)
+    if history_fn is not None:
+        return prompt_template, open_llm_session(model=model, turns=history_fn(topic))
+
+    prefix, found, _ = prompt_template.partition(USER_INPUT_PLACEHOLDER)
+    return prompt_template, open_llm_session(prefix if found else "", model)
+
+
+def read_user_input(topic: Topic, user_input_name: str | None, template: str) -> str:
+    """Read stored user input, or ask for it in the editor and store it"""
+    if not user_input_name:
+        return ""
+    stored_input = topic.storage.read(user_input_name)
+    if stored_input is not None:
+        return stored_input
+    user_input = click.edit(text=template)  # type: ignore
+    assert user_input is not None
+    topic.storage.write(user_input_name, user_input)
+    return user_input
 
 
 def execute(
     topic: Topic,
-    user_input_filepath: Path | None,
+    user_input_name: str | None,
     user_input_template: str,
     build_prompt_fn: Callable[[Topic, str], str],
-    response_definition: type[BaseModel] | None,
-    response_filepath: Path,
+    response_definition: Any,  # noqa: ANN401
+    response_name: str,
     display_fn: Callable[..., None],
-) -> dict[str, str | list | dict]:
+    postprocess_fn: Callable[[Any], Any] | None = None,
+    history_fn: Callable[[Topic], list[types.Content]] | None = None,
+    *,
+    review_fn: Callable[[Any], None] | None = None,
+    prompt_name: str | None = None,
+) -> Any:  # noqa: ANN401
+    """Ask for user input, get, save and display the response
+
+    With a history_fn the earlier rounds go out as conversation turns and
+    build_prompt_fn only has to render the new turn, which is kept under
+    prompt_name for the rounds after it. A review_fn sees the
+    response before anything is locked, so it may ask the user about it (and
+    raise click.Abort to discard it); postprocess_fn runs under the write lock
+    and must not wait on the user.
+    """
     logger = logging.getLogger("consilio.executor")
 
-    user_input = ""
-    if user_input_filepath:
-        if user_input_filepath.exists():
-            user_input = user_input_filepath.read_text()
-        else:
-            user_input = click.edit(text=user_input_template)  # type: ignore
-            assert user_input is not None
-            user_input_filepath.write_text(user_input)
-    logger.debug("User input saved to: %s", user_input_filepath)
+    # Prepare the request in the background while the user edits their input
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        warm_up = pool.submit(prewarm, topic, build_prompt_fn, history_fn)
+        user_input = read_user_input(topic, user_input_name, user_input_template)
+        logger.debug("User input saved to: %s", user_input_name)
+        prompt_template, session = warm_up.result()
 
-    prompt = build_prompt_fn(topic, user_input)
-    logger.debug("Prompt generated: %s", prompt)
+    prompt = prompt_template.replace(USER_INPUT_PLACEHOLDER, user_input)
+    logger.debug("Prompt generated (%s chars)", len(prompt))
 
-    response = get_llm_response(prompt, response_definition)
-    logger.debug("Response generated: %s", response)
+    response = get_cascaded_response(topic, prompt, response_definition, session)
+    logger.debug("Response generated for %s", response_name)
 
-    save_response(response, response_filepath)
-    logger.debug("Generated response saved to: %s", response_filepath)
+    if review_fn is not None:
+        review_fn(response)
+    response = store_response(
+        topic,
+        response,
+        response_name,
+        postprocess_fn,
+        prompt_name=prompt_name,
+        prompt=prompt,
+    )
+    logger.debug("Generated response saved to: %s", response_name)
 
     display_fn(response)
     return response
@@ -0,0 +1,108 @@
+from collections.abc import Iterator
+from typing import Any
+
+import click
+import pytest
+from pydantic_core import to_json
+
+from consilio.conversations import discussion_turn_prompt, interview_turn_prompt
+from consilio.executor import USER_INPUT_PLACEHOLDER, execute, prewarm
+from consilio.loadtest import stub_llm
+from consilio.models import Discussion, Perspective, Topic
+from consilio.storage import PERSPECTIVES
+from consilio.utils import MIN_CACHED_TOKENS
+
+INPUT_NAME = "discussion-r2-input.md"
+RESPONSE_NAME = "discussion-r2-response.md"
+
+
+@pytest.fixture
+def requests(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[dict[str, Any]]]:
+    """Arguments of every request the stub client receives"""
+    sent: list[dict[str, Any]] = []
+    with stub_llm(latency=0.0, error_rate=0.0, seed=1) as client:
+        generate = client.models.generate_content
+
+        def record(**kwargs: Any) -> Any:
+            sent.append(kwargs)
+            return generate(**kwargs)
+
+        monkeypatch.setattr(client.models, "generate_content", record)
+        yield sent
+
+
+def run(topic: Topic, build_prompt: Any) -> list[Discussion]:
+    return execute(
+        topic=topic,
+        user_input_name=INPUT_NAME,
+        user_input_template="",
+        build_prompt_fn=build_prompt,
+        response_definition=list[Discussion],
+        response_name=RESPONSE_NAME,
+        display_fn=lambda _: None,
+    )
+
+
+def sent_texts(request: dict[str, Any]) -> list[str]:
+    return [part.text for content in request["contents"] for part in content.parts]
+
+
+def test_stored_input_fills_the_placeholder_without_an_editor(
+    topic: Topic,
+    requests: list[dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    topic.storage.write(INPUT_NAME, "Focus on costs")
+    monkeypatch.setattr(click, "edit", pytest.fail)
+
+    run(topic, lambda _, user_input: f"Before {user_input} after")
+
+    [request] = requests
+    assert sent_texts(request) == ["Before Focus on costs after"]
+    assert topic.storage.exists(RESPONSE_NAME)
+
+
+def test_missing_input_is_asked_for_and_stored(
+    topic: Topic,
+    requests: list[dict[str, Any]],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(click, "edit", lambda **_: "Typed in the editor")
+
+    run(topic, lambda _, user_input: f"Before {user_input} after")
+
+    assert topic.storage.read(INPUT_NAME) == "Typed in the editor"
+    assert sent_texts(requests[0]) == ["Before Typed in the editor after"]
+
+
+def test_only_the_input_follows_a_cached_prefix(
+    topic: Topic,
+    requests: list[dict[str, Any]],
+) -> None:
+    topic.storage.write(INPUT_NAME, "Focus on costs")
+    prefix = "context " * MIN_CACHED_TOKENS
+
+    run(topic, lambda _, user_input: prefix + user_input)
+
+    [request] = requests
+    assert sent_texts(request) == ["Focus on costs"]
+    assert request["config"].cached_content
+    assert request["config"].system_instruction is None
+
+
+@pytest.mark.parametrize("user_input", ["", "Focus on costs"])
+def test_turn_templates_render_alike_when_prewarmed(
+    topic: Topic,
+    requests: list[dict[str, Any]],
+    user_input: str,
+) -> None:
+    panel = [Perspective(title="CFO", expertise="", goal="", role="")]
+    topic.storage.write(PERSPECTIVES, to_json(panel).decode())
+    builders = [
+        lambda t, i: discussion_turn_prompt(t, 2, i, panel),
+        lambda t, i: interview_turn_prompt(t, 0, 2, i),
+    ]
+    for build_prompt in builders:
+        prompt_template, _ = prewarm(topic, build_prompt)
+        prewarmed = prompt_template.replace(USER_INPUT_PLACEHOLDER, user_input)
+        assert prewarmed == build_prompt(topic, user_input)
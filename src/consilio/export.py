@@ -0,0 +1,215 @@
+import io
+import logging
+import tarfile
+import tempfile
+import zipfile
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO
+
+import click
+import tomli_w
+
+from consilio.models import Clarification, Discussion, Topic
+from consilio.storage import CLARIFICATION, DESCRIPTION
+
+FORMATS = ("zip", "tar.zst")
+TRANSCRIPT = "transcript.md"
+SPOOL_LIMIT = 1024 * 1024
+
+
+def iter_transcript(topic: Topic) -> Iterator[str]:
+    """Render a topic as Markdown, one artifact at a time"""
+    storage = topic.storage
+    yield f"# Topic\n\n{storage.read(DESCRIPTION) or ''}\n\n"
+
+    if perspectives := topic.perspectives:
+        yield "# Perspectives\n\n"
+        yield from (p.to_markdown(i) for i, p in enumerate(perspectives, 1))
+
+    if clarification := storage.read(CLARIFICATION):
+        yield "# Clarification\n\n"
+        yield Clarification.model_validate_json(clarification).to_markdown()
+
+    for round_num in range(1, topic.latest_discussion_round + 1):
+        yield f"# Discussion Round {round_num}\n\n"
+        if user_input := storage.read(topic.discussion_input_name(round_num)):
+            yield f"## User Input\n\n{user_input}\n\n"
+        yield from (d.to_markdown() for d in topic.discussions(round_num))
+
+    yield from _iter_interviews(topic)
+
+
+def _iter_interviews(topic: Topic) -> Iterator[str]:
+    """Render every interview thread, grouped by perspective"""
+    perspectives = topic.perspectives
+    for index, latest_round in sorted(topic.storage.latest_rounds("interview").items()):
+        assert index is not None, "Interview artifacts always carry a perspective"
+        title = perspectives[index].title if index < len(perspectives) else index
+        yield f"# Interview with {title}\n\n"
+        for round_num in range(1, latest_round + 1):
+            question = topic.storage.read(topic.interview_input_name(index, round_num))
+            response = topic.storage.read(
+                topic.interview_response_name(index, round_num),
+            )
+            yield f"## Round {round_num}\n\n{question or ''}\n\n"
+            if response:
+                yield f"{Discussion.model_validate_json(response).opinion}\n\n"
+
+
+def _archive_prefix(topic: Topic) -> str:
+    return topic.directory.resolve().name
+
+
+def _stored_files(topic: Topic) -> Iterator[tuple[str, bytes]]:
+    """The topic's cons.toml and artifacts, enough to restore it as it was"""
+    # Artifacts are exported as loose files whatever the engine, so the
+    # extracted topic has to use the file engine to find them
+    config = topic.config.model_copy(update={"storage": "files"})
+    yield topic.config_file.name, tomli_w.dumps(config.model_dump()).encode()
+    for name in topic.storage.names():
+        yield name, (topic.storage.read(name) or "").encode()
+
+
+def _write_zip(topic: Topic, destination: Path) -> None:
+    prefix = _archive_prefix(topic)
+    with zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in _stored_files(topic):
+            archive.writestr(f"{prefix}/{name}", data)
+        with archive.open(f"{prefix}/{TRANSCRIPT}", "w", force_zip64=True) as member:
+            for chunk in iter_transcript(topic):
+                member.write(chunk.encode())
+
+
+def _add_tar_member(
+    archive: tarfile.TarFile,
+    name: str,
+    data: BinaryIO,
+    size: int,
+) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    archive.addfile(info, data)
+
+
+def _write_tar_zst(topic: Topic, destination: Path) -> None:
+    try:
+        import zstandard  # noqa: PLC0415
+    except ImportError as e:
+        msg = "tar.zst exports need the optional 'zstandard' package"
+        raise click.ClickException(msg) from e
+
+    prefix = _archive_prefix(topic)
+    compressor = zstandard.ZstdCompressor()
+    with (
+        destination.open("wb") as raw,
+        compressor.stream_writer(raw) as compressed,
+        tarfile.open(fileobj=compressed, mode="w|") as archive,
+    ):
+        for name, data in _stored_files(topic):
+            _add_tar_member(archive, f"{prefix}/{name}", io.BytesIO(data), len(data))
+
+        # Tar headers need the size up front, so spool the transcript (to disk once large)
+        with tempfile.SpooledTemporaryFile(SPOOL_LIMIT) as transcript:
+            size = sum(
+                transcript.write(chunk.encode()) for chunk in iter_transcript(topic)
+            )
+            transcript.seek(0)
+            _add_tar_member(archive, f"{prefix}/{TRANSCRIPT}", transcript, size)
+
+
+def export_topic(topic: Topic, destination: Path, archive_format: str = "zip") -> Path:
+    """Stream a topic's artifacts and rendered transcript into an archive"""
+    logger = logging.getLogger("consilio.export")
+    assert archive_format in FORMATS, f"Unknown archive format {archive_format!r}"
+    logger.info("Exporting %s to %s", topic.directory, destination)
+
+    if archive_format == "zip":
+        _write_zip(topic, destination)
+    else:
+        _write_tar_zst(topic, destination)
+    return destination
+
+
+def find_topics(root: Path) -> list[Path]:
+    """Find topic directories (those with a cons.toml) below a root directory"""
+    return sorted(config.parent for config in root.rglob("cons.toml"))
+
+
+def archive_names(directories: list[Path], root: Path) -> dict[Path, str]:
+    """Name each topic's archive after its path below root, e.g. hiring-backend"""
+    names = {
+        directory: "-".join(directory.relative_to(root).parts) or root.resolve().name
+        for directory in directories
+    }
+    clashes = sorted(n for n, count in Counter(names.values()).items() if count > 1)
+    if clashes:
+        msg = f"Several topics would be exported as {', '.join(clashes)}"
+        raise click.ClickException(msg)
+    return names
+
+
+def export_topics(
+    root: Path,
+    output_dir: Path,
+    archive_format: str = "zip",
+    jobs: int = 4,
+) -> list[Path]:
+    """Export every topic below root in parallel, one archive per topic"""
+    names = archive_names(find_topics(root), root)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    def export_one(directory: Path) -> Path:
+        destination = output_dir / f"{names[directory]}.{archive_format}"
+        return export_topic(Topic.load(directory), destination, archive_format)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(export_one, names))
+
+
+@click.command()
+@click.option(
+    "--format",
+    "archive_format",
+    type=click.Choice(FORMATS),
+    default="zip",
+    help="Archive format",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path),
+    help="Archive path, or output directory with --all",
+)
+@click.option(
+    "--all",
+    "root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Export every topic found below this directory",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(1, 64),
+    default=4,
+    help="Parallel exports",
+)
+def export(
+    archive_format: str,
+    output: Path | None,
+    root: Path | None,
+    jobs: int,
+) -> None:
+    """Export a topic (or every topic below a directory) as an archive"""
+    if root is not None:
+        output_dir = output or Path("exports")
+        archives = export_topics(root, output_dir, archive_format, jobs)
+        click.echo(f"Exported {len(archives)} topics to: {output_dir}")
+        return
+
+    topic = Topic.load()
+    destination = output or Path(f"{_archive_prefix(topic)}.{archive_format}")
+    export_topic(topic, destination, archive_format)
+    click.echo(f"Exported topic to: {destination}")
@@ -0,0 +1,107 @@
+import tarfile
+import tomllib
+import zipfile
+from pathlib import Path
+
+import click
+import pytest
+import zstandard
+
+from consilio.export import TRANSCRIPT, archive_names, export_topic, export_topics
+from consilio.models import Config, Topic
+from consilio.storage import DESCRIPTION, PERSPECTIVES
+
+
+def make_topic(directory: Path, storage: str = "files") -> Topic:
+    directory.mkdir(parents=True)
+    Config(storage=storage).save(directory / "cons.toml")
+    topic = Topic.load(directory)
+    topic.storage.write(DESCRIPTION, f"About {directory.name}")
+    return topic
+
+
+def test_export_includes_config_artifacts_and_transcript(
+    topic: Topic,
+    tmp_path: Path,
+) -> None:
+    topic.storage.write(
+        "discussion-r1-response.md",
+        '[{"perspective": "CFO", "opinion": "Wait"}]',
+    )
+    archive = export_topic(topic, tmp_path / "topic.zip")
+
+    with zipfile.ZipFile(archive) as exported:
+        names = set(exported.namelist())
+        config = exported.read("topic/cons.toml").decode()
+        transcript = exported.read(f"topic/{TRANSCRIPT}").decode()
+    assert names == {
+        "topic/cons.toml",
+        f"topic/{DESCRIPTION}",
+        "topic/discussion-r1-response.md",
+        f"topic/{TRANSCRIPT}",
+    }
+    restored = topic.config.model_copy(update={"storage": "files"})
+    assert Config.model_validate(tomllib.loads(config)) == restored
+    assert "**CFO:**\nWait" in transcript
+
+
+def test_topics_with_the_same_name_get_their_own_archives(tmp_path: Path) -> None:
+    root = tmp_path / "topics"
+    make_topic(root / "a" / "hiring")
+    make_topic(root / "b" / "hiring", storage="sqlite")
+
+    archives = export_topics(root, tmp_path / "exports")
+
+    assert sorted(a.name for a in archives) == ["a-hiring.zip", "b-hiring.zip"]
+    with zipfile.ZipFile(tmp_path / "exports" / "b-hiring.zip") as exported:
+        assert exported.read(f"hiring/{DESCRIPTION}").decode() == "About hiring"
+
+
+def test_archive_names_fail_on_clashes(tmp_path: Path) -> None:
+    directories = [tmp_path / "a-b" / "c", tmp_path / "a" / "b-c"]
+    with pytest.raises(click.ClickException, match="a-b-c"):
+        archive_names(directories, tmp_path)
+
+
+def test_archive_name_of_a_root_topic(tmp_path: Path) -> None:
+    assert archive_names([tmp_path], tmp_path) == {tmp_path: tmp_path.name}
+
+
+def extract(archive: Path, destination: Path) -> None:
+    if archive.suffix == ".zip":
+        with zipfile.ZipFile(archive) as exported:
+            exported.extractall(destination)
+        return
+    with (
+        archive.open("rb") as raw,
+        zstandard.ZstdDecompressor().stream_reader(raw) as decompressed,
+        tarfile.open(fileobj=decompressed, mode="r|") as exported,
+    ):
+        exported.extractall(destination, filter="data")
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar.zst"])
+def test_extracted_archives_load_as_topics(
+    topic: Topic,
+    tmp_path: Path,
+    archive_format: str,
+) -> None:
+    topic.storage.write_many(
+        {
+            PERSPECTIVES: '[{"title": "CFO", "expertise": "", "goal": "", "role": ""}]',
+            "discussion-r1-response.md": '[{"perspective": "CFO", "opinion": "Wait"}]',
+            "discussion-r2-input.md": "Costs?",
+            "discussion-r2-response.md": '[{"perspective": "CFO", "opinion": "High"}]',
+        },
+    )
+    archive = export_topic(topic, tmp_path / f"topic.{archive_format}", archive_format)
+
+    extract(archive, tmp_path / "restored")
+    restored = Topic.load(tmp_path / "restored" / "topic")
+
+    assert restored.config.storage == "files"
+    assert restored.description == topic.description
+    assert restored.perspectives == topic.perspectives
+    assert restored.latest_discussion_round == 2
+    assert restored.discussions(2) == topic.discussions(2)
+    assert list(restored.storage.names()) == list(topic.storage.names())
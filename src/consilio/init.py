@@ -1,18 +1,24 @@
 import subprocess
+from pathlib import Path
 
 import click
 import tomli_w
 
 from consilio.models import Topic
+from consilio.storage import DESCRIPTION, ENGINES
 from consilio.utils import render_template
 
 
 @click.command()
-def init() -> None:
+@click.option(
+    "--storage",
+    type=click.Choice(ENGINES),
+    default="files",
+    help="Storage engine for the topic's artifacts",
+)
+def init(storage: str) -> None:
     """Initialize a new project and open README.md in editor"""
-    topic = Topic.load()
-    readme_path = topic.discussion_file
-    config_path = topic.config_file
+    config_path = Path("cons.toml")
 
     # Create cons.toml if it doesn't exist
     if not config_path.exists():
@@ -20,20 +26,23 @@ def init() -> None:
             "key_bindings": "emacs",
             "model": "claude-3-5-sonnet-20241022",
             "temperature": 1.0,
+            "storage": storage,
         }
         config_path.write_text(tomli_w.dumps(config))
         click.echo(f"Created cons.toml in: {config_path}")
 
+    topic = Topic.load()
+
     # Create/edit README.md
-    if not readme_path.exists():
+    content = topic.storage.read(DESCRIPTION)
+    if content is None:
         content = render_template("README.j2")
-        readme_path.write_text(content)
-        click.echo(f"Created README.md in: {readme_path}")
-    else:
-        content = readme_path.read_text()
+        topic.storage.write(DESCRIPTION, content)
+        click.echo(f"Created {DESCRIPTION} in: {topic.directory}")
 
     try:
-        # click.edit with filename doesn't take text parameter
-        click.edit(filename=str(readme_path))
+        edited = click.edit(text=content, extension=".md")
+        if edited is not None:
+            topic.storage.write(DESCRIPTION, edited)
     except subprocess.SubprocessError:
-        click.echo(f"Failed to open {readme_path} in editor")
+        click.echo(f"Failed to open {DESCRIPTION} in editor")
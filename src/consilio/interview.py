@@ -1,16 +1,23 @@
-import json
 import logging
+from collections.abc import Callable
 from typing import Any
 
 import click
 
+from consilio.conversations import (
+    interview_turn_prompt,
+    interview_turns,
+    uses_turns,
+)
 from consilio.executor import execute
+from consilio.locking import reserve_round
 from consilio.models import Discussion, Topic, display_interview
 from consilio.perspective_utils import (
     get_most_recent_perspective,
     get_perspective,
     select_perspective,
 )
+from consilio.storage import PERSPECTIVES
 from consilio.utils import render_template
 
 
@@ -24,17 +31,13 @@ def _gather_discussion_history(topic: Topic) -> list[str]:
     history = []
     for i in range(1, topic.latest_discussion_round + 1):
         try:
-            input_file = topic.discussion_input_file(i)
-            response_file = topic.discussion_response_file(i)
+            round_input = topic.storage.read(topic.discussion_input_name(i))
+            round_response = topic.storage.read(topic.discussion_response_name(i))
 
-            if input_file.exists():
-                history.append(
-                    f"Discussion Round {i} Input:\n{input_file.read_text()}\n",
-                )
-            if response_file.exists():
-                history.append(
-                    f"Discussion Round {i} Response:\n{response_file.read_text()}\n",
-                )
+            if round_input is not None:
+                history.append(f"Discussion Round {i} Input:\n{round_input}\n")
+            if round_response is not None:
+                history.append(f"Discussion Round {i} Response:\n{round_response}\n")
         except Exception as e:
             click.echo(f"Warning: Error reading discussion round {i}: {e!s}")
     return history
@@ -49,16 +52,18 @@ def _gather_interview_history(
     interview_history = []
     for i in range(1, round_num):
         try:
-            input_file = topic.interview_input_file(perspective_index, i)
-            response_file = topic.interview_response_file(perspective_index, i)
-
-            if input_file.exists():
+            round_input = topic.storage.read(
+                topic.interview_input_name(perspective_index, i),
+            )
+            round_response = topic.storage.read(
+                topic.interview_response_name(perspective_index, i),
+            )
+
+            if round_input is not None:
+                interview_history.append(f"Interview Round {i} Input:\n{round_input}\n")
+            if round_response is not None:
                 interview_history.append(
-                    f"Interview Round {i} Input:\n{input_file.read_text()}\n",
-                )
-            if response_file.exists():
-                interview_history.append(
-                    f"Interview Round {i} Response:\n{response_file.read_text()}\n",
+                    f"Interview Round {i} Response:\n{round_response}\n",
                 )
         except Exception as e:
             click.echo(f"Warning: Error reading interview round {i}: {e!s}")
@@ -99,21 +104,19 @@ def _get_perspective_and_round(
     perspective: int | None = None,
     *,
     is_continuation: bool = False,
-) -> tuple[int, int]:
-    """Determine perspective index and current round"""
+) -> tuple[int, int | None]:
+    """Determine perspective index and round (None for the next free one)"""
     if is_continuation:
         perspective_index = get_most_recent_perspective(topic)
         if perspective_index is None:
             msg = "No previous interviews found to continue"
             raise click.ClickException(msg)
-        current_round = topic.get_latest_interview_round(perspective_index) + 1
-    else:
-        perspective_index = (
-            perspective if perspective is not None else select_perspective(topic)
-        )
-        current_round = 1
+        return perspective_index, None
 
-    return perspective_index, current_round
+    perspective_index = (
+        perspective if perspective is not None else select_perspective(topic)
+    )
+    return perspective_index, 1
 
 
 def _prepare_interview_template(
@@ -125,13 +128,11 @@ def _prepare_interview_template(
     template = ["# Interview Questions\n\n"]
 
     if current_round > 1:
-        prev_response_file = topic.interview_response_file(
-            perspective_index,
-            current_round - 1,
+        response = topic.storage.read(
+            topic.interview_response_name(perspective_index, current_round - 1),
         )
-        if prev_response_file.exists():
-            response = prev_response_file.read_text()
-            lines = json.loads(response)["opinion"].split("\n")
+        if response is not None:
+            lines = Discussion.model_validate_json(response).opinion.split("\n")
             template.append("Previous Response:\n\n")
             template.append("\n".join(f"> {line}" for line in lines))
             template.append("\n\n---\n\n")
@@ -154,27 +155,66 @@ def handle_interview_command(
         msg = "No topic selected. Use 'cons init' to create one."
         raise click.ClickException(msg)
 
-    if not topic.perspectives_file.exists():
+    if not topic.storage.exists(PERSPECTIVES):
         msg = "No perspectives found. Generate perspectives first with 'cons perspectives'"
         raise click.ClickException(
             msg,
         )
 
-    perspective_index, current_round = _get_perspective_and_round(
+    perspective_index, round_num = _get_perspective_and_round(
         topic,
         perspective,
         is_continuation=is_continuation,
     )
 
     click.echo(f"\nInterviewing perspective #{perspective_index}")
+    reservation = reserve_round(topic, "interview", perspective_index, round_num)
+    with reservation as current_round:
+        run_interview_round(topic, perspective_index, current_round)
+
 
+def run_interview_round(
+    topic: Topic,
+    perspective_index: int,
+    current_round: int,
+    display_fn: Callable[[Discussion], None] = display_interview,
+) -> Discussion:
+    """Run one interview round, asking for user input unless it is stored"""
     # Create template content
     template = _prepare_interview_template(topic, perspective_index, current_round)
 
     perspective_data = get_perspective(topic, perspective_index)
-    execute(
+    if uses_turns(topic):
+        return execute(
+            topic=topic,
+            user_input_name=topic.interview_input_name(
+                perspective_index,
+                current_round,
+            ),
+            user_input_template="".join(template),
+            build_prompt_fn=lambda t, i: interview_turn_prompt(
+                t,
+                perspective_index,
+                current_round,
+                i,
+            ),
+            response_definition=Discussion,
+            response_name=topic.interview_response_name(
+                perspective_index,
+                current_round,
+            ),
+            display_fn=display_fn,
+            history_fn=lambda t: interview_turns(
+                t,
+                perspective_index,
+                current_round - 1,
+            ),
+            prompt_name=topic.interview_prompt_name(perspective_index, current_round),
+        )
+
+    return execute(
         topic=topic,
-        user_input_filepath=topic.interview_input_file(
+        user_input_name=topic.interview_input_name(
             perspective_index,
             current_round,
         ),
@@ -187,11 +227,11 @@ def handle_interview_command(
             i,
         ),
         response_definition=Discussion,
-        response_filepath=topic.interview_response_file(
+        response_name=topic.interview_response_name(
             perspective_index,
             current_round,
         ),
-        display_fn=display_interview,
+        display_fn=display_fn,
     )
 
 
@@ -0,0 +1,81 @@
+"""Entry point that hands commands to a warm `cons daemon` when one is running
+
+Only the standard library is imported here, so forwarding a command costs a
+bare interpreter start plus one round trip over a Unix socket. The daemon
+receives this process's stdin, stdout and stderr, so prompts, editors and
+pagers behave exactly as they do in-process. When no daemon is listening (or
+CONSILIO_NO_DAEMON is set) the command runs in this process instead.
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+from consilio.storage import consilio_home
+
+SOCKET_NAME = "daemon.sock"
+# Commands that must not run inside the daemon's forked children
+LOCAL_COMMANDS = {"daemon"}
+
+
+def socket_path() -> Path:
+    """Where the daemon listens"""
+    return consilio_home() / SOCKET_NAME
+
+
+def _run_in_process() -> None:
+    from consilio.main import main as run  # noqa: PLC0415
+
+    run()
+
+
+def _read_exit_code(client: socket.socket) -> int:
+    reply = b""
+    while chunk := client.recv(64):
+        reply += chunk
+    # An empty reply means the daemon's child died before finishing
+    return int(reply) if reply.strip() else 1
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a command in the daemon and return its exit code, or None if unreachable"""
+    if not hasattr(socket, "send_fds"):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path()))
+    except (FileNotFoundError, ConnectionRefusedError):
+        client.close()
+        return None
+
+    request = {"argv": argv, "cwd": str(Path.cwd()), "env": dict(os.environ)}
+    payload = json.dumps(request).encode() + b"\n"
+    with client:
+        # The first message carries the fds; the rest of a long payload follows
+        sent = socket.send_fds(client, [payload], [0, 1, 2])
+        client.sendall(payload[sent:])
+        try:
+            return _read_exit_code(client)
+        except KeyboardInterrupt:
+            # Closing the connection tells the daemon to interrupt the command
+            return 130
+
+
+def main() -> None:
+    """Entry point for the `cons` script"""
+    argv = sys.argv[1:]
+    if os.environ.get("CONSILIO_NO_DAEMON") or LOCAL_COMMANDS & set(argv):
+        _run_in_process()
+        return
+
+    exit_code = forward(argv)
+    if exit_code is None:
+        _run_in_process()
+        return
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+"""Offline load generator: many virtual users working on their own topics
+
+Every virtual user creates a synthetic topic and runs clarify, perspectives,
+a number of discussion rounds and some interviews through the same code paths
+the commands use. The LLM client is replaced by StubClient, which answers
+with random schema-valid JSON after a configurable latency and fails a
+configurable share of requests, so no network access or API key is needed.
+"""
+
+import json
+import logging
+import random
+import resource
+import tempfile
+import threading
+import time
+import tracemalloc
+import typing
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import click
+from google.genai import errors, types
+from pydantic import BaseModel
+
+from consilio import utils
+from consilio.cascade import percentile
+from consilio.clarify import run_clarification
+from consilio.discuss import run_discussion_round
+from consilio.executor import quiet
+from consilio.interview import run_interview_round
+from consilio.locking import reserve_round
+from consilio.models import Config, Topic
+from consilio.perspectives import run_perspective_generation
+from consilio.storage import DESCRIPTION, ENGINES
+from consilio.utils import estimate_tokens
+
+VOCABULARY_SIZE = 5000
+
+
+def _made_up_word(rng: random.Random) -> str:
+    return "".join(rng.choice("bdfgklmnprstvz") + rng.choice("aeiou") for _ in range(3))
+
+
+# A large vocabulary keeps synthetic perspectives from looking like duplicates
+_vocabulary_rng = random.Random(0)
+WORDS = [_made_up_word(_vocabulary_rng) for _ in range(VOCABULARY_SIZE)]
+
+
+def fake_response(response_type: Any, rng: random.Random) -> Any:  # noqa: ANN401
+    """Random data that validates against a response type, e.g. list[Discussion]"""
+    if typing.get_origin(response_type) is list:
+        (item_type,) = typing.get_args(response_type)
+        return [fake_response(item_type, rng) for _ in range(rng.randint(2, 5))]
+    if isinstance(response_type, type) and issubclass(response_type, BaseModel):
+        return {
+            name: fake_response(info.annotation, rng)
+            for name, info in response_type.model_fields.items()
+        }
+    assert response_type is str, f"No fake data for {response_type!r}"
+    return " ".join(rng.choices(WORDS, k=rng.randint(8, 60)))
+
+
+@dataclass
+class StubModels:
+    """Stands in for `client.models`, answering after a simulated latency
+
+    Each thread can answer from its own generator (see use_rng), so a seeded
+    run gives every virtual user the same answers however threads interleave.
+    """
+
+    latency: float
+    error_rate: float
+    rng: random.Random
+    _local: threading.local = field(default_factory=threading.local)
+
+    def use_rng(self, rng: random.Random) -> None:
+        """Answer the requests made from this thread with rng"""
+        self._local.rng = rng
+
+    def generate_content(
+        self,
+        model: str,
+        contents: Any,  # noqa: ANN401, ARG002
+        config: types.GenerateContentConfig,
+    ) -> types.GenerateContentResponse:
+        rng = getattr(self._local, "rng", self.rng)
+        time.sleep(max(0.0, rng.gauss(self.latency, self.latency / 4)))
+        if rng.random() < self.error_rate:
+            raise errors.ServerError(
+                503,
+                {
+                    "error": {
+                        "message": f"{model} is overloaded",
+                        "status": "UNAVAILABLE",
+                    },
+                },
+            )
+        text = json.dumps(fake_response(config.response_schema, rng))
+        return types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(parts=[types.Part(text=text)]),
+                    finish_reason=types.FinishReason.STOP,
+                ),
+            ],
+        )
+
+    def count_tokens(
+        self,
+        model: str,  # noqa: ARG002
+        contents: list[types.Content],
+    ) -> types.CountTokensResponse:
+        texts = [
+            part.text or "" for content in contents for part in content.parts or []
+        ]
+        return types.CountTokensResponse(
+            total_tokens=sum(map(estimate_tokens, texts)),
+        )
+
+
+class StubCaches:
+    """Stands in for `client.caches`"""
+
+    def create(self, model: str, config: Any) -> types.CachedContent:  # noqa: ANN401, ARG002
+        return types.CachedContent(name=f"cachedContents/stub-{model}")
+
+
+@dataclass
+class StubClient:
+    """Offline replacement for the genai client"""
+
+    models: StubModels
+    caches: StubCaches = field(default_factory=StubCaches)
+
+
+@contextmanager
+def stub_llm(
+    latency: float,
+    error_rate: float,
+    seed: int | None = None,
+) -> Iterator[StubClient]:
+    """Route every LLM request to a StubClient while the block runs"""
+    client = StubClient(StubModels(latency, error_rate, random.Random(seed)))
+    original = utils.get_client
+    utils.get_client = lambda: client  # type: ignore[assignment]
+    try:
+        yield client
+    finally:
+        utils.get_client = original
+
+
+@dataclass
+class LoadReport:
+    """Latencies per command plus failures, collected from all virtual users"""
+
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, command: str, seconds: float, *, failed: bool) -> None:
+        with self.lock:
+            if failed:
+                self.errors[command] = self.errors.get(command, 0) + 1
+            else:
+                self.latencies.setdefault(command, []).append(seconds)
+
+
+def _timed(report: LoadReport, command: str, step: Callable[[], Any]) -> None:
+    started = time.perf_counter()
+    try:
+        step()
+    except Exception:
+        report.record(command, time.perf_counter() - started, failed=True)
+        raise
+    report.record(command, time.perf_counter() - started, failed=False)
+
+
+def create_topic(directory: Path, storage: str, rng: random.Random) -> Topic:
+    """Create a synthetic topic with a random description"""
+    directory.mkdir(parents=True)
+    # Keep synthetic topics out of the user's search index
+    Config(storage=storage, search_index=False).save(directory / "cons.toml")
+    topic = Topic.load(directory)
+    topic.storage.write(DESCRIPTION, " ".join(rng.choices(WORDS, k=200)))
+    return topic
+
+
+def run_virtual_user(
+    topic: Topic,
+    report: LoadReport,
+    *,
+    rounds: int,
+    interviews: int,
+    rng: random.Random,
+) -> None:
+    """Drive one topic from clarification through discussions and interviews"""
+    _timed(report, "clarify", lambda: run_clarification(topic, display_fn=quiet))
+    _timed(
+        report,
+        "perspectives",
+        lambda: run_perspective_generation(topic, 5, display_fn=quiet),
+    )
+
+    for round_num in range(1, rounds + 1):
+        if round_num > 1:
+            topic.storage.write(
+                topic.discussion_input_name(round_num),
+                " ".join(rng.choices(WORDS, k=30)),
+            )
+        with reserve_round(topic, "discussion", round_num=round_num):
+            _timed(
+                report,
+                "discuss",
+                lambda r=round_num: run_discussion_round(topic, r, display_fn=quiet),
+            )
+
+    for index in range(min(interviews, len(topic.perspectives))):
+        topic.storage.write(
+            topic.interview_input_name(index, 1),
+            " ".join(rng.choices(WORDS, k=30)),
+        )
+        with reserve_round(topic, "interview", index, 1):
+            _timed(
+                report,
+                "interview",
+                lambda i=index: run_interview_round(topic, i, 1, display_fn=quiet),
+            )
+
+
+def run_load(
+    root: Path,
+    client: StubClient,
+    *,
+    users: int,
+    rounds: int,
+    interviews: int,
+    storage: str = "files",
+    seed: int | None = None,
+) -> tuple[LoadReport, int, float]:
+    """Run all virtual users at once; return the report, failed users and wall time"""
+    logger = logging.getLogger("consilio.loadtest")
+    report = LoadReport()
+    rng = random.Random(seed)
+    # Generators per user, for its inputs and for the stub's answers, so a
+    # seeded run is reproducible despite threading
+    user_rngs = [random.Random(rng.random()) for _ in range(users)]
+    stub_rngs = [random.Random(rng.random()) for _ in range(users)]
+    topics = [
+        create_topic(root / f"user-{i:04d}", storage, user_rng)
+        for i, user_rng in enumerate(user_rngs)
+    ]
+
+    def user(topic: Topic, user_rng: random.Random, stub_rng: random.Random) -> bool:
+        client.models.use_rng(stub_rng)
+        try:
+            run_virtual_user(
+                topic,
+                report,
+                rounds=rounds,
+                interviews=interviews,
+                rng=user_rng,
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.info("Virtual user %s gave up: %s", topic.directory.name, e)
+            return False
+        return True
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        completed = list(pool.map(user, topics, user_rngs, stub_rngs))
+    return report, completed.count(False), time.perf_counter() - started
+
+
+def _echo_report(
+    report: LoadReport,
+    failed_users: int,
+    users: int,
+    elapsed: float,
+) -> None:
+    total = sum(map(len, report.latencies.values())) + sum(report.errors.values())
+    click.echo(
+        f"{users} users, {failed_users} gave up, {total} commands in {elapsed:.1f} s "
+        f"({total / elapsed:.1f} commands/s)",
+    )
+    for command in ("clarify", "perspectives", "discuss", "interview"):
+        latencies = report.latencies.get(command, [])
+        errors_seen = report.errors.get(command, 0)
+        if not latencies:
+            click.echo(f"{command}: {errors_seen} failed")
+            continue
+        click.echo(
+            f"{command}: {len(latencies)} ok, {errors_seen} failed, "
+            f"p50 {percentile(latencies, 50):.2f} s, "
+            f"p95 {percentile(latencies, 95):.2f} s, "
+            f"p99 {percentile(latencies, 99):.2f} s",
+        )
+
+    # ru_maxrss is in kilobytes on Linux
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    click.echo(
+        f"CPU {usage.ru_utime:.1f} s user, {usage.ru_stime:.1f} s system, "
+        f"max RSS {usage.ru_maxrss / 1024:.0f} MB",
+    )
+
+
+@click.command()
+@click.option("--users", type=click.IntRange(1), default=100, help="Virtual users")
+@click.option(
+    "--rounds",
+    type=click.IntRange(1),
+    default=3,
+    help="Discussion rounds per user",
+)
+@click.option(
+    "--interviews",
+    type=click.IntRange(0),
+    default=2,
+    help="Interviews per user",
+)
+@click.option(
+    "--latency",
+    type=click.FloatRange(0.0),
+    default=0.5,
+    help="Mean stub LLM latency in seconds",
+)
+@click.option(
+    "--error-rate",
+    type=click.FloatRange(0.0, 1.0),
+    default=0.0,
+    help="Share of stub LLM requests that fail",
+)
+@click.option(
+    "--storage",
+    type=click.Choice(ENGINES),
+    default="files",
+    help="Storage engine",
+)
+@click.option(
+    "--root",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Keep the synthetic topics in this directory (default: a temporary one)",
+)
+@click.option("--seed", type=int, help="Seed for reproducible runs")
+@click.option("--trace-memory", is_flag=True, help="Also report peak Python heap usage")
+def loadtest(
+    *,
+    users: int,
+    rounds: int,
+    interviews: int,
+    latency: float,
+    error_rate: float,
+    storage: str,
+    root: Path | None,
+    seed: int | None,
+    trace_memory: bool,
+) -> None:
+    """Simulate many concurrent users against a stub LLM (runs offline)"""
+    if trace_memory:
+        tracemalloc.start()
+
+    with (
+        tempfile.TemporaryDirectory() as scratch,
+        stub_llm(latency, error_rate, seed) as client,
+    ):
+        report, failed_users, elapsed = run_load(
+            root or Path(scratch),
+            client,
+            users=users,
+            rounds=rounds,
+            interviews=interviews,
+            storage=storage,
+            seed=seed,
+        )
+
+    _echo_report(report, failed_users, users, elapsed)
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        click.echo(f"Peak traced Python heap {peak / 1024 / 1024:.0f} MB")
@@ -0,0 +1,36 @@
+from pathlib import Path
+
+from consilio.loadtest import run_load, stub_llm
+from consilio.models import Topic
+
+
+def snapshot(root: Path) -> dict[str, str]:
+    """Every artifact of every synthetic topic below root"""
+    return {
+        f"{directory.name}/{name}": topic.storage.read(name) or ""
+        for directory in sorted(root.iterdir())
+        for topic in [Topic.load(directory)]
+        for name in topic.storage.names()
+        if name != "manifest.json"
+    }
+
+
+def run(root: Path, seed: int) -> dict[str, str]:
+    with stub_llm(latency=0.0, error_rate=0.0) as client:
+        report, failed, _ = run_load(
+            root,
+            client,
+            users=4,
+            rounds=2,
+            interviews=1,
+            seed=seed,
+        )
+    assert failed == 0
+    assert len(report.latencies["discuss"]) == 8
+    return snapshot(root)
+
+
+def test_seeded_runs_are_reproducible(tmp_path: Path) -> None:
+    first = run(tmp_path / "first", seed=7)
+    assert first == run(tmp_path / "second", seed=7)
+    assert first != run(tmp_path / "third", seed=8)
@@ -0,0 +1,80 @@
+"""Advisory locks that let several workers share one topic
+
+Locks are `flock`s on files in the topic's `.locks` directory, so they work for
+both storage engines, between threads as well as processes, and are released
+by the operating system when a worker dies. Individual writes are already
+atomic; these locks cover read-modify-write sequences and round numbering.
+"""
+
+import fcntl
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from consilio.models import Topic
+
+LOCK_DIRECTORY = ".locks"
+
+
+@contextmanager
+def advisory_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a file, waiting for it if necessary"""
+    path.parent.mkdir(exist_ok=True)
+    with path.open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _lock_path(topic: Topic, name: str) -> Path:
+    return topic.directory / LOCK_DIRECTORY / f"{name}.lock"
+
+
+@contextmanager
+def artifact_lock(topic: Topic, name: str) -> Iterator[None]:
+    """Serialise read-modify-write cycles on one artifact"""
+    with advisory_lock(_lock_path(topic, name)):
+        yield
+
+
+def _round_lock_name(kind: str, perspective_index: int | None, round_num: int) -> str:
+    perspective = "" if perspective_index is None else f"-p{perspective_index}"
+    return f"{kind}{perspective}-r{round_num}"
+
+
+@contextmanager
+def reserve_round(
+    topic: Topic,
+    kind: str,
+    perspective_index: int | None = None,
+    round_num: int | None = None,
+) -> Iterator[int]:
+    """Claim a round until the block exits: the given one, or the next free one
+
+    A given round waits for whoever is working on it. Otherwise each round
+    builds on the ones before it in the same thread (every discussion round,
+    or one perspective's interview rounds), so we wait for the round in
+    progress and then take the one after it. Interviews with different
+    perspectives lock different rounds and run in parallel.
+    """
+    logger = logging.getLogger("consilio.locking")
+    if round_num is not None:
+        lock_name = _round_lock_name(kind, perspective_index, round_num)
+        with advisory_lock(_lock_path(topic, lock_name)):
+            yield round_num
+        return
+
+    candidate = topic.storage.latest_rounds(kind).get(perspective_index, 0) + 1
+    while True:
+        lock_name = _round_lock_name(kind, perspective_index, candidate)
+        with advisory_lock(_lock_path(topic, lock_name)):
+            # The round may have been completed while we waited for it
+            latest = topic.storage.latest_rounds(kind).get(perspective_index, 0)
+            if candidate > latest:
+                logger.debug("Reserved %s", lock_name)
+                yield candidate
+                return
+        candidate = latest + 1
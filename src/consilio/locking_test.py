@@ -0,0 +1,79 @@
+import threading
+import time
+
+from consilio.locking import artifact_lock, reserve_round
+from consilio.models import Topic
+
+
+def test_artifact_lock_serialises_writers(topic: Topic) -> None:
+    topic.storage.write("summaries.json", "0")
+
+    def increment() -> None:
+        with artifact_lock(topic, "summaries.json"):
+            count = int(topic.storage.read("summaries.json") or "0")
+            time.sleep(0.01)
+            topic.storage.write("summaries.json", str(count + 1))
+
+    threads = [threading.Thread(target=increment) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert topic.storage.read("summaries.json") == "5"
+
+
+def test_reserves_the_round_after_the_latest(topic: Topic) -> None:
+    topic.storage.write("discussion-r1-response.md", "[]")
+    with reserve_round(topic, "discussion") as round_num:
+        assert round_num == 2
+
+
+def test_interviews_wait_for_the_same_perspective(topic: Topic) -> None:
+    reserved = []
+
+    def next_round(perspective_index: int) -> None:
+        with reserve_round(topic, "interview", perspective_index) as round_num:
+            reserved.append((perspective_index, round_num))
+
+    with reserve_round(topic, "interview", 0) as first:
+        same = threading.Thread(target=next_round, args=(0,))
+        same.start()
+        # Another perspective's thread of rounds is independent of this one
+        next_round(1)
+        time.sleep(0.1)
+        assert reserved == [(1, 1)]
+        topic.storage.write(topic.interview_response_name(0, first), "{}")
+    same.join()
+    assert (first, reserved) == (1, [(1, 1), (0, 2)])
+
+
+def test_an_aborted_interview_round_leaves_no_gap(topic: Topic) -> None:
+    reserved = []
+
+    def next_round() -> None:
+        with reserve_round(topic, "interview", 0) as round_num:
+            reserved.append(round_num)
+
+    with reserve_round(topic, "interview", 0) as first:
+        waiting = threading.Thread(target=next_round)
+        waiting.start()
+        time.sleep(0.1)
+    waiting.join()
+    assert (first, reserved) == (1, [1])
+
+
+def test_discussions_wait_for_the_round_in_progress(topic: Topic) -> None:
+    reserved = []
+
+    def next_round() -> None:
+        with reserve_round(topic, "discussion") as round_num:
+            reserved.append(round_num)
+
+    with reserve_round(topic, "discussion") as first:
+        waiting = threading.Thread(target=next_round)
+        waiting.start()
+        time.sleep(0.1)
+        assert reserved == []
+        topic.storage.write(topic.discussion_response_name(first), "[]")
+    waiting.join()
+    assert (first, reserved) == (1, [2])
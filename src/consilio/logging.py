@@ -1,7 +1,19 @@
+import atexit
+import gzip
 import logging
+import queue
+import shutil
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+TRANSCRIPT_LOGGER = "consilio.transcript"
+TRANSCRIPT_MAX_BYTES = 5 * 1024 * 1024
+TRANSCRIPT_BACKUPS = 5
+
+# Listeners writing the transcript in the background, stopped by stop_transcript
+_transcript_listeners: list[QueueListener] = []
+
 
 def setup_logging(log_level: str = "INFO", log_file: Path | None = None) -> None:
     """Setup logging configuration for Consilio
@@ -10,9 +22,12 @@ def setup_logging(log_level: str = "INFO", log_file: Path | None = None) -> None
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path to write logs to
     """
-    # Create logger
+    # Create logger, dropping handlers from an earlier call
     logger = logging.getLogger("consilio")
     logger.setLevel(getattr(logging, log_level.upper()))
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
 
     # Create formatters
     file_formatter = logging.Formatter(
@@ -32,4 +47,63 @@ def setup_logging(log_level: str = "INFO", log_file: Path | None = None) -> None
         file_handler.setFormatter(file_formatter)
         logger.addHandler(file_handler)
 
+    # Full prompts and responses only ever go to the transcript, never the console
+    transcript = logging.getLogger(TRANSCRIPT_LOGGER)
+    transcript.propagate = False
+    transcript.setLevel(logging.CRITICAL + 1)
+
     logger.debug("Logging initialized")
+
+
+def _gzip_rotator(source: str, destination: str) -> None:
+    with Path(source).open("rb") as plain, gzip.open(destination, "wb") as compressed:
+        shutil.copyfileobj(plain, compressed)
+    Path(source).unlink()
+
+
+def setup_transcript(path: Path) -> None:
+    """Write full prompts and responses to a gzip-rotated transcript
+
+    Records are handed to a background thread through a queue, so the caller
+    never waits on file I/O or compression.
+    """
+    file_handler = RotatingFileHandler(
+        path,
+        maxBytes=TRANSCRIPT_MAX_BYTES,
+        backupCount=TRANSCRIPT_BACKUPS,
+    )
+    file_handler.namer = lambda name: f"{name}.gz"
+    file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(
+        logging.Formatter("=== %(asctime)s %(kind)s ===\n%(message)s\n"),
+    )
+
+    stop_transcript()
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(records, file_handler)
+    listener.start()
+    _transcript_listeners.append(listener)
+    atexit.register(stop_transcript)
+
+    transcript = logging.getLogger(TRANSCRIPT_LOGGER)
+    for handler in transcript.handlers[:]:
+        transcript.removeHandler(handler)
+    transcript.addHandler(QueueHandler(records))
+    transcript.setLevel(logging.INFO)
+
+
+def stop_transcript() -> None:
+    """Write out queued transcript records and close the file"""
+    while _transcript_listeners:
+        listener = _transcript_listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def log_transcript(kind: str, text: str) -> None:
+    """Record a full prompt or response; free when the transcript is off"""
+    transcript = logging.getLogger(TRANSCRIPT_LOGGER)
+    if transcript.isEnabledFor(logging.INFO):
+        # The text is the message itself (no args), so it is never %-formatted
+        transcript.info(text, extra={"kind": kind})
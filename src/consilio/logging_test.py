@@ -0,0 +1,19 @@
+from pathlib import Path
+
+from consilio.logging import (
+    log_transcript,
+    setup_logging,
+    setup_transcript,
+    stop_transcript,
+)
+
+
+def test_stop_transcript_writes_out_queued_records(tmp_path: Path) -> None:
+    path = tmp_path / "transcript.log"
+    setup_transcript(path)
+    try:
+        log_transcript("prompt", "Should we open a second warehouse?")
+        stop_transcript()
+        assert "prompt ===\nShould we open a second warehouse?" in path.read_text()
+    finally:
+        setup_logging()
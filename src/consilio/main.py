@@ -6,12 +6,22 @@ from pathlib import Path
 import better_exceptions
 import click
 
+from consilio.cascade import cascade_stats
 from consilio.clarify import clarify
+from consilio.daemon import daemon
 from consilio.discuss import discuss
+from consilio.export import export
 from consilio.init import init
 from consilio.interview import interview
-from consilio.logging import setup_logging
+from consilio.loadtest import loadtest
+from consilio.logging import setup_logging, setup_transcript
+from consilio.migrate import migrate
+from consilio.models import Topic
 from consilio.perspectives import perspectives
+from consilio.rebuild import rebuild
+from consilio.search import search
+from consilio.show import show
+from consilio.summary import summary
 from consilio.version import __version__
 
 better_exceptions.hook()
@@ -27,7 +37,7 @@ CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
         ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         case_sensitive=False,
     ),
-    default="DEBUG",
+    default="WARNING",
     help="Set logging level",
 )
 @click.option(
@@ -35,9 +45,16 @@ CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
     type=click.Path(path_type=Path),
     help="Write logs to specified file",
 )
-def cli(log_level: str, log_file: Path | None) -> None:
+@click.option(
+    "--transcript",
+    is_flag=True,
+    help="Record full prompts and responses in the topic's transcript.log",
+)
+def cli(log_level: str, log_file: Path | None, *, transcript: bool) -> None:
     """Consilio: AI-Facilitated Decision Making Assistant"""
     setup_logging(log_level, log_file)
+    if transcript:
+        setup_transcript(Topic.load().directory / "transcript.log")
     logger = logging.getLogger("consilio.cli")
     logger.debug("CLI started")
 
@@ -47,6 +64,15 @@ cli.add_command(clarify)
 cli.add_command(perspectives)
 cli.add_command(discuss)
 cli.add_command(interview)
+cli.add_command(migrate)
+cli.add_command(export)
+cli.add_command(cascade_stats)
+cli.add_command(rebuild)
+cli.add_command(daemon)
+cli.add_command(summary)
+cli.add_command(loadtest)
+cli.add_command(search)
+cli.add_command(show)
 
 
 @cli.command()
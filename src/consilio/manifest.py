@@ -0,0 +1,209 @@
+"""Record which inputs each generated artifact was built from
+
+Like a Makefile, the manifest maps every generated artifact (clarification,
+discussion responses, interview responses) to content hashes of its inputs at
+build time: the description, perspectives, earlier rounds, the user's input,
+the prompt templates and the generation settings in cons.toml. An artifact is
+stale once a recorded input changed or is itself about to be rebuilt.
+
+Command-line options a round was run with (e.g. its pruning options) are kept
+verbatim next to the hashes, so a rebuild can run the round the same way.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from consilio.conversations import uses_turns
+from consilio.locking import artifact_lock
+from consilio.models import Topic
+from consilio.storage import (
+    CLARIFICATION,
+    DESCRIPTION,
+    MANIFEST,
+    PERSPECTIVES,
+    classify,
+)
+from consilio.utils import TEMPLATES_DIR
+
+TEMPLATE_PREFIX = "template:"
+OPTION_PREFIX = "option:"
+SETTINGS = "config:generation"
+# Config fields that change what the model is asked or who answers
+GENERATION_SETTINGS = (
+    "model",
+    "temperature",
+    "cascade",
+    "cascade_max_pass_ratio",
+    "panel_size",
+    "prompt_mode",
+)
+
+
+def content_hash(text: str | None) -> str | None:
+    """Short content hash; None for missing inputs"""
+    if text is None:
+        return None
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def _read_input(topic: Topic, name: str) -> str | None:
+    if name == SETTINGS:
+        settings = topic.config.model_dump(include=set(GENERATION_SETTINGS))
+        return json.dumps(settings, sort_keys=True)
+    if name.startswith(TEMPLATE_PREFIX):
+        return (TEMPLATES_DIR / name.removeprefix(TEMPLATE_PREFIX)).read_text()
+    return topic.storage.read(name)
+
+
+def _discussion_history(topic: Topic, last_round: int) -> list[str]:
+    names = []
+    for round_num in range(1, last_round + 1):
+        names += [
+            topic.discussion_input_name(round_num),
+            topic.discussion_response_name(round_num),
+        ]
+    return names
+
+
+def _interview_history(
+    topic: Topic,
+    perspective_index: int,
+    last_round: int,
+) -> list[str]:
+    names = []
+    for round_num in range(1, last_round + 1):
+        names += [
+            topic.interview_input_name(perspective_index, round_num),
+            topic.interview_response_name(perspective_index, round_num),
+        ]
+    return names
+
+
+def artifact_dependencies(topic: Topic, name: str) -> list[str]:
+    """Inputs a generated artifact is built from (empty for source artifacts)"""
+    kind, perspective_index, round_num, part = classify(name)
+    templates = [f"{TEMPLATE_PREFIX}system.j2"]
+    if name == CLARIFICATION:
+        return [DESCRIPTION, f"{TEMPLATE_PREFIX}clarify.j2", *templates, SETTINGS]
+    if part != "response" or round_num is None:
+        return []
+
+    turns = uses_turns(topic)
+    if kind == "discussion" and round_num == 1:
+        inputs = [f"{TEMPLATE_PREFIX}first_round.j2"]
+    elif kind == "discussion":
+        inputs = [
+            *_discussion_history(topic, round_num - 1),
+            topic.discussion_input_name(round_num),
+            f"{TEMPLATE_PREFIX}{'round_turn' if turns else 'subsequent_round'}.j2",
+        ]
+    else:
+        assert perspective_index is not None, f"{name} has no perspective index"
+        inputs = [
+            *_discussion_history(topic, topic.latest_discussion_round),
+            *_interview_history(topic, perspective_index, round_num - 1),
+            topic.interview_input_name(perspective_index, round_num),
+            f"{TEMPLATE_PREFIX}{'interview_turn' if turns else 'interview'}.j2",
+        ]
+
+    candidates = [DESCRIPTION, PERSPECTIVES, *inputs, *templates]
+    return [
+        *(
+            n
+            for n in candidates
+            if n.startswith(TEMPLATE_PREFIX) or topic.storage.exists(n)
+        ),
+        SETTINGS,
+    ]
+
+
+def load_manifest(topic: Topic) -> dict[str, dict[str, str | None]]:
+    """Get recorded input hashes per generated artifact"""
+    return json.loads(topic.storage.read(MANIFEST) or "{}")
+
+
+def record_build(topic: Topic, name: str) -> None:
+    """Record the current input hashes of a freshly generated artifact"""
+    dependencies = artifact_dependencies(topic, name)
+    if not dependencies:
+        return
+    with artifact_lock(topic, MANIFEST):
+        manifest = load_manifest(topic)
+        # Keep the recorded options: a rebuild runs with them and records anew
+        options = {
+            k: v
+            for k, v in manifest.get(name, {}).items()
+            if k.startswith(OPTION_PREFIX)
+        }
+        hashes = {d: content_hash(_read_input(topic, d)) for d in dependencies}
+        manifest[name] = hashes | options
+        topic.storage.write(MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def record_options(topic: Topic, name: str, options: dict[str, Any]) -> None:
+    """Keep the options an artifact was generated with, for rebuilding it alike"""
+    with artifact_lock(topic, MANIFEST):
+        manifest = load_manifest(topic)
+        manifest.setdefault(name, {}).update(
+            {f"{OPTION_PREFIX}{k}": json.dumps(v) for k, v in options.items()},
+        )
+        topic.storage.write(MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def recorded_options(topic: Topic, name: str) -> dict[str, Any]:
+    """Options recorded for an artifact (empty if none were)"""
+    recorded = load_manifest(topic).get(name, {})
+    return {
+        key.removeprefix(OPTION_PREFIX): json.loads(value)
+        for key, value in recorded.items()
+        if key.startswith(OPTION_PREFIX) and value is not None
+    }
+
+
+def generated_artifacts(topic: Topic) -> list[str]:
+    """All generated artifacts of a topic, inputs before the artifacts using them"""
+    names = [CLARIFICATION] if topic.storage.exists(CLARIFICATION) else []
+    names += [
+        topic.discussion_response_name(r)
+        for r in range(1, topic.latest_discussion_round + 1)
+    ]
+    for index, latest in sorted(topic.storage.latest_rounds("interview").items()):
+        assert index is not None, "Interview artifacts always carry a perspective"
+        names += [topic.interview_response_name(index, r) for r in range(1, latest + 1)]
+    return [n for n in names if topic.storage.exists(n)]
+
+
+def _current_hash(topic: Topic, name: str, cache: dict[str, str | None]) -> str | None:
+    if name not in cache:
+        cache[name] = content_hash(_read_input(topic, name))
+    return cache[name]
+
+
+def _is_stale(
+    topic: Topic,
+    recorded: dict[str, str | None],
+    stale: list[str],
+    cache: dict[str, str | None],
+) -> bool:
+    return any(
+        dependency in stale or _current_hash(topic, dependency, cache) != recorded_hash
+        for dependency, recorded_hash in recorded.items()
+        if not dependency.startswith(OPTION_PREFIX)
+    )
+
+
+def stale_artifacts(topic: Topic) -> tuple[list[str], list[str]]:
+    """Split generated artifacts into stale ones and ones with no recorded inputs"""
+    manifest = load_manifest(topic)
+    current_hashes: dict[str, str | None] = {}
+    stale: list[str] = []
+    untracked: list[str] = []
+
+    for name in generated_artifacts(topic):
+        recorded = manifest.get(name)
+        if recorded is None:
+            untracked.append(name)
+        elif _is_stale(topic, recorded, stale, current_hashes):
+            stale.append(name)
+    return stale, untracked
@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from consilio import rebuild
+from consilio.manifest import (
+    SETTINGS,
+    artifact_dependencies,
+    record_build,
+    record_options,
+    recorded_options,
+    stale_artifacts,
+)
+from consilio.models import Topic
+from consilio.storage import CLARIFICATION, DESCRIPTION, PERSPECTIVES
+
+
+def build_rounds(topic: Topic, rounds: int) -> None:
+    topic.storage.write(PERSPECTIVES, "[]")
+    for round_num in range(1, rounds + 1):
+        if round_num > 1:
+            topic.storage.write(topic.discussion_input_name(round_num), "Go on")
+        topic.storage.write(topic.discussion_response_name(round_num), "[]")
+        record_build(topic, topic.discussion_response_name(round_num))
+
+
+def test_dependencies_of_a_later_round(topic: Topic) -> None:
+    build_rounds(topic, 2)
+    assert artifact_dependencies(topic, "discussion-r2-response.md") == [
+        DESCRIPTION,
+        PERSPECTIVES,
+        "discussion-r1-response.md",
+        "discussion-r2-input.md",
+        "template:subsequent_round.j2",
+        "template:system.j2",
+        SETTINGS,
+    ]
+    assert artifact_dependencies(topic, "discussion-r2-input.md") == []
+
+
+def test_fresh_build_is_up_to_date(topic: Topic) -> None:
+    build_rounds(topic, 3)
+    assert stale_artifacts(topic) == ([], [])
+
+
+def test_changed_input_makes_later_rounds_stale(topic: Topic) -> None:
+    build_rounds(topic, 3)
+    topic.storage.write(topic.discussion_input_name(2), "Focus on costs")
+    stale, _ = stale_artifacts(topic)
+    assert stale == ["discussion-r2-response.md", "discussion-r3-response.md"]
+
+
+def test_changed_generation_settings_make_everything_stale(topic: Topic) -> None:
+    build_rounds(topic, 2)
+    changed = topic.config.model_copy(update={"cascade": ["cheap", "strong"]})
+    changed.save(topic.config_file)
+    stale, _ = stale_artifacts(Topic.load(topic.directory))
+    assert stale == ["discussion-r1-response.md", "discussion-r2-response.md"]
+
+
+def test_unrelated_settings_do_not(topic: Topic) -> None:
+    build_rounds(topic, 1)
+    changed = topic.config.model_copy(update={"key_bindings": "vi"})
+    changed.save(topic.config_file)
+    assert stale_artifacts(Topic.load(topic.directory)) == ([], [])
+
+
+def test_artifacts_without_a_manifest_entry_are_untracked(topic: Topic) -> None:
+    topic.storage.write(CLARIFICATION, "{}")
+    assert stale_artifacts(topic) == ([], [CLARIFICATION])
+
+
+def test_options_are_recorded_but_not_inputs(topic: Topic) -> None:
+    build_rounds(topic, 1)
+    name = topic.discussion_response_name(1)
+    record_options(topic, name, {"prune_after": 0, "drop": ["CFO"]})
+
+    assert recorded_options(topic, name) == {"prune_after": 0, "drop": ["CFO"]}
+    assert stale_artifacts(topic) == ([], [])
+    # A rebuild records inputs afresh without losing track of the options
+    record_build(topic, name)
+    assert recorded_options(topic, name) == {"prune_after": 0, "drop": ["CFO"]}
+    assert stale_artifacts(topic) == ([], [])
+
+
+def test_rebuild_prunes_like_the_original_round(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    build_rounds(topic, 1)
+    name = topic.discussion_response_name(1)
+    record_options(topic, name, {"prune_after": 3, "keep": ["CTO"], "drop": []})
+    calls = []
+    monkeypatch.setattr(
+        rebuild,
+        "run_discussion_round",
+        lambda *args, **kwargs: calls.append((args, kwargs)),
+    )
+
+    rebuild.rebuild_artifact(topic, name)
+
+    [(_, kwargs)] = calls
+    assert kwargs["prune_after"] == 3
+    assert kwargs["keep"] == ("CTO",)
+    assert kwargs["drop"] == ()
+    assert json.loads(topic.storage.read("manifest.json") or "{}")[name]
@@ -0,0 +1,34 @@
+import logging
+
+import click
+
+from consilio.models import Topic
+from consilio.storage import ENGINES, open_storage
+
+
+@click.command()
+@click.option(
+    "--to",
+    "engine",
+    type=click.Choice(ENGINES),
+    required=True,
+    help="Storage engine to move the topic's artifacts into",
+)
+def migrate(engine: str) -> None:
+    """Copy the topic's artifacts into another storage engine"""
+    logger = logging.getLogger("consilio.migrate")
+    topic = Topic.load()
+    if engine == topic.config.storage:
+        raise click.ClickException(f"Topic already uses the {engine} storage engine")
+
+    source = topic.storage
+    records = {name: source.read(name) or "" for name in source.names()}
+    logger.info("Migrating %s artifacts to %s", len(records), engine)
+
+    # SQLite takes all records in one transaction, the file engine one file at a
+    # time. Either way cons.toml only switches once every record is written, so
+    # a failed migration leaves the topic on its old engine; rerunning it
+    # overwrites whatever files were left behind.
+    open_storage(topic.directory, engine).write_many(records)
+    topic.config.model_copy(update={"storage": engine}).save(topic.config_file)
+    click.echo(f"Migrated {len(records)} artifacts to {engine} storage")
@@ -0,0 +1,34 @@
+import pytest
+from click.testing import CliRunner
+
+from consilio.migrate import migrate
+from consilio.models import Topic
+
+
+def test_migrate_copies_every_artifact(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    topic.storage.write_many(
+        {"perspectives.json": "[]", "discussion-r1-response.md": "[]"},
+    )
+    target = "files" if topic.config.storage == "sqlite" else "sqlite"
+    monkeypatch.chdir(topic.directory)
+
+    result = CliRunner().invoke(migrate, ["--to", target])
+
+    assert result.exit_code == 0, result.output
+    migrated = Topic.load(topic.directory)
+    assert migrated.config.storage == target
+    assert list(migrated.storage.names()) == list(topic.storage.names())
+    assert migrated.storage.latest_rounds("discussion") == {None: 1}
+
+
+def test_migrate_to_the_same_engine_fails(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(topic.directory)
+    result = CliRunner().invoke(migrate, ["--to", topic.config.storage])
+    assert result.exit_code == 1
+    assert "already uses" in result.output
@@ -1,11 +1,38 @@
-import json
-import re
+import functools
+import tomllib
+from functools import cached_property
 from pathlib import Path
+from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+import click
+import tomli_w
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from rich.console import Console
 from rich.markdown import Markdown
 
+from consilio.storage import (
+    DATABASE,
+    DESCRIPTION,
+    PERSPECTIVES,
+    Engine,
+    TopicStorage,
+    open_storage,
+)
+
+PromptMode = Literal["text", "turns"]
+
+
+@functools.cache
+def get_console() -> Console:
+    """The rich Console shared by every display function"""
+    return Console()
+
+
+@functools.cache
+def response_adapter(response_type: Any) -> TypeAdapter:  # noqa: ANN401
+    """Get the (cached) TypeAdapter validating a response type, e.g. list[Discussion]"""
+    return TypeAdapter(response_type)
+
 
 class Perspective(BaseModel):
     """Represents a single perspective with its attributes"""
@@ -30,7 +57,7 @@ class Perspective(BaseModel):
 
 def display_perspectives(perspectives: list[Perspective]) -> None:
     """Display perspectives in markdown format using rich"""
-    console = Console()
+    console = get_console()
 
     # Build markdown content from Perspective objects
     md_content = "".join(p.to_markdown(i) for i, p in enumerate(perspectives, 1))
@@ -99,12 +126,9 @@ class Discussion(BaseModel):
         return cls(**data)
 
 
-def display_discussions(discussion_list: list[dict[str, str]]) -> None:
+def display_discussions(discussions: list[Discussion]) -> None:
     """Display discussion in markdown format using rich"""
-    console = Console()
-
-    # Convert to Discussion objects if they're dicts
-    discussions = [Discussion.from_dict(d) for d in discussion_list]
+    console = get_console()
 
     # Build markdown content from Discussion objects
     md_content = "## Discussion Round\n\n" + "".join(
@@ -115,13 +139,39 @@ def display_discussions(discussion_list: list[dict[str, str]]) -> None:
     console.print(Markdown(md_content))
 
 
-def display_interview(interview: dict) -> None:
+def display_interview(interview: Discussion) -> None:
     """Display interview response in markdown format"""
-    console = Console()
-    md_content = "## Interview Response\n\n" + interview["opinion"]
+    console = get_console()
+    md_content = "## Interview Response\n\n" + interview.opinion
     console.print(Markdown(md_content))
 
 
+class Summary(BaseModel):
+    """A condensed account of part (or all) of a topic's history"""
+
+    summary: str
+    key_points: list[str]
+    open_questions: list[str]
+
+    def to_markdown(self) -> str:
+        """Convert summary to markdown format"""
+        md = f"{self.summary}\n\n"
+        if self.key_points:
+            md += "__Key Points__\n" + "".join(f"* {p}\n" for p in self.key_points)
+            md += "\n"
+        if self.open_questions:
+            md += "__Open Questions__\n"
+            md += "".join(f"* {q}\n" for q in self.open_questions)
+            md += "\n"
+        return md
+
+
+def display_summary(summary: Summary) -> None:
+    """Display summary in markdown format using rich"""
+    console = get_console()
+    console.print(Markdown("## Summary\n\n" + summary.to_markdown()))
+
+
 class Config(BaseModel):
     """Configuration settings for a topic"""
 
@@ -134,19 +184,47 @@ class Config(BaseModel):
         default=0.5,
         description="Temperature for model responses",
     )
+    storage: Engine = Field(
+        default="files",
+        description="Storage engine for topic artifacts (files or sqlite)",
+    )
+    cascade: list[str] = Field(
+        default_factory=list,
+        description="Models to try from cheapest to strongest (empty disables the cascade)",
+    )
+    cascade_max_pass_ratio: float = Field(
+        default=0.5,
+        description="Escalate discussion rounds where more perspectives than this passed",
+    )
+    panel_size: int = Field(
+        default=10,
+        description="Largest sub-panel; bigger panels discuss in parallel sub-panels",
+    )
+    prompt_mode: PromptMode = Field(
+        default="text",
+        description="Send history as one text prompt (text) or as conversation turns (turns)",
+    )
+    search_index: bool = Field(
+        default=True,
+        description="Add the topic to the search index shared by all topics",
+    )
 
     def save(self, path: Path | None = None) -> None:
         """Save config to file"""
         path = path or Path("cons.toml")
-        path.write_text(self.model_dump_json(indent=2))
+        path.write_text(tomli_w.dumps(self.model_dump()))
 
     @classmethod
     def load(cls, path: Path | None = None) -> "Config":
         """Load config from file"""
         path = path or Path("cons.toml")
-        if path.exists():
-            return cls.model_validate_json(path.read_text())
-        return cls()
+        if not path.exists():
+            return cls()
+        try:
+            return cls.model_validate(tomllib.loads(path.read_text()))
+        except ValidationError as e:
+            msg = f"Invalid {path}: {e}"
+            raise click.ClickException(msg) from e
 
 
 class Topic(BaseModel):
@@ -165,71 +243,77 @@ class Topic(BaseModel):
         """Get the cons.toml file path"""
         return self.directory / "cons.toml"
 
+    @cached_property
+    def storage(self) -> TopicStorage:
+        """Get the storage engine holding the topic's artifacts"""
+        return open_storage(self.directory, self.config.storage)
+
     @property
     def discussion_file(self) -> Path:
-        """Get the discussion.md file path"""
-        return self.directory / "README.md"
+        """Get the README.md file path"""
+        return self.directory / DESCRIPTION
 
     @property
-    def perspectives_file(self) -> Path:
-        """Get the perspectives.md file path"""
-        return self.directory / "perspectives.json"
+    def database_file(self) -> Path:
+        """Get the SQLite database path used by the sqlite storage engine"""
+        return self.directory / DATABASE
 
-    @property
-    def clarification_answers_file(self) -> Path:
-        """Get the clarification_answers.md file path"""
-        return self.directory / "clarification.json"
-
-    def discussion_input_file(self, round_num: int) -> Path:
-        """Get the path for a specific round's input file"""
-        return self.directory / f"discussion-r{round_num}-input.md"
-
-    def discussion_response_file(self, round_num: int) -> Path:
-        """Get the path for a specific round's response file"""
-        return self.directory / f"discussion-r{round_num}-response.md"
-
-    def interview_input_file(self, perspective_index: int, round_num: int) -> Path:
-        """Get the path for a specific interview round's input file"""
-        return self.directory / f"interview-p{perspective_index}-r{round_num}-input.md"
-
-    def interview_response_file(self, perspective_index: int, round_num: int) -> Path:
-        """Get the path for a specific interview round's response file"""
-        return (
-            self.directory / f"interview-p{perspective_index}-r{round_num}-response.md"
-        )
-
-    def _get_latest_round_number(self, prefix: str) -> int:
-        pattern = re.compile(rf"{prefix}(\d+)-response\.md")
-        rounds = []
-        for f in self.directory.glob(f"{prefix}*-*.md"):
-            match = pattern.match(f.name)
-            if match and match.group(1):
-                rounds.append(int(match.group(1)))
-        return max(rounds) if rounds else 0
+    def discussion_input_name(self, round_num: int) -> str:
+        """Get the artifact name for a specific round's input"""
+        return f"discussion-r{round_num}-input.md"
+
+    def discussion_response_name(self, round_num: int) -> str:
+        """Get the artifact name for a specific round's response"""
+        return f"discussion-r{round_num}-response.md"
+
+    def discussion_prompt_name(self, round_num: int) -> str:
+        """Get the artifact name for the prompt a round's response answers"""
+        return f"discussion-r{round_num}-prompt.md"
+
+    def interview_input_name(self, perspective_index: int, round_num: int) -> str:
+        """Get the artifact name for a specific interview round's input"""
+        return f"interview-p{perspective_index}-r{round_num}-input.md"
+
+    def interview_response_name(self, perspective_index: int, round_num: int) -> str:
+        """Get the artifact name for a specific interview round's response"""
+        return f"interview-p{perspective_index}-r{round_num}-response.md"
+
+    def interview_prompt_name(self, perspective_index: int, round_num: int) -> str:
+        """Get the artifact name for the prompt an interview round answers"""
+        return f"interview-p{perspective_index}-r{round_num}-prompt.md"
 
     @property
     def description(self) -> str:
         """Get the topic's description"""
-        return self.discussion_file.read_text()
+        description = self.storage.read(DESCRIPTION)
+        if description is None:
+            msg = f"{DESCRIPTION} not found in {self.directory}. Run 'cons init' first."
+            raise click.ClickException(msg)
+        return description
 
     @property
     def perspectives(self) -> list[Perspective]:
         """Get the list of perspectives"""
         try:
-            with self.perspectives_file.open() as f:
-                data = json.load(f)
-            return [Perspective.model_validate(p) for p in data]
-        except (FileNotFoundError, json.JSONDecodeError):
+            return response_adapter(list[Perspective]).validate_json(
+                self.storage.read(PERSPECTIVES) or "[]",
+            )
+        except ValidationError:
             return []
 
+    def discussions(self, round_num: int) -> list[Discussion]:
+        """Get the saved discussions of a round (empty if the round is missing)"""
+        response = self.storage.read(self.discussion_response_name(round_num))
+        return response_adapter(list[Discussion]).validate_json(response or "[]")
+
     @property
     def latest_discussion_round(self) -> int:
         """Get the number of the latest discussion round"""
-        return self._get_latest_round_number("discussion-r")
+        return self.storage.latest_rounds("discussion").get(None, 0)
 
     def get_latest_interview_round(self, perspective_index: int) -> int:
         """Get the number of the latest interview round"""
-        return self._get_latest_round_number(f"interview-p{perspective_index}-r")
+        return self.storage.latest_rounds("interview").get(perspective_index, 0)
 
     @classmethod
     def create(cls) -> "Topic":
@@ -237,6 +321,7 @@ class Topic(BaseModel):
         return cls()
 
     @classmethod
-    def load(cls) -> "Topic":
-        """Load topic from current directory"""
-        return cls()
+    def load(cls, directory: Path | None = None) -> "Topic":
+        """Load topic and its cons.toml from a directory (defaults to cwd)"""
+        directory = directory or Path()
+        return cls(dir_path=directory, config=Config.load(directory / "cons.toml"))
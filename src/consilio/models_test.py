@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import click
+import pytest
+
+from consilio.executor import save_response
+from consilio.models import Config, Discussion, Topic, response_adapter
+
+
+def test_config_round_trip(tmp_path: Path) -> None:
+    config = Config(storage="sqlite", cascade=["cheap", "strong"])
+    config.save(tmp_path / "cons.toml")
+    assert Config.load(tmp_path / "cons.toml") == config
+
+
+def test_config_rejects_an_unknown_storage_engine(tmp_path: Path) -> None:
+    path = tmp_path / "cons.toml"
+    path.write_text('storage = "sqllite"\n')
+    with pytest.raises(click.ClickException, match="storage"):
+        Config.load(path)
+
+
+def test_config_rejects_an_unknown_prompt_mode(tmp_path: Path) -> None:
+    path = tmp_path / "cons.toml"
+    path.write_text('prompt_mode = "turn"\n')
+    with pytest.raises(click.ClickException, match="prompt_mode"):
+        Config.load(path)
+
+
+def test_missing_description_explains_what_to_do(tmp_path: Path) -> None:
+    with pytest.raises(click.ClickException, match="cons init"):
+        _ = Topic.load(tmp_path).description
+
+
+def test_response_adapter_is_cached() -> None:
+    assert response_adapter(list[Discussion]) is response_adapter(list[Discussion])
+
+
+def test_saved_responses_load_as_the_same_models(topic: Topic) -> None:
+    discussions = [
+        Discussion(perspective="CFO", opinion="Wait a quarter."),
+        Discussion(perspective="CTO", opinion="Pass"),
+    ]
+    save_response(topic, discussions, topic.discussion_response_name(1))
+    assert topic.discussions(1) == discussions
+    assert topic.discussions(2) == []
@@ -0,0 +1,171 @@
+"""Hierarchical discussion rounds for panels too large for one prompt
+
+When more perspectives take part than `Config.panel_size`, they are split into
+balanced sub-panels that hold the round in parallel. A rapporteur condenses
+each sub-panel's discussion into a Summary and a synthesis call combines them.
+The round is saved as every sub-panel's opinions followed by the synthesis, so
+it reads like any other round. Later sub-panels see earlier hierarchical
+rounds only through their synthesis and their own members' opinions, which
+keeps every prompt bounded by the sub-panel size instead of the panel size.
+
+For the same reason sub-panels always get text prompts: with
+`prompt_mode = "turns"` they would replay every member's opinions from every
+earlier round. Each sub-panel's prompt is rendered and pre-warmed while the
+user edits the round's input, as `execute` does for ordinary rounds.
+"""
+
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from consilio.cascade import get_cascaded_response
+from consilio.executor import USER_INPUT_PLACEHOLDER, prewarm
+from consilio.models import Discussion, Perspective, Summary, Topic
+from consilio.utils import LLMSession, render_template
+
+SYNTHESIS = "Panel synthesis"
+
+
+@dataclass
+class PreparedPanel:
+    """A sub-panel whose request only waits for the user's input"""
+
+    label: str
+    members: list[Perspective]
+    prompt_template: str
+    session: LLMSession
+
+
+def split_panels(
+    perspectives: list[Perspective],
+    panel_size: int,
+) -> list[list[Perspective]]:
+    """Split perspectives into the fewest balanced sub-panels of at most panel_size"""
+    count = math.ceil(len(perspectives) / panel_size)
+    # Deal them out like cards, so similar neighbours end up in different panels
+    return [perspectives[i::count] for i in range(count)]
+
+
+def _condensed_history(topic: Topic, round_num: int, members: set[str]) -> str:
+    history = []
+    for i in range(1, round_num):
+        discussions = topic.discussions(i)
+        if any(d.perspective == SYNTHESIS for d in discussions):
+            discussions = [
+                d for d in discussions if d.perspective in members | {SYNTHESIS}
+            ]
+        history.append(f"<Discussion round='{i}'>")
+        if round_input := topic.storage.read(topic.discussion_input_name(i)):
+            history.append(f"<input>{round_input}</input>\n")
+        history.append("".join(d.to_markdown() for d in discussions))
+        history.append("</Discussion>\n")
+    return "\n".join(history)
+
+
+def _panel_prompt(
+    topic: Topic,
+    round_num: int,
+    user_input: str,
+    panel: list[Perspective],
+) -> str:
+    if round_num == 1:
+        return render_template("first_round.j2", topic=topic, perspectives=panel)
+    return render_template(
+        "subsequent_round.j2",
+        context=_condensed_history(topic, round_num, {p.title for p in panel}),
+        topic=topic,
+        perspectives=panel,
+        round_num=round_num,
+        user_input=user_input,
+    )
+
+
+def prepare_panels(
+    topic: Topic,
+    round_num: int,
+    perspectives: list[Perspective],
+    panel_size: int,
+) -> list[PreparedPanel]:
+    """Split the panel and pre-warm every sub-panel's request"""
+    prepared = []
+    for n, panel in enumerate(split_panels(perspectives, panel_size), 1):
+        prompt_template, session = prewarm(
+            topic,
+            lambda t, user_input, panel=panel: _panel_prompt(
+                t,
+                round_num,
+                user_input,
+                panel,
+            ),
+        )
+        prepared.append(
+            PreparedPanel(f"sub-panel {n}", panel, prompt_template, session),
+        )
+    return prepared
+
+
+def _run_panel(
+    topic: Topic,
+    round_num: int,
+    user_input: str,
+    panel: PreparedPanel,
+) -> tuple[list[Discussion], Summary]:
+    """Hold the round in one sub-panel and have its rapporteur condense it"""
+    discussions = get_cascaded_response(
+        topic,
+        panel.prompt_template.replace(USER_INPUT_PLACEHOLDER, user_input),
+        list[Discussion],
+        panel.session,
+    )
+    # Every sub-panel has its own chair; tell them apart in the saved round
+    members = {p.title for p in panel.members}
+    discussions = [
+        d
+        if d.perspective in members
+        else d.model_copy(update={"perspective": f"{d.perspective} ({panel.label})"})
+        for d in discussions
+    ]
+    summary = get_cascaded_response(
+        topic,
+        render_template(
+            "summarize_chunk.j2",
+            topic=topic,
+            label=f"{panel.label} of round {round_num}",
+            content="".join(d.to_markdown() for d in discussions),
+        ),
+        Summary,
+    )
+    return discussions, summary
+
+
+def run_hierarchical_round(
+    topic: Topic,
+    round_num: int,
+    user_input: str,
+    panels: list[PreparedPanel],
+) -> tuple[list[Discussion], str]:
+    """Hold a round in parallel sub-panels; return it and its synthesis prompt"""
+    logger = logging.getLogger("consilio.panels")
+    logger.info("Round %s runs in %s sub-panels", round_num, len(panels))
+
+    with ThreadPoolExecutor(max_workers=len(panels)) as pool:
+        futures = [
+            pool.submit(_run_panel, topic, round_num, user_input, panel)
+            for panel in panels
+        ]
+        results = [future.result() for future in futures]
+
+    synthesis_prompt = render_template(
+        "synthesis_round.j2",
+        topic=topic,
+        round_num=round_num,
+        user_input=user_input,
+        summaries=[summary for _, summary in results],
+    )
+    synthesis = get_cascaded_response(topic, synthesis_prompt, Summary)
+    discussions = [d for panel_discussions, _ in results for d in panel_discussions]
+    discussions.append(
+        Discussion(perspective=SYNTHESIS, opinion=synthesis.to_markdown()),
+    )
+    return discussions, synthesis_prompt
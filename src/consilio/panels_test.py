@@ -0,0 +1,87 @@
+import random
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from consilio import panels
+from consilio.loadtest import fake_response, stub_llm
+from consilio.models import Discussion, Perspective, Topic, response_adapter
+from consilio.panels import (
+    SYNTHESIS,
+    prepare_panels,
+    run_hierarchical_round,
+    split_panels,
+)
+
+
+def perspectives(count: int) -> list[Perspective]:
+    return [
+        Perspective(title=f"Member {i}", expertise="", goal="", role="")
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize(
+    ("count", "panel_size", "sizes"),
+    [(10, 10, [10]), (11, 10, [6, 5]), (25, 10, [9, 8, 8]), (3, 1, [1, 1, 1])],
+)
+def test_split_panels_balances_sizes(
+    count: int,
+    panel_size: int,
+    sizes: list[int],
+) -> None:
+    members = perspectives(count)
+    split = split_panels(members, panel_size)
+    assert [len(panel) for panel in split] == sizes
+    assert sorted(p.title for panel in split for p in panel) == sorted(
+        p.title for p in members
+    )
+
+
+def test_split_panels_deals_neighbours_apart() -> None:
+    first, second = split_panels(perspectives(4), 2)
+    assert [p.title for p in first] == ["Member 0", "Member 2"]
+    assert [p.title for p in second] == ["Member 1", "Member 3"]
+
+
+@pytest.fixture
+def prompts(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[str]]:
+    """Prompts sent to the model, answered with random valid responses"""
+    sent: list[str] = []
+    rng = random.Random(0)
+
+    def respond(_: Topic, prompt: str, response_definition: Any, *__: object) -> Any:
+        sent.append(prompt)
+        fake = fake_response(response_definition, rng)
+        return response_adapter(response_definition).validate_python(fake)
+
+    monkeypatch.setattr(panels, "get_cascaded_response", respond)
+    with stub_llm(latency=0.0, error_rate=0.0):
+        yield sent
+
+
+def test_hierarchical_round_ends_with_a_synthesis(
+    topic: Topic,
+    prompts: list[str],
+) -> None:
+    members = perspectives(5)
+    topic.storage.write(topic.discussion_response_name(1), "[]")
+    prepared = prepare_panels(topic, 2, members, 3)
+
+    discussions, synthesis_prompt = run_hierarchical_round(
+        topic,
+        2,
+        "Focus on costs",
+        prepared,
+    )
+
+    assert [panel.label for panel in prepared] == ["sub-panel 1", "sub-panel 2"]
+    # Two sub-panels and their rapporteurs, then the synthesis
+    assert len(prompts) == 5
+    # The sub-panels and the synthesis see the input, the rapporteurs only opinions
+    assert sum("Focus on costs" in prompt for prompt in prompts) == 3
+    assert "<<consilio" not in "".join(prompts)
+    assert synthesis_prompt in prompts
+    assert discussions[-1].perspective == SYNTHESIS
+    assert all(isinstance(d, Discussion) for d in discussions)
@@ -4,7 +4,12 @@ from typing import Any
 
 import click
 
-from consilio.models import Topic
+from consilio.models import Perspective, Topic
+from consilio.similarity import near_duplicates
+from consilio.storage import PERSPECTIVES
+from consilio.utils import estimate_tokens
+
+DUPLICATE_THRESHOLD = 0.6
 
 
 def _display_perspectives(perspectives: list[dict[str, Any]]) -> None:
@@ -31,10 +36,10 @@ def _get_user_selection(max_choice: int) -> int:
 def select_perspective(topic: Topic) -> int:
     """Display perspective selection menu and get user choice"""
     try:
-        perspectives = json.loads(topic.perspectives_file.read_text())
+        perspectives = json.loads(topic.storage.read(PERSPECTIVES) or "")
         _display_perspectives(perspectives)
         return _get_user_selection(len(perspectives))
-    except (json.JSONDecodeError, FileNotFoundError) as e:
+    except json.JSONDecodeError as e:
         msg = "No valid perspectives found. Generate perspectives first."
         raise click.ClickException(
             msg,
@@ -43,16 +48,12 @@ def select_perspective(topic: Topic) -> int:
 
 def get_most_recent_perspective(topic: Topic) -> int | None:
     """Find the most recently interviewed perspective"""
-    latest_perspective = None
-    latest_round = -1
-
-    # Check all potential perspective files
-    for p_idx in range(100):  # reasonable upper limit
-        round_num = topic.get_latest_interview_round(p_idx)
-        if round_num > latest_round:
-            latest_round = round_num
-            latest_perspective = p_idx
+    rounds = topic.storage.latest_rounds("interview")
+    if not rounds:
+        return None
 
+    # Highest round wins; ties go to the lowest perspective index
+    latest_perspective, _ = max(sorted(rounds.items()), key=lambda item: item[1])
     return latest_perspective
 
 
@@ -61,14 +62,56 @@ def get_perspective(topic: Topic, index: int) -> dict[str, Any]:
     logger = logging.getLogger("consilio.interview")
     logger.debug("Getting perspective %s", index)
     try:
-        perspectives = json.loads(topic.perspectives_file.read_text())
+        perspectives = json.loads(topic.storage.read(PERSPECTIVES) or "")
         if index < 0 or index >= len(perspectives):
             raise click.ClickException(
                 f"Invalid perspective index. Must be between 0 and {len(perspectives) - 1}",
             )
         return perspectives[index]
-    except (json.JSONDecodeError, FileNotFoundError) as e:
+    except json.JSONDecodeError as e:
         msg = "No valid perspectives found. Generate perspectives first."
         raise click.ClickException(
             msg,
         ) from e
+
+
+def find_duplicate_perspectives(
+    perspectives: list[Perspective],
+    threshold: float = DUPLICATE_THRESHOLD,
+) -> list[tuple[int, int, float]]:
+    """Find near-duplicate perspective pairs by title, expertise, goal and role"""
+    texts = [f"{p.title} {p.expertise} {p.goal} {p.role}" for p in perspectives]
+    return near_duplicates(texts, threshold)
+
+
+def dedupe_perspectives(
+    perspectives: list[Perspective],
+    *,
+    merge: bool,
+    threshold: float = DUPLICATE_THRESHOLD,
+    protected: int = 0,
+) -> tuple[list[Perspective], list[tuple[int, int, float]]]:
+    """Report near-duplicates; when merging keep only the first of each pair
+
+    The first `protected` perspectives (e.g. already saved ones) are never dropped.
+    Returns the kept perspectives and the duplicate pairs found.
+    """
+    pairs = find_duplicate_perspectives(perspectives, threshold)
+    for i, j, score in pairs:
+        click.echo(
+            f"Near-duplicate perspectives: '{perspectives[i].title}' and "
+            f"'{perspectives[j].title}' (similarity {score:.2f})",
+        )
+    if not merge or not pairs:
+        return perspectives, pairs
+
+    dropped = {j for _, j, _ in pairs if j >= protected}
+    kept = [p for k, p in enumerate(perspectives) if k not in dropped]
+    tokens_saved = sum(
+        estimate_tokens(str(perspectives[k].model_dump())) for k in dropped
+    )
+    click.echo(
+        f"Panel reduced from {len(perspectives)} to {len(kept)} perspectives; "
+        f"per-round prompt ~{tokens_saved} tokens smaller",
+    )
+    return kept, pairs
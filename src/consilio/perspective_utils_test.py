@@ -0,0 +1,45 @@
+import pytest
+
+from consilio.models import Perspective
+from consilio.perspective_utils import dedupe_perspectives, find_duplicate_perspectives
+
+
+def perspective(title: str, expertise: str) -> Perspective:
+    return Perspective(title=title, expertise=expertise, goal="", role="")
+
+
+PANEL = [
+    perspective("Chief Financial Officer", "cash runway and budgets"),
+    perspective("Head of Engineering", "hiring plans and delivery"),
+    perspective("Financial Officer", "budgets and cash runway"),
+]
+
+
+def test_find_duplicate_perspectives() -> None:
+    pairs = find_duplicate_perspectives(PANEL)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 2)]
+
+
+def test_flagging_keeps_every_perspective(capsys: pytest.CaptureFixture) -> None:
+    kept, pairs = dedupe_perspectives(PANEL, merge=False)
+    assert kept == PANEL
+    assert len(pairs) == 1
+    assert "Near-duplicate perspectives" in capsys.readouterr().out
+
+
+def test_merging_keeps_the_first_of_each_pair() -> None:
+    kept, _ = dedupe_perspectives(PANEL, merge=True)
+    assert [p.title for p in kept] == ["Chief Financial Officer", "Head of Engineering"]
+
+
+def test_merging_never_drops_protected_perspectives() -> None:
+    # A new perspective duplicating a saved one goes; saved ones always stay
+    saved, new = [PANEL[2], PANEL[1]], PANEL[0]
+    kept, _ = dedupe_perspectives([*saved, new], merge=True, protected=2)
+    assert kept == saved
+
+
+def test_high_threshold_finds_nothing() -> None:
+    kept, pairs = dedupe_perspectives(PANEL, merge=True, threshold=0.99)
+    assert kept == PANEL
+    assert pairs == []
@@ -1,68 +1,245 @@
-import json
-from pathlib import Path
+from collections.abc import Callable
 
 import click
+from pydantic_core import to_json
 
-from consilio.executor import execute
-from consilio.models import Perspective, Topic, display_perspectives
+from consilio.executor import execute, store_response
+from consilio.locking import artifact_lock
+from consilio.models import (
+    Perspective,
+    Topic,
+    display_perspectives,
+    response_adapter,
+)
+from consilio.perspective_utils import DUPLICATE_THRESHOLD, dedupe_perspectives
+from consilio.reuse import (
+    DECLINED,
+    MISSED,
+    REUSE_STATS_FILE,
+    REUSE_THRESHOLD,
+    REUSED,
+    find_similar_panel,
+    record_lookup,
+    summarise_reuse_stats,
+)
+from consilio.search import update_search_index
+from consilio.storage import PERSPECTIVES, consilio_home
 from consilio.utils import render_template
 
+# Panels above Config.panel_size discuss in parallel sub-panels (see consilio.panels)
+MAX_PERSPECTIVES = 50
+
+duplicates_option = click.option(
+    "--duplicates",
+    type=click.Choice(["flag", "merge"]),
+    default="flag",
+    help="Only report near-duplicate perspectives, or keep just the first of each pair",
+)
+threshold_option = click.option(
+    "--similarity-threshold",
+    type=click.FloatRange(0.0, 1.0),
+    default=DUPLICATE_THRESHOLD,
+    help="TF-IDF cosine similarity from which two perspectives count as duplicates",
+)
+
 
 @click.group()
 def perspectives() -> None:
     pass
 
 
-@perspectives.command()
-def generate() -> None:
-    """Generate perspectives for a topic using LLM"""
-    topic = Topic.load()
-    num = click.prompt(
-        "How many perspectives would you like? (1-10)",
-        type=click.IntRange(1, 10),
-        default=5,
-    )
-
-    execute(
+def run_perspective_generation(
+    topic: Topic,
+    num: int,
+    *,
+    merge: bool = False,
+    threshold: float = DUPLICATE_THRESHOLD,
+    display_fn: Callable[[list[Perspective]], None] = display_perspectives,
+) -> list[Perspective]:
+    """Generate, dedupe, save and display a topic's perspectives"""
+    return execute(
         topic=topic,
-        user_input_filepath=None,
+        user_input_name=None,
         user_input_template="",
         build_prompt_fn=lambda t, _: render_template(
             "perspectives.j2",
             topic=t,
             num_of_perspectives=num,
         ),
-        response_definition=Perspective,
-        response_filepath=topic.perspectives_file,
-        display_fn=display_perspectives,
+        response_definition=list[Perspective],
+        response_name=PERSPECTIVES,
+        display_fn=display_fn,
+        postprocess_fn=lambda generated: dedupe_perspectives(
+            generated,
+            merge=merge,
+            threshold=threshold,
+        )[0],
+    )
+
+
+def reuse_similar_panel(
+    topic: Topic,
+    num: int,
+    mode: str,
+    threshold: float = REUSE_THRESHOLD,
+) -> list[Perspective] | None:
+    """Save a similar earlier topic's panel instead of generating one"""
+    if mode == "never":
+        return None
+    match = find_similar_panel(topic, threshold)
+    if match is None:
+        record_lookup(topic, MISSED, None)
+        return None
+
+    panel = match.perspectives[:num]
+    click.echo(
+        f"{match.directory.name} is {match.similarity:.0%} similar to this topic. "
+        "Its perspectives:",
+    )
+    display_perspectives(panel)
+    if mode == "ask" and not click.confirm("Reuse these perspectives?", default=True):
+        record_lookup(topic, DECLINED, match)
+        return None
+
+    record_lookup(topic, REUSED, match)
+    click.echo(f"Reused {len(panel)} perspectives, skipping generation")
+    return store_response(topic, panel, PERSPECTIVES)
+
+
+def _with_new_perspective(
+    current: list[Perspective],
+    new_perspective: Perspective,
+    *,
+    merge: bool,
+    threshold: float,
+) -> tuple[list[Perspective], bool]:
+    """Existing perspectives plus the new one, and whether it overlaps them"""
+    kept, pairs = dedupe_perspectives(
+        [*current, new_perspective],
+        merge=merge,
+        threshold=threshold,
+        protected=len(current),
+    )
+    return kept, any(j == len(current) for _, j, _ in pairs)
+
+
+def confirm_unless_duplicate(
+    topic: Topic,
+    new_perspective: Perspective,
+    *,
+    merge: bool,
+    threshold: float,
+) -> None:
+    """Ask before adding a perspective that resembles an existing one"""
+    kept, overlaps = _with_new_perspective(
+        topic.perspectives,
+        new_perspective,
+        merge=merge,
+        threshold=threshold,
+    )
+    # A merged duplicate is dropped anyway, so only flagged ones need asking
+    flagged = overlaps and new_perspective in kept
+    if flagged and not click.confirm("Add it anyway?", default=False):
+        raise click.Abort
+
+
+def append_unless_duplicate(
+    topic: Topic,
+    new_perspective: Perspective,
+    *,
+    merge: bool,
+    threshold: float,
+) -> list[Perspective]:
+    """Append the new perspective to the existing ones, checking for overlap"""
+    # Runs under the write lock: others may have added perspectives since
+    current = topic.perspectives
+    kept, _ = _with_new_perspective(
+        current,
+        new_perspective,
+        merge=merge,
+        threshold=threshold,
+    )
+    if len(kept) == len(current):
+        click.echo("New perspective duplicates an existing one and was not added")
+    return kept
+
+
+def merge_edit(original: str, current: str, edited: str) -> str:
+    """Apply a user's edit of original on top of perspectives added since"""
+    adapter = response_adapter(list[Perspective])
+    before = adapter.validate_json(original)
+    added = [p for p in adapter.validate_json(current) if p not in before]
+    merged = [*adapter.validate_json(edited), *added]
+    return to_json(merged, indent=2).decode()
+
+
+@perspectives.command()
+@duplicates_option
+@threshold_option
+@click.option(
+    "--reuse",
+    type=click.Choice(["ask", "auto", "never"]),
+    default="ask",
+    help="Offer, apply or ignore the panel of a similar earlier topic",
+)
+@click.option(
+    "--reuse-threshold",
+    type=click.FloatRange(0.0, 1.0),
+    default=REUSE_THRESHOLD,
+    help="TF-IDF cosine similarity from which an earlier topic's panel is reused",
+)
+def generate(
+    duplicates: str,
+    similarity_threshold: float,
+    reuse: str,
+    reuse_threshold: float,
+) -> None:
+    """Generate perspectives for a topic using LLM"""
+    topic = Topic.load()
+    num = click.prompt(
+        "How many perspectives would you like? (1-50)",
+        type=click.IntRange(1, MAX_PERSPECTIVES),
+        default=5,
     )
 
+    if reuse_similar_panel(topic, num, reuse, reuse_threshold) is None:
+        run_perspective_generation(
+            topic,
+            num,
+            merge=duplicates == "merge",
+            threshold=similarity_threshold,
+        )
+
     # Ask if user wants to edit
     if click.confirm("Would you like to edit the perspectives?"):
-        click.echo("Opening perspectives file in editor...")
-        click.edit(filename=str(topic.perspectives_file))
+        click.echo("Opening perspectives in editor...")
+        # Edit outside the lock: others may keep adding while the editor is open
+        original = topic.storage.read(PERSPECTIVES) or "[]"
+        edited = click.edit(text=original, extension=".json")
+        if edited is not None:
+            with artifact_lock(topic, PERSPECTIVES):
+                current = topic.storage.read(PERSPECTIVES) or "[]"
+                if current != original:
+                    edited = merge_edit(original, current, edited)
+                topic.storage.write(PERSPECTIVES, edited)
+            update_search_index(topic, PERSPECTIVES, edited)
 
 
 @perspectives.command()
-def add() -> None:
+@duplicates_option
+@threshold_option
+def add(duplicates: str, similarity_threshold: float) -> None:
     """Add a new perspective by prompting user for role and generating details"""
     topic = Topic.load()
     description = click.prompt("Enter a description of the new perspective", type=str)
 
     # Get existing perspectives
-    existing_items: list[Perspective] = []
-    if topic.perspectives_file.exists():
-        existing_items = json.loads(topic.perspectives_file.read_text())
-
-    def save_and_append(new_perspective: Perspective, file: Path) -> None:
-        """Custom save function that appends to existing perspectives"""
-        perspectives = [*existing_items, new_perspective.model_dump()]
-        json_str = json.dumps(perspectives, indent=2)
-        file.write_text(json_str)
+    existing_items = topic.perspectives
 
-    new_perspective = execute(
+    merge = duplicates == "merge"
+    execute(
         topic=topic,
-        user_input_filepath=None,
+        user_input_name=None,
         user_input_template="",
         build_prompt_fn=lambda t, _: render_template(
             "additional_perspective.j2",
@@ -71,15 +248,37 @@ def add() -> None:
             existing_perspectives=existing_items,
         ),
         response_definition=Perspective,
-        response_filepath=topic.perspectives_file,
-        display_fn=lambda p: display_perspectives([p, *existing_items]),
+        response_name=PERSPECTIVES,
+        display_fn=display_perspectives,
+        postprocess_fn=lambda new: append_unless_duplicate(
+            topic,
+            new,
+            merge=merge,
+            threshold=similarity_threshold,
+        ),
+        review_fn=lambda new: confirm_unless_duplicate(
+            topic,
+            new,
+            merge=merge,
+            threshold=similarity_threshold,
+        ),
     )
 
-    # Save the new perspective
-    save_and_append(
-        Perspective.model_validate(new_perspective),
-        topic.perspectives_file,
+
+@perspectives.command("reuse-stats")
+def reuse_stats() -> None:
+    """Show how often earlier panels were reused and the calls that saved"""
+    path = consilio_home() / REUSE_STATS_FILE
+    if not path.exists():
+        msg = "No panel lookups recorded yet"
+        raise click.ClickException(msg)
+
+    stats = summarise_reuse_stats(path)
+    click.echo(
+        f"{stats['lookups']:.0f} lookups, {stats['matches']:.0f} similar panels found, "
+        f"{stats['reused']:.0f} reused ({stats['hit_rate']:.0%} hit rate)",
     )
+    click.echo(f"Perspective generation calls saved: {stats['reused']:.0f}")
 
 
 if __name__ == "__main__":
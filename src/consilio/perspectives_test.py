@@ -0,0 +1,61 @@
+import click
+import pytest
+from pydantic_core import to_json
+
+from consilio.models import Perspective, Topic
+from consilio.perspectives import (
+    append_unless_duplicate,
+    confirm_unless_duplicate,
+    merge_edit,
+)
+from consilio.storage import PERSPECTIVES
+
+
+def perspective(title: str, expertise: str) -> Perspective:
+    return Perspective(title=title, expertise=expertise, goal="", role="")
+
+
+CFO = perspective("Chief Financial Officer", "cash runway and budgets")
+CTO = perspective("Head of Engineering", "hiring plans and delivery")
+FINANCE = perspective("Financial Officer", "budgets and cash runway")
+LAWYER = perspective("General Counsel", "leases and zoning law")
+
+
+def dump(perspectives: list[Perspective]) -> str:
+    return to_json(perspectives, indent=2).decode()
+
+
+def test_merge_edit_keeps_perspectives_added_meanwhile() -> None:
+    original = dump([CFO])
+    edited = dump([CFO.model_copy(update={"goal": "Keep cash"})])
+    current = dump([CFO, CTO])
+
+    merged = merge_edit(original, current, edited)
+
+    assert merged == dump([CFO.model_copy(update={"goal": "Keep cash"}), CTO])
+
+
+def test_a_flagged_duplicate_is_confirmed_before_locking(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    topic.storage.write(PERSPECTIVES, dump([CFO, CTO]))
+    monkeypatch.setattr(click, "confirm", lambda *_, **__: False)
+    with pytest.raises(click.Abort):
+        confirm_unless_duplicate(topic, FINANCE, merge=False, threshold=0.3)
+    # Distinct perspectives and merged duplicates need no confirmation
+    confirm_unless_duplicate(topic, LAWYER, merge=False, threshold=0.3)
+    confirm_unless_duplicate(topic, FINANCE, merge=True, threshold=0.3)
+
+
+def test_append_rereads_the_stored_perspectives(topic: Topic) -> None:
+    topic.storage.write(PERSPECTIVES, dump([CFO, CTO]))
+    assert append_unless_duplicate(topic, FINANCE, merge=True, threshold=0.3) == [
+        CFO,
+        CTO,
+    ]
+    assert append_unless_duplicate(topic, FINANCE, merge=False, threshold=0.3) == [
+        CFO,
+        CTO,
+        FINANCE,
+    ]
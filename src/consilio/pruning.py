@@ -0,0 +1,123 @@
+"""Decide which perspectives sit out the next discussion round
+
+Each perspective gets one status per saved round: it spoke, passed, repeated
+points it already made, or was absent (pruned or missing from the response).
+A perspective whose last `window` contributions were all passes or repeats sits
+out for `window` rounds and then rotates back in.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from itertools import takewhile
+
+from consilio.models import Perspective, Topic
+from consilio.similarity import max_similarity
+from consilio.utils import estimate_tokens
+
+SPOKE, PASSED, REPEATED, ABSENT = "spoke", "passed", "repeated", "absent"
+PASS_PATTERN = re.compile(r"\bpass(?:ing|es)?\b", re.IGNORECASE)
+# Short opinions mentioning "pass" are passes; longer ones merely use the word
+PASS_MAX_LENGTH = 40
+REPEAT_SIMILARITY = 0.8
+
+
+@dataclass
+class PruningPlan:
+    """Perspectives taking part in a round and the ones sitting it out"""
+
+    active: list[Perspective]
+    pruned: list[Perspective] = field(default_factory=list)
+    tokens_saved: int = 0
+
+
+def _normalise(title: str) -> str:
+    return title.strip().lower()
+
+
+def is_pass(opinion: str) -> bool:
+    """Whether an opinion is a perspective passing on its turn"""
+    return len(opinion) <= PASS_MAX_LENGTH and bool(PASS_PATTERN.search(opinion))
+
+
+def _status(opinion: str | None, earlier_opinions: list[str]) -> str:
+    if opinion is None:
+        return ABSENT
+    if is_pass(opinion):
+        return PASSED
+    if max_similarity(opinion, earlier_opinions) >= REPEAT_SIMILARITY:
+        return REPEATED
+    return SPOKE
+
+
+def _walk_rounds(
+    topic: Topic,
+    last_round: int,
+) -> tuple[dict[str, list[str]], dict[str, list[str]]]:
+    """Each perspective's status per round and its opinions, by normalised title"""
+    titles = [_normalise(p.title) for p in topic.perspectives]
+    history: dict[str, list[str]] = {title: [] for title in titles}
+    opinions: dict[str, list[str]] = {title: [] for title in titles}
+
+    for round_num in range(1, last_round + 1):
+        spoken = {
+            _normalise(d.perspective): d.opinion for d in topic.discussions(round_num)
+        }
+        for title in titles:
+            opinion = spoken.get(title)
+            history[title].append(_status(opinion, opinions[title]))
+            if opinion is not None:
+                opinions[title].append(opinion)
+    return history, opinions
+
+
+def perspective_history(topic: Topic, last_round: int) -> dict[str, list[str]]:
+    """Get each perspective's status per round, keyed by normalised title"""
+    return _walk_rounds(topic, last_round)[0]
+
+
+def should_sit_out(statuses: list[str], window: int) -> bool:
+    """Whether the last `window` contributions were passes or repeats"""
+    absent_streak = len(list(takewhile(lambda s: s == ABSENT, reversed(statuses))))
+    if absent_streak >= window:
+        return False
+    contributions = [s for s in statuses if s != ABSENT][-window:]
+    return len(contributions) == window and all(
+        s in {PASSED, REPEATED} for s in contributions
+    )
+
+
+def _average_opinion_tokens(opinions: list[str]) -> int:
+    return sum(map(estimate_tokens, opinions)) // max(len(opinions), 1)
+
+
+def plan_round(
+    topic: Topic,
+    round_num: int,
+    window: int,
+    keep: tuple[str, ...] = (),
+    drop: tuple[str, ...] = (),
+) -> PruningPlan:
+    """Split the panel into active and pruned perspectives for a round"""
+    logger = logging.getLogger("consilio.pruning")
+    keep_titles = {_normalise(t) for t in keep}
+    drop_titles = {_normalise(t) for t in drop}
+    history, opinions = (
+        _walk_rounds(topic, round_num - 1) if window or drop_titles else ({}, {})
+    )
+
+    plan = PruningPlan(active=[])
+    for perspective in topic.perspectives:
+        title = _normalise(perspective.title)
+        sits_out = title in drop_titles or (
+            title not in keep_titles and should_sit_out(history.get(title, []), window)
+        )
+        if not sits_out:
+            plan.active.append(perspective)
+            continue
+        plan.pruned.append(perspective)
+        plan.tokens_saved += estimate_tokens(str(perspective.model_dump()))
+        plan.tokens_saved += _average_opinion_tokens(opinions.get(title, []))
+
+    logger.debug("Round %s pruning plan: %s", round_num, plan)
+    return plan
@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from consilio.models import Perspective, Topic
+from consilio.pruning import (
+    ABSENT,
+    PASSED,
+    REPEATED,
+    SPOKE,
+    is_pass,
+    perspective_history,
+    plan_round,
+    should_sit_out,
+)
+from consilio.storage import PERSPECTIVES
+from consilio.utils import estimate_tokens
+
+OPINIONS = [
+    "Hiring now stretches the runway past what the board accepted.",
+    "Onboarding three engineers halves velocity for a quarter.",
+    "Customers keep asking for the integration the new hires would build.",
+]
+
+
+def save_panel(topic: Topic, titles: list[str]) -> None:
+    panel = [
+        Perspective(title=t, expertise="", goal="", role="").model_dump()
+        for t in titles
+    ]
+    topic.storage.write(PERSPECTIVES, json.dumps(panel))
+
+
+def save_round(topic: Topic, round_num: int, opinions: dict[str, str]) -> None:
+    discussions = [{"perspective": t, "opinion": o} for t, o in opinions.items()]
+    topic.storage.write(
+        topic.discussion_response_name(round_num),
+        json.dumps(discussions),
+    )
+
+
+@pytest.mark.parametrize(
+    ("opinion", "expected"),
+    [
+        ("Pass.", True),
+        ("I'll pass this round", True),
+        ("We should pass on the offer because margins are too thin this year", False),
+        ("Agreed.", False),
+    ],
+)
+def test_is_pass(opinion: str, expected: bool) -> None:
+    assert is_pass(opinion) is expected
+
+
+@pytest.mark.parametrize(
+    ("statuses", "expected"),
+    [
+        ([], False),
+        ([SPOKE, PASSED], False),
+        ([SPOKE, PASSED, REPEATED], True),
+        # Sitting out ends after `window` absent rounds
+        ([SPOKE, PASSED, REPEATED, ABSENT], True),
+        ([SPOKE, PASSED, REPEATED, ABSENT, ABSENT], False),
+        ([PASSED, ABSENT, PASSED], True),
+    ],
+)
+def test_should_sit_out(statuses: list[str], expected: bool) -> None:
+    assert should_sit_out(statuses, window=2) is expected
+
+
+def test_perspective_history(topic: Topic) -> None:
+    save_panel(topic, ["CFO", "CTO"])
+    save_round(topic, 1, {"CFO": OPINIONS[0], "cto": "Pass"})
+    save_round(topic, 2, {"CFO": OPINIONS[0]})
+    assert perspective_history(topic, 2) == {
+        "cfo": [SPOKE, REPEATED],
+        "cto": [PASSED, ABSENT],
+    }
+
+
+def test_plan_round_rotates_out_passive_perspectives(topic: Topic) -> None:
+    save_panel(topic, ["CFO", "CTO", "Sales"])
+    save_round(topic, 1, {"CFO": OPINIONS[0], "CTO": "Pass", "Sales": "Pass"})
+    save_round(topic, 2, {"CFO": OPINIONS[1], "CTO": "Pass", "Sales": "Pass"})
+
+    plan = plan_round(topic, 3, window=2, keep=("sales",), drop=("CFO",))
+
+    assert [p.title for p in plan.active] == ["Sales"]
+    assert [p.title for p in plan.pruned] == ["CFO", "CTO"]
+    assert plan.tokens_saved > 0
+
+
+def test_plan_round_without_window_keeps_everyone(topic: Topic) -> None:
+    save_panel(topic, ["CFO", "CTO"])
+    save_round(topic, 1, {"CFO": "Pass", "CTO": "Pass"})
+    plan = plan_round(topic, 2, window=0)
+    assert [p.title for p in plan.active] == ["CFO", "CTO"]
+
+
+def test_plan_round_reads_each_round_once(
+    topic: Topic,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    save_panel(topic, ["CFO", "CTO", "Sales"])
+    save_round(topic, 1, {"CFO": OPINIONS[0], "CTO": "Pass", "Sales": "Pass"})
+    save_round(topic, 2, {"CFO": OPINIONS[1], "CTO": "Pass", "Sales": "Pass"})
+    reads = []
+    discussions = Topic.discussions
+    monkeypatch.setattr(
+        Topic,
+        "discussions",
+        lambda self, r: reads.append(r) or discussions(self, r),
+    )
+
+    plan = plan_round(topic, 3, window=2, keep=("Sales",), drop=("CFO",))
+
+    assert sorted(reads) == [1, 2]
+    # Each pruned perspective saves its description and an average opinion
+    cfo, cto, _ = topic.perspectives
+    assert plan.tokens_saved == (
+        estimate_tokens(str(cfo.model_dump()))
+        + (estimate_tokens(OPINIONS[0]) + estimate_tokens(OPINIONS[1])) // 2
+        + estimate_tokens(str(cto.model_dump()))
+        + estimate_tokens("Pass")
+    )
@@ -0,0 +1,103 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import click
+
+from consilio.clarify import run_clarification
+from consilio.discuss import run_discussion_round
+from consilio.executor import quiet
+from consilio.interview import run_interview_round
+from consilio.locking import reserve_round
+from consilio.manifest import recorded_options, stale_artifacts
+from consilio.models import Topic
+from consilio.storage import CLARIFICATION, classify
+
+
+def rebuild_artifact(topic: Topic, name: str) -> None:
+    """Regenerate one artifact from its (stored) inputs"""
+    logger = logging.getLogger("consilio.rebuild")
+    logger.info("Rebuilding %s", name)
+    kind, perspective_index, round_num, _ = classify(name)
+
+    if name == CLARIFICATION:
+        run_clarification(topic, display_fn=quiet)
+    elif kind == "discussion" and round_num is not None:
+        options = recorded_options(topic, name)
+        with reserve_round(topic, kind, round_num=round_num):
+            run_discussion_round(
+                topic,
+                round_num,
+                prune_after=options.get("prune_after", 2),
+                keep=tuple(options.get("keep", ())),
+                drop=tuple(options.get("drop", ())),
+                display_fn=quiet,
+            )
+    elif (
+        kind == "interview" and perspective_index is not None and round_num is not None
+    ):
+        with reserve_round(topic, kind, perspective_index, round_num):
+            run_interview_round(topic, perspective_index, round_num, display_fn=quiet)
+    else:
+        msg = f"Don't know how to rebuild {name}"
+        raise click.ClickException(msg)
+    click.echo(f"Rebuilt: {name}")
+
+
+def _rebuild_in_order(topic: Topic, names: list[str]) -> None:
+    for name in names:
+        rebuild_artifact(topic, name)
+
+
+def rebuild_topic(topic: Topic, stale: list[str], jobs: int = 4) -> None:
+    """Rebuild stale artifacts, running independent chains in parallel
+
+    Discussion rounds build on each other, and so do the rounds of one
+    interview; the clarification, the discussion chain and each interview
+    thread are otherwise independent, except that interviews read the
+    discussion rounds and therefore start once those are rebuilt.
+    """
+    discussions = [n for n in stale if classify(n)[0] == "discussion"]
+    interviews: dict[int | None, list[str]] = {}
+    for name in stale:
+        kind, perspective_index, _, _ = classify(name)
+        if kind == "interview":
+            interviews.setdefault(perspective_index, []).append(name)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        background = []
+        if CLARIFICATION in stale:
+            background.append(pool.submit(rebuild_artifact, topic, CLARIFICATION))
+        _rebuild_in_order(topic, discussions)
+        background += [
+            pool.submit(_rebuild_in_order, topic, names)
+            for names in interviews.values()
+        ]
+        for future in background:
+            future.result()
+
+
+@click.command()
+@click.option("--dry-run", is_flag=True, help="Only list the stale artifacts")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(1, 32),
+    default=4,
+    help="Parallel rebuilds",
+)
+def rebuild(*, dry_run: bool, jobs: int) -> None:
+    """Regenerate artifacts whose inputs changed since they were built"""
+    topic = Topic.load()
+    stale, untracked = stale_artifacts(topic)
+
+    if untracked:
+        click.echo(
+            f"{len(untracked)} artifacts predate dependency tracking and were left alone",
+        )
+    if not stale:
+        click.echo("Everything is up to date")
+        return
+
+    click.echo("Stale: " + ", ".join(stale))
+    if not dry_run:
+        rebuild_topic(topic, stale, jobs)
@@ -0,0 +1,132 @@
+"""Reuse the perspective panel of a similar earlier topic
+
+Recurring decisions (another hire, another vendor) tend to need the same
+panel. Before perspectives are generated, the topic's description is compared
+(TF-IDF cosine) with the descriptions of every other topic in the search
+index that has perspectives. The questions `cons init` seeds README.md with are
+left out, as every topic that kept them would otherwise look alike. A close
+enough match lends its panel and saves
+the generation call. Every lookup is appended to reuse-stats.jsonl in
+`consilio_home()` for `cons perspectives reuse-stats`.
+"""
+
+import functools
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from consilio.models import Perspective, Topic
+from consilio.search import open_index, topic_key
+from consilio.similarity import cosine, tfidf_vectors
+from consilio.storage import consilio_home
+from consilio.utils import render_template
+
+REUSE_THRESHOLD = 0.6
+REUSE_STATS_FILE = "reuse-stats.jsonl"
+REUSED = "reused"
+DECLINED = "declined"
+MISSED = "missed"
+
+_reuse_stats_lock = threading.Lock()
+
+
+@dataclass
+class PanelMatch:
+    """An earlier topic whose description resembles the current one"""
+
+    directory: Path
+    similarity: float
+    perspectives: list[Perspective]
+
+
+@functools.cache
+def _scaffold_lines() -> frozenset[str]:
+    return frozenset(
+        stripped
+        for line in render_template("README.j2").splitlines()
+        if (stripped := line.strip())
+    )
+
+
+def without_scaffold(description: str) -> str:
+    """A description without the lines `cons init` seeded it with"""
+    scaffold = _scaffold_lines()
+    return "\n".join(
+        line for line in description.splitlines() if line.strip() not in scaffold
+    )
+
+
+def _past_descriptions(connection: sqlite3.Connection, topic: Topic) -> dict[str, str]:
+    """Descriptions of the other indexed topics that have perspectives"""
+    rows = connection.execute(
+        """
+        SELECT d.topic, d.content FROM passages AS d
+        WHERE d.kind = 'description' AND d.topic != ? AND EXISTS (
+            SELECT 1 FROM passages AS p
+            WHERE p.topic = d.topic AND p.kind = 'perspective'
+        )
+        """,
+        (topic_key(topic),),
+    )
+    return dict(rows.fetchall())
+
+
+def find_similar_panel(
+    topic: Topic,
+    threshold: float = REUSE_THRESHOLD,
+) -> PanelMatch | None:
+    """The most similar earlier topic's panel, if it reaches the threshold"""
+    logger = logging.getLogger("consilio.reuse")
+    with open_index() as connection:
+        past = _past_descriptions(connection, topic)
+    if not past:
+        return None
+
+    descriptions = [topic.description, *past.values()]
+    target, *vectors = tfidf_vectors([without_scaffold(d) for d in descriptions])
+    ranked = sorted(
+        zip(past, (cosine(target, v) for v in vectors), strict=True),
+        key=lambda match: match[1],
+        reverse=True,
+    )
+    for key, similarity in ranked:
+        if similarity < threshold:
+            break
+        # The index can outlive a topic; skip matches that are gone or emptied
+        directory = Path(key)
+        perspectives = (
+            Topic.load(directory).perspectives
+            if (directory / "cons.toml").exists()
+            else []
+        )
+        if perspectives:
+            logger.debug("Closest panel: %s (%.2f)", directory, similarity)
+            return PanelMatch(directory, similarity, perspectives)
+    return None
+
+
+def record_lookup(topic: Topic, outcome: str, match: PanelMatch | None) -> None:
+    """Append a panel lookup and its outcome to the shared stats file"""
+    entry = {
+        "topic": topic_key(topic),
+        "outcome": outcome,
+        "source": str(match.directory) if match else None,
+        "similarity": round(match.similarity, 3) if match else None,
+    }
+    with _reuse_stats_lock, (consilio_home() / REUSE_STATS_FILE).open("a") as stats:
+        stats.write(json.dumps(entry) + "\n")
+
+
+def summarise_reuse_stats(path: Path) -> dict[str, float]:
+    """Lookups, matches, reuses and hit rate from a reuse stats file"""
+    entries = [json.loads(line) for line in path.read_text().splitlines()]
+    reused = sum(e["outcome"] == REUSED for e in entries)
+    return {
+        "lookups": len(entries),
+        "matches": sum(e["outcome"] != MISSED for e in entries),
+        "reused": reused,
+        "hit_rate": reused / len(entries) if entries else 0.0,
+    }
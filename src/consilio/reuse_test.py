@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import click
+import pytest
+from pydantic_core import to_json
+
+from consilio.models import Config, Perspective, Topic
+from consilio.perspectives import reuse_similar_panel
+from consilio.reuse import (
+    DECLINED,
+    REUSE_STATS_FILE,
+    REUSE_THRESHOLD,
+    REUSED,
+    find_similar_panel,
+    record_lookup,
+    summarise_reuse_stats,
+    without_scaffold,
+)
+from consilio.search import index_topic, open_index
+from consilio.similarity import max_similarity
+from consilio.storage import DESCRIPTION, PERSPECTIVES
+from consilio.utils import render_template
+
+PANEL = [
+    Perspective(title="Chief Financial Officer", expertise="", goal="", role=""),
+    Perspective(title="Head of Logistics", expertise="", goal="", role=""),
+]
+
+
+def past_topic(directory: Path, description: str) -> Topic:
+    """An earlier topic with a panel, in the search index"""
+    directory.mkdir()
+    Config().save(directory / "cons.toml")
+    past = Topic.load(directory)
+    past.storage.write_many(
+        {DESCRIPTION: description, PERSPECTIVES: to_json(PANEL).decode()},
+    )
+    with open_index() as connection:
+        index_topic(connection, past)
+    return past
+
+
+def scaffolded(answer: str) -> str:
+    """A README.md as `cons init` leaves it once the answer is filled in"""
+    return render_template("README.j2") + "\n" + answer + "\n"
+
+
+def test_a_similar_topic_lends_its_panel(topic: Topic, tmp_path: Path) -> None:
+    past = past_topic(tmp_path / "past", scaffolded("Should we open a warehouse?"))
+    match = find_similar_panel(topic)
+    assert match is not None
+    assert match.directory == past.directory.resolve()
+    assert match.similarity >= REUSE_THRESHOLD
+    assert match.perspectives == PANEL
+
+
+def test_unrelated_topics_do_not_match(topic: Topic, tmp_path: Path) -> None:
+    past_topic(tmp_path / "past", "Which language should the team learn next?")
+    assert find_similar_panel(topic) is None
+
+
+def test_the_init_scaffold_does_not_make_topics_alike(
+    topic: Topic,
+    tmp_path: Path,
+) -> None:
+    description = scaffolded("Should we open a second warehouse?")
+    topic.storage.write(DESCRIPTION, description)
+    other = scaffolded("Which language should the team learn next?")
+    past_topic(tmp_path / "past", other)
+
+    assert max_similarity(description, [other]) >= REUSE_THRESHOLD
+    assert find_similar_panel(topic) is None
+    assert without_scaffold(other).strip() == other.splitlines()[-1]
+
+
+def test_reusing_a_panel_skips_generation(
+    topic: Topic,
+    tmp_path: Path,
+    consilio_home: Path,
+) -> None:
+    past_topic(tmp_path / "past", "Should we open a second warehouse?")
+    assert reuse_similar_panel(topic, 1, "auto") == PANEL[:1]
+    assert topic.perspectives == PANEL[:1]
+    stats = summarise_reuse_stats(consilio_home / REUSE_STATS_FILE)
+    assert stats["reused"] == 1
+
+
+def test_a_declined_panel_is_not_stored(
+    topic: Topic,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    past_topic(tmp_path / "past", "Should we open a second warehouse?")
+    monkeypatch.setattr(click, "confirm", lambda *_, **__: False)
+    assert reuse_similar_panel(topic, 2, "ask") is None
+    assert topic.perspectives == []
+
+
+def test_lookups_are_summarised(topic: Topic, consilio_home: Path) -> None:
+    # Nothing is indexed yet, so the first lookup misses
+    assert reuse_similar_panel(topic, 2, "auto") is None
+    record_lookup(topic, DECLINED, None)
+    record_lookup(topic, REUSED, None)
+    record_lookup(topic, REUSED, None)
+
+    stats = summarise_reuse_stats(consilio_home / REUSE_STATS_FILE)
+    assert stats == {"lookups": 4, "matches": 3, "reused": 2, "hit_rate": 0.5}
@@ -0,0 +1,350 @@
+"""Full-text search across every topic on this machine
+
+Descriptions, perspectives, discussion opinions and interview answers are kept
+as passages in one SQLite FTS5 index in `consilio_home()`. The index is updated
+whenever a response is saved: the artifact's old passages are replaced, and
+artifacts whose content hash has not changed are skipped. `cons search
+--reindex` walks a directory to add topics written before the index existed.
+"""
+
+import logging
+import sqlite3
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+import click
+from pydantic import ValidationError
+
+from consilio.manifest import content_hash
+from consilio.models import Discussion, Perspective, Topic, response_adapter
+from consilio.storage import DESCRIPTION, PERSPECTIVES, classify, consilio_home
+
+SEARCH_INDEX = "search.db"
+KINDS = ("description", "perspective", "discussion", "interview")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS passages (
+        id INTEGER PRIMARY KEY,
+        topic TEXT NOT NULL,
+        name TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        perspective TEXT,
+        round_num INTEGER,
+        content TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS passages_artifact ON passages (topic, name);
+    CREATE TABLE IF NOT EXISTS indexed_artifacts (
+        topic TEXT NOT NULL,
+        name TEXT NOT NULL,
+        hash TEXT NOT NULL,
+        PRIMARY KEY (topic, name)
+    );
+    CREATE VIRTUAL TABLE IF NOT EXISTS passages_fts USING fts5(
+        content,
+        perspective,
+        content = 'passages',
+        content_rowid = 'id',
+        tokenize = 'porter unicode61'
+    );
+    CREATE TRIGGER IF NOT EXISTS passages_insert AFTER INSERT ON passages BEGIN
+        INSERT INTO passages_fts (rowid, content, perspective)
+        VALUES (new.id, new.content, new.perspective);
+    END;
+    CREATE TRIGGER IF NOT EXISTS passages_delete AFTER DELETE ON passages BEGIN
+        INSERT INTO passages_fts (passages_fts, rowid, content, perspective)
+        VALUES ('delete', old.id, old.content, old.perspective);
+    END;
+"""
+
+
+@dataclass
+class Passage:
+    """One searchable piece of an artifact"""
+
+    kind: str
+    perspective: str | None
+    round_num: int | None
+    content: str
+
+
+@dataclass
+class SearchResult:
+    """A matching passage with a highlighted snippet"""
+
+    topic: str
+    kind: str
+    perspective: str | None
+    round_num: int | None
+    snippet: str
+
+
+@contextmanager
+def open_index(path: Path | None = None) -> Iterator[sqlite3.Connection]:
+    """Open the search index; statements run in autocommit mode unless wrapped"""
+    path = path or consilio_home() / SEARCH_INDEX
+    with closing(sqlite3.connect(path, isolation_level=None, timeout=30)) as connection:
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        yield connection
+
+
+def topic_key(topic: Topic) -> str:
+    """How a topic is identified in the index: its absolute directory"""
+    return str(topic.directory.resolve())
+
+
+def artifact_passages(topic: Topic, name: str, content: str) -> list[Passage]:
+    """Split an artifact into passages (none for artifacts that aren't searchable)"""
+    kind, perspective_index, round_num, part = classify(name)
+    if name == DESCRIPTION:
+        return [Passage("description", None, None, content)]
+    if name == PERSPECTIVES:
+        perspectives = response_adapter(list[Perspective]).validate_json(content)
+        return [
+            Passage("perspective", p.title, None, p.to_markdown(i))
+            for i, p in enumerate(perspectives, 1)
+        ]
+    if kind == "discussion" and part == "response":
+        discussions = response_adapter(list[Discussion]).validate_json(content)
+        return [
+            Passage("discussion", d.perspective, round_num, d.opinion)
+            for d in discussions
+        ]
+    if kind == "interview" and part == "response" and perspective_index is not None:
+        answer = Discussion.model_validate_json(content)
+        perspectives = topic.perspectives
+        title = (
+            perspectives[perspective_index].title
+            if perspective_index < len(perspectives)
+            else answer.perspective
+        )
+        return [Passage("interview", title, round_num, answer.opinion)]
+    return []
+
+
+def index_artifact(
+    connection: sqlite3.Connection,
+    topic: Topic,
+    name: str,
+    content: str | None,
+) -> bool:
+    """Replace an artifact's passages; False if it was already up to date"""
+    key = topic_key(topic)
+    digest = content_hash(content)
+    row = connection.execute(
+        "SELECT hash FROM indexed_artifacts WHERE topic = ? AND name = ?",
+        (key, name),
+    ).fetchone()
+    if row and row[0] == digest:
+        return False
+
+    passages = [] if content is None else artifact_passages(topic, name, content)
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        connection.execute(
+            "DELETE FROM passages WHERE topic = ? AND name = ?",
+            (key, name),
+        )
+        connection.executemany(
+            """
+            INSERT INTO passages (topic, name, kind, perspective, round_num, content)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (key, name, p.kind, p.perspective, p.round_num, p.content)
+                for p in passages
+            ],
+        )
+        if digest is None:
+            connection.execute(
+                "DELETE FROM indexed_artifacts WHERE topic = ? AND name = ?",
+                (key, name),
+            )
+        else:
+            connection.execute(
+                "INSERT OR REPLACE INTO indexed_artifacts VALUES (?, ?, ?)",
+                (key, name, digest),
+            )
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+    return True
+
+
+def update_search_index(topic: Topic, name: str, content: str) -> None:
+    """Index a freshly saved artifact, and the description if it was edited since"""
+    if not topic.config.search_index:
+        return
+    logger = logging.getLogger("consilio.search")
+    try:
+        with open_index() as connection:
+            index_artifact(connection, topic, name, content)
+            # The description is edited by hand, so catch up with it here
+            index_artifact(
+                connection,
+                topic,
+                DESCRIPTION,
+                topic.storage.read(DESCRIPTION),
+            )
+    except (sqlite3.Error, ValidationError) as e:
+        # The artifact itself is saved; only search results lag behind
+        logger.warning("Could not index %s (%s); run 'cons search --reindex'", name, e)
+
+
+def index_topic(connection: sqlite3.Connection, topic: Topic) -> int:
+    """Bring all of a topic's artifacts up to date; return how many changed"""
+    return sum(
+        index_artifact(connection, topic, name, topic.storage.read(name))
+        for name in topic.storage.names()
+    )
+
+
+def drop_missing_topics(connection: sqlite3.Connection) -> None:
+    """Forget topics whose directory has been deleted or moved"""
+    logger = logging.getLogger("consilio.search")
+    rows = connection.execute("SELECT DISTINCT topic FROM indexed_artifacts")
+    for (key,) in rows.fetchall():
+        if not (Path(key) / "cons.toml").exists():
+            logger.info("Dropping %s from the search index", key)
+            connection.execute("DELETE FROM passages WHERE topic = ?", (key,))
+            connection.execute("DELETE FROM indexed_artifacts WHERE topic = ?", (key,))
+
+
+def reindex(connection: sqlite3.Connection, root: Path) -> tuple[int, int]:
+    """Index every topic below root; return the topics and artifacts indexed"""
+    logger = logging.getLogger("consilio.search")
+    topics = [Topic.load(c.parent) for c in sorted(root.resolve().rglob("cons.toml"))]
+    topics = [t for t in topics if t.config.search_index]
+    changed = 0
+    for topic in topics:
+        try:
+            changed += index_topic(connection, topic)
+        except ValidationError as e:
+            logger.warning("Skipping the rest of %s: %s", topic.directory, e)
+    drop_missing_topics(connection)
+    return len(topics), changed
+
+
+def quote_query(query: str) -> str:
+    """Match every word of a plain query, leaving FTS5 operators uninterpreted"""
+    # Each word becomes an FTS5 string, so "cash-flow" or "vendor: x" still work
+    return " ".join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+def search_passages(
+    connection: sqlite3.Connection,
+    query: str,
+    *,
+    raw: bool = False,
+    perspective: str | None = None,
+    round_num: int | None = None,
+    kind: str | None = None,
+    limit: int = 20,
+) -> list[SearchResult]:
+    """Best matches first; a raw query uses FTS5 syntax, others match each word"""
+    conditions = ["passages_fts MATCH ?"]
+    parameters: list[str | int] = [query if raw else quote_query(query)]
+    if perspective is not None:
+        conditions.append("p.perspective LIKE ?")
+        parameters.append(f"%{perspective}%")
+    if round_num is not None:
+        conditions.append("p.round_num = ?")
+        parameters.append(round_num)
+    if kind is not None:
+        conditions.append("p.kind = ?")
+        parameters.append(kind)
+    rows = connection.execute(
+        f"""
+        SELECT p.topic, p.kind, p.perspective, p.round_num,
+               snippet(passages_fts, 0, '[', ']', ' ... ', 16)
+        FROM passages_fts JOIN passages AS p ON p.id = passages_fts.rowid
+        WHERE {" AND ".join(conditions)}
+        ORDER BY rank
+        LIMIT ?
+        """,
+        [*parameters, limit],
+    )
+    return [SearchResult(*row) for row in rows]
+
+
+def _location(result: SearchResult) -> str:
+    location = Path(result.topic).name
+    if result.kind in {"discussion", "interview"}:
+        location += f" / {result.kind} round {result.round_num}"
+    else:
+        location += f" / {result.kind}"
+    if result.perspective and result.kind != "description":
+        location += f" / {result.perspective}"
+    return location
+
+
+def display_results(results: list[SearchResult]) -> None:
+    """Print each match under the topic, round and perspective it came from"""
+    if not results:
+        click.echo("No matches")
+    for result in results:
+        click.secho(_location(result), bold=True)
+        click.echo(f"  {' '.join(result.snippet.split())}\n")
+
+
+@click.command()
+@click.argument("query", required=False)
+@click.option("--perspective", "-p", help="Only passages by matching perspectives")
+@click.option(
+    "--round",
+    "-r",
+    "round_num",
+    type=click.IntRange(1),
+    help="Only this round",
+)
+@click.option("--kind", type=click.Choice(KINDS), help="Only this kind of passage")
+@click.option("--limit", "-n", type=click.IntRange(1), default=20, help="Most results")
+@click.option(
+    "--raw",
+    is_flag=True,
+    help='Use FTS5 query syntax (AND/OR/NOT, "phrases", prefix*, NEAR)',
+)
+@click.option(
+    "--reindex",
+    "reindex_root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="First index every topic below this directory",
+)
+def search(
+    query: str | None,
+    *,
+    perspective: str | None,
+    round_num: int | None,
+    kind: str | None,
+    limit: int,
+    raw: bool,
+    reindex_root: Path | None,
+) -> None:
+    """Search what was said across all topics"""
+    if query is None and reindex_root is None:
+        msg = "Give a search query, or --reindex DIRECTORY to build the index"
+        raise click.ClickException(msg)
+
+    with open_index() as connection:
+        if reindex_root is not None:
+            topics, changed = reindex(connection, reindex_root)
+            click.echo(f"Indexed {topics} topics ({changed} artifacts updated)")
+        if query is None:
+            return
+        try:
+            results = search_passages(
+                connection,
+                query,
+                raw=raw,
+                perspective=perspective,
+                round_num=round_num,
+                kind=kind,
+                limit=limit,
+            )
+        except sqlite3.OperationalError as e:
+            msg = f"Invalid search query {query!r}: {e}"
+            raise click.ClickException(msg) from e
+    display_results(results)
@@ -0,0 +1,103 @@
+import sqlite3
+from collections.abc import Iterator
+
+import pytest
+from click.testing import CliRunner
+from pydantic_core import to_json
+
+from consilio.models import Discussion, Perspective, Topic
+from consilio.search import (
+    index_artifact,
+    index_topic,
+    open_index,
+    quote_query,
+    search,
+    search_passages,
+)
+from consilio.storage import PERSPECTIVES
+
+ROUND_1 = [
+    Discussion(perspective="Chief Financial Officer", opinion="Cash-flow is tight."),
+    Discussion(perspective="Head of Operations", opinion="What's next: a lease."),
+]
+
+
+@pytest.fixture
+def connection(topic: Topic) -> Iterator[sqlite3.Connection]:
+    """An index holding the topic's description, perspectives and round 1"""
+    topic.storage.write_many(
+        {
+            PERSPECTIVES: to_json(
+                [Perspective(title="Head of Operations", expertise="", goal="", role="")],
+            ).decode(),
+            topic.discussion_response_name(1): to_json(ROUND_1).decode(),
+        },
+    )
+    with open_index() as connection:
+        index_topic(connection, topic)
+        yield connection
+
+
+def test_quote_query() -> None:
+    assert quote_query('vendor: "x" ') == '"vendor:" """x"""'
+
+
+@pytest.mark.parametrize(
+    ("query", "kind"),
+    [
+        ("cash-flow", "discussion"),
+        ("what's next", "discussion"),
+        ("lease:", "discussion"),
+        ("warehouse", "description"),
+        ("operations", "perspective"),
+    ],
+)
+def test_plain_queries_match_words(
+    connection: sqlite3.Connection,
+    query: str,
+    kind: str,
+) -> None:
+    [result] = search_passages(connection, query, kind=kind)
+    assert result.kind == kind
+
+
+def test_raw_queries_use_fts5_syntax(connection: sqlite3.Connection) -> None:
+    results = search_passages(connection, "cash OR lease", raw=True, kind="discussion")
+    assert len(results) == 2
+    assert search_passages(connection, "cash OR lease") == []
+    with pytest.raises(sqlite3.OperationalError):
+        search_passages(connection, "cash-flow:", raw=True)
+
+
+def test_filters(connection: sqlite3.Connection) -> None:
+    [result] = search_passages(connection, "lease", perspective="operations")
+    assert (result.perspective, result.round_num) == ("Head of Operations", 1)
+    assert search_passages(connection, "lease", round_num=2) == []
+
+
+def test_index_artifact_skips_unchanged_and_drops_deleted(
+    connection: sqlite3.Connection,
+    topic: Topic,
+) -> None:
+    name = topic.discussion_response_name(1)
+    assert not index_artifact(connection, topic, name, topic.storage.read(name))
+
+    assert index_artifact(connection, topic, name, to_json(ROUND_1[:1]).decode())
+    assert search_passages(connection, "lease") == []
+
+    assert index_artifact(connection, topic, name, None)
+    assert search_passages(connection, "cash") == []
+
+
+def test_search_command(connection: sqlite3.Connection) -> None:
+    runner = CliRunner()
+    result = runner.invoke(search, ["vendor: cash-flow"])
+    assert result.exit_code == 0, result.output
+    assert "No matches" in result.output
+
+    result = runner.invoke(search, ["cash-flow"])
+    assert "[Cash-flow] is tight" in result.output
+
+    result = runner.invoke(search, ["--raw", "vendor: x"])
+    assert result.exit_code == 1
+    assert "Invalid search query" in result.output
@@ -0,0 +1,194 @@
+"""Page through a topic's history one round or interview at a time
+
+Pages are read and rendered only when the pager asks for them, so opening a
+topic with many rounds costs the same as opening a short one. Rendered pages
+are cached in `consilio_home()` under the hash of their markdown plus the
+terminal width and colour system, so paging back through a topic, or opening
+it again, skips rich's markdown rendering. The cache keeps the most recently
+used renderings and drops the rest.
+"""
+
+import itertools
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+
+import click
+from rich.console import Console
+from rich.markdown import Markdown
+
+from consilio.manifest import content_hash
+from consilio.models import Clarification, Discussion, Topic, get_console
+from consilio.storage import CLARIFICATION, DESCRIPTION, FileStorage, consilio_home
+
+RENDER_CACHE = "rendered"
+RENDER_CACHE_MAX_FILES = 500
+
+
+def _evict_renderings(cache_directory: Path) -> None:
+    """Drop the least recently used renderings beyond the cache's cap"""
+    renderings = sorted(
+        cache_directory.glob("*.ansi"),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in renderings[RENDER_CACHE_MAX_FILES:]:
+        path.unlink(missing_ok=True)
+
+
+def render_markdown(markdown: str, width: int) -> str:
+    """Render markdown to terminal text, reusing an earlier rendering"""
+    logger = logging.getLogger("consilio.show")
+    color_system = get_console().color_system
+    cache_directory = consilio_home() / RENDER_CACHE
+    cache_directory.mkdir(exist_ok=True)
+    cache = FileStorage(cache_directory)
+    name = f"{content_hash(markdown)}-{width}-{color_system or 'plain'}.ansi"
+    if (rendered := cache.read(name)) is not None:
+        (cache_directory / name).touch()
+        return rendered
+
+    logger.debug("Rendering %s", name)
+    console = Console(
+        width=width,
+        color_system=color_system,
+        force_terminal=color_system is not None,
+    )
+    with console.capture() as capture:
+        console.print(Markdown(markdown))
+    rendered = capture.get()
+    cache.write(name, rendered)
+    _evict_renderings(cache_directory)
+    return rendered
+
+
+def _description_page(topic: Topic) -> str | None:
+    return topic.storage.read(DESCRIPTION)
+
+
+def _clarification_page(topic: Topic) -> str | None:
+    stored = topic.storage.read(CLARIFICATION)
+    if stored is None:
+        return None
+    clarification = Clarification.model_validate_json(stored)
+    return "# Clarification\n\n" + clarification.to_markdown()
+
+
+def _perspectives_page(topic: Topic) -> str | None:
+    perspectives = topic.perspectives
+    if not perspectives:
+        return None
+    return "# Perspectives\n\n" + "".join(
+        p.to_markdown(i) for i, p in enumerate(perspectives)
+    )
+
+
+def _discussion_page(topic: Topic, round_num: int) -> str:
+    md = f"# Discussion round {round_num}\n\n"
+    if user_input := topic.storage.read(topic.discussion_input_name(round_num)):
+        md += f"> {user_input.strip()}\n\n"
+    return md + "".join(d.to_markdown() for d in topic.discussions(round_num))
+
+
+def _interview_page(topic: Topic, perspective_index: int, round_num: int) -> str:
+    perspectives = topic.perspectives
+    title = (
+        perspectives[perspective_index].title
+        if perspective_index < len(perspectives)
+        else f"perspective #{perspective_index}"
+    )
+    md = f"# Interview with {title}, round {round_num}\n\n"
+    if question := topic.storage.read(
+        topic.interview_input_name(perspective_index, round_num),
+    ):
+        md += f"**Question:** {question.strip()}\n\n"
+    response = topic.storage.read(
+        topic.interview_response_name(perspective_index, round_num),
+    )
+    if response is not None:
+        md += Discussion.model_validate_json(response).opinion + "\n"
+    return md
+
+
+def _rounds(latest: int, round_num: int | None) -> list[int]:
+    """All rounds up to latest, or just round_num if it exists"""
+    if round_num is None:
+        return list(range(1, latest + 1))
+    return [round_num] if round_num <= latest else []
+
+
+def _overview_pages(topic: Topic) -> Iterator[str]:
+    for page_fn in (_description_page, _clarification_page, _perspectives_page):
+        if (page := page_fn(topic)) is not None:
+            yield page
+
+
+def _interview_pages(
+    topic: Topic,
+    round_num: int | None,
+    perspective_index: int | None,
+) -> Iterator[str]:
+    interviews = topic.storage.latest_rounds("interview")
+    if perspective_index is not None:
+        interviews = {perspective_index: interviews.get(perspective_index, 0)}
+    for index, latest in sorted(interviews.items()):
+        assert index is not None, "Interview artifacts always carry a perspective"
+        for r in _rounds(latest, round_num):
+            yield _interview_page(topic, index, r)
+
+
+def topic_pages(
+    topic: Topic,
+    round_num: int | None = None,
+    perspective_index: int | None = None,
+) -> Iterator[str]:
+    """Markdown of each page in order, read from storage as it is reached"""
+    if round_num is None and perspective_index is None:
+        yield from _overview_pages(topic)
+    if perspective_index is None:
+        for r in _rounds(topic.latest_discussion_round, round_num):
+            yield _discussion_page(topic, r)
+    if round_num is None or perspective_index is not None:
+        yield from _interview_pages(topic, round_num, perspective_index)
+
+
+@click.command()
+@click.option(
+    "--round",
+    "-r",
+    "round_num",
+    type=click.IntRange(1),
+    help="Only this discussion round (or interview round with --interview)",
+)
+@click.option(
+    "--interview",
+    "-i",
+    "perspective_index",
+    type=click.IntRange(0),
+    help="Only the interview with this perspective",
+)
+@click.option("--no-pager", is_flag=True, help="Print instead of opening a pager")
+def show(
+    round_num: int | None,
+    perspective_index: int | None,
+    *,
+    no_pager: bool,
+) -> None:
+    """Page through the topic's description, rounds and interviews"""
+    topic = Topic.load()
+    markdown_pages = topic_pages(topic, round_num, perspective_index)
+    first = next(markdown_pages, None)
+    if first is None:
+        msg = "Nothing to show. Check the round and interview you asked for"
+        raise click.ClickException(msg)
+
+    width = get_console().width
+    pages = (
+        render_markdown(md, width) for md in itertools.chain([first], markdown_pages)
+    )
+    if no_pager:
+        for page in pages:
+            click.echo(page, nl=False, color=True)
+    else:
+        # The pager pulls pages as the user scrolls, so later rounds render lazily
+        click.echo_via_pager(pages, color=True)
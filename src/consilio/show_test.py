@@ -0,0 +1,104 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from rich.console import Console
+
+from consilio import show
+from consilio.models import Discussion, Topic
+from consilio.show import RENDER_CACHE, render_markdown, topic_pages
+from consilio.storage import PERSPECTIVES
+
+
+@pytest.fixture
+def renders(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Widths of the markdown rich actually renders"""
+    widths = []
+
+    def console(**kwargs: Any) -> Console:  # noqa: ANN401
+        widths.append(kwargs["width"])
+        return Console(**kwargs)
+
+    monkeypatch.setattr(show, "Console", console)
+    return widths
+
+
+def build_history(topic: Topic) -> None:
+    topic.storage.write(PERSPECTIVES, "[]")
+    for round_num in (1, 2):
+        topic.storage.write(topic.discussion_response_name(round_num), "[]")
+    answer = Discussion(perspective="CFO", opinion="Lease it").model_dump_json()
+    for perspective_index, round_num in ((0, 1), (0, 2), (1, 1)):
+        name = topic.interview_response_name(perspective_index, round_num)
+        topic.storage.write(name, answer)
+
+
+def headings(pages: Any) -> list[str]:  # noqa: ANN401
+    return [page.splitlines()[0] for page in pages]
+
+
+def test_all_pages_in_order(topic: Topic) -> None:
+    build_history(topic)
+    assert headings(topic_pages(topic)) == [
+        "Should we open a second warehouse?",
+        "# Discussion round 1",
+        "# Discussion round 2",
+        "# Interview with perspective #0, round 1",
+        "# Interview with perspective #0, round 2",
+        "# Interview with perspective #1, round 1",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("round_num", "perspective_index", "expected"),
+    [
+        (2, None, ["# Discussion round 2"]),
+        (
+            None,
+            0,
+            [
+                "# Interview with perspective #0, round 1",
+                "# Interview with perspective #0, round 2",
+            ],
+        ),
+        (2, 0, ["# Interview with perspective #0, round 2"]),
+        (2, 1, []),
+        (3, None, []),
+    ],
+)
+def test_pages_filtered_by_round_and_interview(
+    topic: Topic,
+    round_num: int | None,
+    perspective_index: int | None,
+    expected: list[str],
+) -> None:
+    build_history(topic)
+    pages = topic_pages(topic, round_num, perspective_index)
+    assert headings(pages) == expected
+
+
+def test_renderings_are_cached_per_width(renders: list[int]) -> None:
+    first = render_markdown("# Round 1", 80)
+    assert render_markdown("# Round 1", 80) == first
+    render_markdown("# Round 1", 40)
+    assert renders == [80, 40]
+
+
+def test_least_recently_used_renderings_are_evicted(
+    consilio_home: Path,
+    renders: list[int],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(show, "RENDER_CACHE_MAX_FILES", 2)
+    render_markdown("# A", 80)
+    render_markdown("# B", 80)
+    for age, path in enumerate(sorted((consilio_home / RENDER_CACHE).iterdir())):
+        os.utime(path, (age, age))
+    render_markdown("# A", 80)
+    render_markdown("# C", 80)
+
+    assert len(list((consilio_home / RENDER_CACHE).iterdir())) == 2
+    render_markdown("# A", 80)
+    render_markdown("# B", 80)
+    assert len(renders) == 4
@@ -0,0 +1,95 @@
+"""Offline lexical similarity (TF-IDF cosine) for short texts"""
+
+import math
+import re
+from collections import Counter
+from itertools import combinations
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+STOP_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "and",
+        "are",
+        "as",
+        "at",
+        "be",
+        "but",
+        "by",
+        "for",
+        "from",
+        "has",
+        "have",
+        "i",
+        "in",
+        "is",
+        "it",
+        "its",
+        "of",
+        "on",
+        "or",
+        "our",
+        "so",
+        "that",
+        "the",
+        "their",
+        "this",
+        "to",
+        "was",
+        "we",
+        "were",
+        "will",
+        "with",
+        "you",
+        "your",
+    },
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase words without stop words"""
+    return [w for w in WORD_PATTERN.findall(text.lower()) if w not in STOP_WORDS]
+
+
+def tfidf_vectors(documents: list[str]) -> list[dict[str, float]]:
+    """Build L2-normalised TF-IDF vectors for a small corpus"""
+    counts = [Counter(tokenize(d)) for d in documents]
+    document_frequency = Counter(word for c in counts for word in c)
+    idf = {
+        word: math.log((1 + len(documents)) / (1 + df)) + 1
+        for word, df in document_frequency.items()
+    }
+
+    vectors = []
+    for count in counts:
+        vector = {word: tf * idf[word] for word, tf in count.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        vectors.append({word: v / norm for word, v in vector.items()})
+    return vectors
+
+
+def cosine(a: dict[str, float], b: dict[str, float]) -> float:
+    """Cosine similarity of two normalised sparse vectors"""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(word, 0.0) for word, weight in a.items())
+
+
+def max_similarity(text: str, others: list[str]) -> float:
+    """Highest TF-IDF cosine between a text and any of the others"""
+    if not others:
+        return 0.0
+    target, *vectors = tfidf_vectors([text, *others])
+    return max(cosine(target, v) for v in vectors)
+
+
+def near_duplicates(texts: list[str], threshold: float) -> list[tuple[int, int, float]]:
+    """Index pairs (i < j) whose TF-IDF cosine reaches the threshold"""
+    vectors = tfidf_vectors(texts)
+    return [
+        (i, j, score)
+        for i, j in combinations(range(len(vectors)), 2)
+        if (score := cosine(vectors[i], vectors[j])) >= threshold
+    ]
+
@@ -0,0 +1,44 @@
+import pytest
+
+from consilio.similarity import (
+    cosine,
+    max_similarity,
+    near_duplicates,
+    tfidf_vectors,
+    tokenize,
+)
+
+
+def test_tokenize_drops_stop_words_and_case() -> None:
+    assert tokenize("The CFO's view of our runway") == ["cfo's", "view", "runway"]
+
+
+def test_tfidf_vectors_are_normalised() -> None:
+    for vector in tfidf_vectors(["cash runway short", "hire two engineers", ""]):
+        norm = sum(v * v for v in vector.values())
+        assert norm == pytest.approx(1.0 if vector else 0.0, abs=0.01)
+
+
+def test_cosine() -> None:
+    same, other = tfidf_vectors(["cash runway", "cash runway"])
+    assert cosine(same, other) == pytest.approx(1.0, abs=0.01)
+    assert cosine({"a": 1.0}, {"b": 1.0}) == 0.0
+
+
+def test_max_similarity() -> None:
+    assert max_similarity("anything", []) == 0.0
+    score = max_similarity(
+        "Cash runway is short",
+        ["The runway of cash is short", "Hire engineers"],
+    )
+    assert score == pytest.approx(1.0, abs=0.01)
+
+
+def test_near_duplicates() -> None:
+    texts = [
+        "Chief financial officer watching cash runway",
+        "Head of engineering hiring plan",
+        "Financial officer watching the cash runway",
+    ]
+    pairs = near_duplicates(texts, threshold=0.6)
+    assert [(i, j) for i, j, _ in pairs] == [(0, 2)]
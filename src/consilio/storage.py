@@ -0,0 +1,227 @@
+"""Storage engines for topic artifacts
+
+Artifacts are addressed by the names the loose-file layout has always used
+(`README.md`, `perspectives.json`, `discussion-r3-response.md`, ...), so the
+file engine is a thin wrapper over the topic directory while the SQLite engine
+keeps the same names as primary keys and indexes the round structure.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Literal, Protocol, get_args
+
+DESCRIPTION = "README.md"
+PERSPECTIVES = "perspectives.json"
+CLARIFICATION = "clarification.json"
+MANIFEST = "manifest.json"
+SUMMARIES = "summaries.json"
+DATABASE = "consilio.db"
+NAMED_ARTIFACTS = {DESCRIPTION, PERSPECTIVES, CLARIFICATION, MANIFEST, SUMMARIES}
+
+ROUND_ARTIFACT_PATTERN = re.compile(
+    r"(?P<kind>discussion|interview)(?:-p(?P<perspective>\d+))?"
+    r"-r(?P<round>\d+)-(?P<part>input|prompt|response)\.md",
+)
+
+Engine = Literal["files", "sqlite"]
+ENGINES: tuple[str, ...] = get_args(Engine)
+
+
+class TopicStorage(Protocol):
+    """Interface every topic storage engine implements"""
+
+    def read(self, name: str) -> str | None: ...
+
+    def write(self, name: str, content: str) -> None: ...
+
+    def write_many(self, records: dict[str, str]) -> None: ...
+
+    def exists(self, name: str) -> bool: ...
+
+    def names(self) -> Iterator[str]: ...
+
+    def latest_rounds(self, kind: str) -> dict[int | None, int]: ...
+
+
+def classify(name: str) -> tuple[str, int | None, int | None, str | None]:
+    """Split an artifact name into (kind, perspective_index, round_num, part)"""
+    match = ROUND_ARTIFACT_PATTERN.fullmatch(name)
+    if not match:
+        return name, None, None, None
+    perspective = match.group("perspective")
+    return (
+        match.group("kind"),
+        int(perspective) if perspective is not None else None,
+        int(match.group("round")),
+        match.group("part"),
+    )
+
+
+def is_artifact(name: str) -> bool:
+    """Tell topic artifacts apart from other files living in a topic directory"""
+    return name in NAMED_ARTIFACTS or bool(ROUND_ARTIFACT_PATTERN.fullmatch(name))
+
+
+def consilio_home() -> Path:
+    """Directory for state shared across topics (CONSILIO_HOME, default ~/.consilio)"""
+    home = Path(os.environ.get("CONSILIO_HOME", Path.home() / ".consilio"))
+    home.mkdir(parents=True, exist_ok=True)
+    return home
+
+
+def open_storage(directory: Path, engine: str = "files") -> TopicStorage:
+    """Open the storage engine configured for a topic directory"""
+    assert engine in ENGINES, f"Unknown storage engine {engine!r}, expected {ENGINES}"
+    if engine == "sqlite":
+        return SqliteStorage(directory / DATABASE)
+    return FileStorage(directory)
+
+
+class FileStorage:
+    """One file per artifact inside the topic directory"""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def read(self, name: str) -> str | None:
+        path = self.directory / name
+        return path.read_text() if path.exists() else None
+
+    def write(self, name: str, content: str) -> None:
+        # Write a hidden sibling and rename it into place, so readers never see
+        # a half-written artifact and concurrent writers never interleave
+        with tempfile.NamedTemporaryFile(
+            "w",
+            dir=self.directory,
+            prefix=f".{name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as temp:
+            try:
+                temp.write(content)
+                temp.flush()
+                os.fsync(temp.fileno())
+                temp.close()
+                Path(temp.name).replace(self.directory / name)
+            except BaseException:
+                Path(temp.name).unlink(missing_ok=True)
+                raise
+
+    def write_many(self, records: dict[str, str]) -> None:
+        for name, content in records.items():
+            self.write(name, content)
+
+    def exists(self, name: str) -> bool:
+        return (self.directory / name).exists()
+
+    def names(self) -> Iterator[str]:
+        return (p.name for p in sorted(self.directory.iterdir()) if is_artifact(p.name))
+
+    def latest_rounds(self, kind: str) -> dict[int | None, int]:
+        rounds: dict[int | None, int] = {}
+        for path in self.directory.glob(f"{kind}-*-response.md"):
+            artifact_kind, perspective, round_num, _ = classify(path.name)
+            if artifact_kind == kind and round_num is not None:
+                rounds[perspective] = max(rounds.get(perspective, 0), round_num)
+        return rounds
+
+
+class SqliteStorage:
+    """All artifacts of a topic in one SQLite database running in WAL mode"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS artifacts (
+            name TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            perspective_index INTEGER,
+            round_num INTEGER,
+            part TEXT,
+            content TEXT NOT NULL,
+            updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE INDEX IF NOT EXISTS artifacts_rounds
+            ON artifacts (kind, part, perspective_index, round_num);
+    """
+    UPSERT = """
+        INSERT INTO artifacts (name, kind, perspective_index, round_num, part, content)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (name) DO UPDATE SET
+            content = excluded.content,
+            updated_at = CURRENT_TIMESTAMP
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Per-thread connection so transactions never interleave"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            logger = logging.getLogger("consilio.storage")
+            logger.debug("Opening SQLite storage at %s", self.path)
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(self.SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements inside one write transaction"""
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def read(self, name: str) -> str | None:
+        row = self.connection.execute(
+            "SELECT content FROM artifacts WHERE name = ?",
+            (name,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def write(self, name: str, content: str) -> None:
+        self.write_many({name: content})
+
+    def write_many(self, records: dict[str, str]) -> None:
+        with self.transaction() as connection:
+            connection.executemany(
+                self.UPSERT,
+                [(name, *classify(name), content) for name, content in records.items()],
+            )
+
+    def exists(self, name: str) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM artifacts WHERE name = ?",
+            (name,),
+        ).fetchone()
+        return row is not None
+
+    def names(self) -> Iterator[str]:
+        cursor = self.connection.execute("SELECT name FROM artifacts ORDER BY name")
+        return (row[0] for row in cursor)
+
+    def latest_rounds(self, kind: str) -> dict[int | None, int]:
+        rows = self.connection.execute(
+            """
+            SELECT perspective_index, MAX(round_num) FROM artifacts
+            WHERE kind = ? AND part = 'response'
+            GROUP BY perspective_index
+            """,
+            (kind,),
+        )
+        return dict(rows.fetchall())
@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from consilio.models import Topic
+from consilio.storage import DESCRIPTION, FileStorage, classify, is_artifact
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("discussion-r3-response.md", ("discussion", None, 3, "response")),
+        ("interview-p2-r1-input.md", ("interview", 2, 1, "input")),
+        ("discussion-r2-prompt.md", ("discussion", None, 2, "prompt")),
+        ("README.md", ("README.md", None, None, None)),
+    ],
+)
+def test_classify(name: str, expected: tuple) -> None:
+    assert classify(name) == expected
+
+
+def test_is_artifact() -> None:
+    assert is_artifact("perspectives.json")
+    assert is_artifact("discussion-r1-input.md")
+    assert not is_artifact("cons.toml")
+    assert not is_artifact(".discussion-r1-input.md.abc.tmp")
+
+
+def test_read_write_exists(topic: Topic) -> None:
+    assert topic.storage.read("clarification.json") is None
+    assert not topic.storage.exists("clarification.json")
+    topic.storage.write("clarification.json", "{}")
+    topic.storage.write("clarification.json", '{"a": 1}')
+    assert topic.storage.read("clarification.json") == '{"a": 1}'
+    assert topic.storage.exists("clarification.json")
+
+
+def test_write_many_and_names(topic: Topic) -> None:
+    topic.storage.write_many(
+        {
+            "discussion-r1-input.md": "first",
+            "discussion-r1-response.md": "[]",
+            "perspectives.json": "[]",
+        },
+    )
+    assert list(topic.storage.names()) == [
+        DESCRIPTION,
+        "discussion-r1-input.md",
+        "discussion-r1-response.md",
+        "perspectives.json",
+    ]
+
+
+def test_latest_rounds(topic: Topic) -> None:
+    assert topic.storage.latest_rounds("discussion") == {}
+    topic.storage.write_many(
+        {
+            "discussion-r1-response.md": "[]",
+            "discussion-r2-response.md": "[]",
+            # Input without a response does not count as a finished round
+            "discussion-r3-input.md": "next",
+            "interview-p0-r1-response.md": "{}",
+            "interview-p0-r2-response.md": "{}",
+            "interview-p4-r1-response.md": "{}",
+        },
+    )
+    assert topic.storage.latest_rounds("discussion") == {None: 2}
+    assert topic.storage.latest_rounds("interview") == {0: 2, 4: 1}
+    assert topic.latest_discussion_round == 2
+    assert topic.get_latest_interview_round(4) == 1
+
+
+def test_writes_leave_no_temporary_files(topic: Topic) -> None:
+    topic.storage.write("perspectives.json", "[]")
+    assert not list(topic.directory.glob(".*.tmp"))
+
+
+def test_failed_file_write_leaves_no_temporary_file(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(_: int) -> None:
+        raise OSError
+
+    monkeypatch.setattr(os, "fsync", fail)
+    with pytest.raises(OSError):
+        FileStorage(tmp_path).write("perspectives.json", "[]")
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,172 @@
+"""Summarise long topics with a parallel map-reduce
+
+Each discussion round and interview thread is summarised on its own (map),
+then the summaries are combined FAN_IN at a time until one is left (reduce).
+Every summary is cached in summaries.json under the hash of the prompt that
+produced it, so after a new round only that round and the reduce steps above
+it are sent to the model again.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import click
+
+from consilio.cascade import get_cascaded_response
+from consilio.locking import artifact_lock
+from consilio.manifest import content_hash
+from consilio.models import Discussion, Summary, Topic, display_summary
+from consilio.storage import SUMMARIES
+from consilio.utils import render_template
+
+FAN_IN = 4
+
+
+@dataclass
+class SummaryCache:
+    """Summaries by prompt hash, plus the entries this run used"""
+
+    entries: dict[str, Summary]
+    used: set[str]
+
+
+def topic_chunks(topic: Topic) -> dict[str, str]:
+    """Split a topic's history into labelled chunks, in chronological order"""
+    chunks = {}
+    for round_num in range(1, topic.latest_discussion_round + 1):
+        user_input = topic.storage.read(topic.discussion_input_name(round_num))
+        text = f"Moderator: {user_input}\n\n" if user_input else ""
+        text += "".join(d.to_markdown() for d in topic.discussions(round_num))
+        chunks[f"discussion round {round_num}"] = text
+
+    perspectives = topic.perspectives
+    for index, latest in sorted(topic.storage.latest_rounds("interview").items()):
+        assert index is not None, "Interview artifacts always carry a perspective"
+        title = perspectives[index].title if index < len(perspectives) else index
+        text = ""
+        for round_num in range(1, latest + 1):
+            question = topic.storage.read(topic.interview_input_name(index, round_num))
+            response = topic.storage.read(
+                topic.interview_response_name(index, round_num),
+            )
+            text += f"Question: {question or ''}\n\n"
+            if response:
+                text += f"{Discussion.model_validate_json(response).opinion}\n\n"
+        chunks[f"interview with {title}"] = text
+    return chunks
+
+
+def load_cache(topic: Topic) -> SummaryCache:
+    """Load the cached summaries of a topic"""
+    stored = json.loads(topic.storage.read(SUMMARIES) or "{}")
+    entries = {key: Summary.model_validate(value) for key, value in stored.items()}
+    return SummaryCache(entries=entries, used=set())
+
+
+def _summarise(topic: Topic, cache: SummaryCache, prompt: str) -> Summary:
+    key = content_hash(prompt)
+    assert key is not None
+    cache.used.add(key)
+    if key not in cache.entries:
+        cache.entries[key] = get_cascaded_response(topic, prompt, Summary)
+    return cache.entries[key]
+
+
+def summarise_chunks(
+    topic: Topic,
+    chunks: dict[str, str],
+    cache: SummaryCache,
+    jobs: int = 4,
+) -> list[Summary]:
+    """Map step: summarise every chunk in parallel"""
+    prompts = [
+        render_template("summarize_chunk.j2", topic=topic, label=label, content=text)
+        for label, text in chunks.items()
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(lambda p: _summarise(topic, cache, p), prompts))
+
+
+def combine_summaries(
+    topic: Topic,
+    summaries: list[Summary],
+    cache: SummaryCache,
+    jobs: int = 4,
+) -> Summary:
+    """Reduce step: combine summaries FAN_IN at a time until one is left"""
+    logger = logging.getLogger("consilio.summary")
+    while len(summaries) > 1:
+        logger.debug("Combining %s summaries", len(summaries))
+        prompts = [
+            render_template(
+                "combine_summaries.j2",
+                topic=topic,
+                summaries=summaries[i : i + FAN_IN],
+            )
+            for i in range(0, len(summaries), FAN_IN)
+        ]
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            summaries = list(pool.map(lambda p: _summarise(topic, cache, p), prompts))
+    return summaries[0]
+
+
+def save_cache(topic: Topic, cache: SummaryCache, *, prune: bool = True) -> None:
+    """Store the cached summaries, pruned to the ones this run used
+
+    Only a finished run knows which summaries are outdated, so an interrupted
+    one keeps them all.
+    """
+    keys = cache.used if prune else cache.entries.keys()
+    with artifact_lock(topic, SUMMARIES):
+        stored = {
+            key: cache.entries[key].model_dump()
+            for key in sorted(keys)
+            if key in cache.entries
+        }
+        topic.storage.write(SUMMARIES, json.dumps(stored, indent=2))
+
+
+def summarise_topic(topic: Topic, jobs: int = 4) -> Summary:
+    """Summarise a topic's whole history, reusing cached chunk summaries"""
+    logger = logging.getLogger("consilio.summary")
+    chunks = topic_chunks(topic)
+    if not chunks:
+        msg = "Nothing to summarise yet. Start with 'cons discuss' or 'cons interview'"
+        raise click.ClickException(msg)
+
+    cache = load_cache(topic)
+    known = set(cache.entries)
+    try:
+        summary = combine_summaries(
+            topic,
+            summarise_chunks(topic, chunks, cache, jobs),
+            cache,
+            jobs,
+        )
+    except BaseException:
+        # Keep the summaries already paid for, so a retry only asks for the rest
+        save_cache(topic, cache, prune=False)
+        raise
+    save_cache(topic, cache)
+    logger.info(
+        "Summarised %s chunks with %s model calls (%s cached)",
+        len(chunks),
+        len(cache.used - known),
+        len(cache.used & known),
+    )
+    return summary
+
+
+@click.command()
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(1, 32),
+    default=4,
+    help="Parallel summary requests",
+)
+def summary(jobs: int) -> None:
+    """Summarise the topic's discussions and interviews"""
+    display_summary(summarise_topic(Topic.load(), jobs))
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from consilio import summary
+from consilio.models import Summary, Topic
+from consilio.storage import SUMMARIES
+
+
+@pytest.fixture
+def three_rounds(topic: Topic) -> Topic:
+    for round_num in range(1, 4):
+        topic.storage.write(topic.discussion_response_name(round_num), "[]")
+    return topic
+
+
+@pytest.fixture
+def prompts(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Prompts sent to the model, which fails on combining while it is empty"""
+    sent: list[str] = []
+    failing = [True]
+
+    def respond(_: Topic, prompt: str, *__: object) -> Summary:
+        if failing[0] and "Combine them" in prompt:
+            failing[0] = False
+            raise RuntimeError
+        sent.append(prompt)
+        return Summary(summary=prompt[-40:], key_points=[], open_questions=[])
+
+    monkeypatch.setattr(summary, "get_cascaded_response", respond)
+    return sent
+
+
+def test_failed_reduce_keeps_the_chunk_summaries(
+    three_rounds: Topic,
+    prompts: list[str],
+) -> None:
+    with pytest.raises(RuntimeError):
+        summary.summarise_topic(three_rounds, jobs=1)
+    assert len(json.loads(three_rounds.storage.read(SUMMARIES) or "{}")) == 3
+
+    prompts.clear()
+    summary.summarise_topic(three_rounds, jobs=1)
+    assert len(prompts) == 1
+    assert "Combine them" in prompts[0]
+
+
+def test_outdated_summaries_are_pruned_after_a_run(
+    three_rounds: Topic,
+    prompts: list[str],
+) -> None:
+    cache = summary.load_cache(three_rounds)
+    cache.entries["outdated"] = Summary(summary="", key_points=[], open_questions=[])
+    summary.save_cache(three_rounds, cache, prune=False)
+    with pytest.raises(RuntimeError):
+        summary.summarise_topic(three_rounds, jobs=1)
+    assert "outdated" in json.loads(three_rounds.storage.read(SUMMARIES) or "{}")
+
+    summary.summarise_topic(three_rounds, jobs=1)
+    stored = json.loads(three_rounds.storage.read(SUMMARIES) or "{}")
+    assert "outdated" not in stored
+    assert len(stored) == 4
+    assert len(prompts) == 4
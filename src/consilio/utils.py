@@ -1,70 +1,192 @@
-import json
+import functools
 import logging
 import os
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import click
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from consilio.logging import log_transcript
+from consilio.models import response_adapter
 
-def render_template(template_name: str, **kwargs: Any) -> str:  # noqa: ANN401
-    """Render a Jinja2 template with the given context"""
-    templates_dir = Path(__file__).parent / "prompts"
-    env = Environment(
-        loader=FileSystemLoader(templates_dir),
+MODEL = "gemini-2.0-pro-exp-02-05"
+TEMPLATES_DIR = Path(__file__).parent / "prompts"
+# Providers refuse to cache contexts smaller than this
+MIN_CACHED_TOKENS = 4096
+CACHE_TTL = "900s"
+
+
+@dataclass
+class LLMSession:
+    """Input-independent request state that can be prepared ahead of time"""
+
+    system_prompt: str
+    model: str = MODEL
+    prefix: str = ""
+    prefix_tokens: int | None = None
+    cache_name: str | None = None
+    # Earlier conversation turns, sent ahead of the prompt as structured contents
+    turns: list[types.Content] = field(default_factory=list)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap offline token estimate (~4 characters per token)"""
+    return len(text) // 4
+
+
+@functools.cache
+def _template_environment() -> Environment:
+    return Environment(
+        loader=FileSystemLoader(TEMPLATES_DIR),
         autoescape=select_autoescape(),
     )
-    template = env.get_template(template_name)
+
+
+def render_template(template_name: str, **kwargs: Any) -> str:  # noqa: ANN401
+    """Render a Jinja2 template with the given context"""
+    template = _template_environment().get_template(template_name)
     return template.render(**kwargs)
 
 
+@functools.cache
+def get_client() -> genai.Client:
+    """Create the LLM client once per process"""
+    api_key = os.getenv("GOOGLE_API_KEY")
+    if not api_key:
+        api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        msg = "GOOGLE_API_KEY environment variable not set"
+        raise click.ClickException(msg)
+    return genai.Client(api_key=api_key)
+
+
+def user_turn(text: str) -> types.Content:
+    """A conversation turn written by us"""
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def model_turn(text: str) -> types.Content:
+    """A conversation turn the model answered earlier"""
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
+
+class TruncatedResponseError(ValueError):
+    """The model stopped at its output token limit"""
+
+
+def open_llm_session(
+    prefix: str = "",
+    model: str = MODEL,
+    turns: list[types.Content] | None = None,
+) -> LLMSession:
+    """Prepare client, system prompt and (when large enough) a cached prompt prefix
+
+    The prefix is either the input-independent start of a text prompt or, for
+    conversations, the earlier turns.
+    """
+    logger = logging.getLogger("consilio.utils")
+    client = get_client()
+    session = LLMSession(
+        system_prompt=render_template("system.j2"),
+        model=model,
+        prefix=prefix,
+        turns=turns or [],
+    )
+    cached_contents = session.turns or ([user_turn(prefix)] if prefix else [])
+    if not cached_contents:
+        return session
+
+    try:
+        session.prefix_tokens = client.models.count_tokens(
+            model=model,
+            contents=[user_turn(session.system_prompt), *cached_contents],
+        ).total_tokens
+        logger.debug("Prompt prefix has %s tokens", session.prefix_tokens)
+        if (session.prefix_tokens or 0) >= MIN_CACHED_TOKENS:
+            cache = client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=session.system_prompt,
+                    contents=cached_contents,
+                    ttl=CACHE_TTL,
+                ),
+            )
+            session.cache_name = cache.name
+            logger.debug("Prompt prefix cached as %s", session.cache_name)
+    except errors.APIError as e:
+        logger.info("Prompt prefix not cached: %s", e)
+    return session
+
+
 def get_llm_response(
     prompt: str,
-    response_definition: type | None = None,
+    response_definition: Any = None,  # noqa: ANN401
     temperature: float = 1.0,
-) -> dict[str, str | list | dict]:
+    session: LLMSession | None = None,
+    model: str | None = None,
+) -> Any:  # noqa: ANN401
     """Get response from LLM API
 
     Args:
         prompt: The prompt to send to the LLM
         system_prompt: Optional system prompt to set context (defaults to expert panel coordinator)
-        model: Optional model name to use (defaults to config)
+        model: Optional model name to use (defaults to the session's model)
         temperature: Controls randomness in the response (0.0-1.0, default 1.0)
-        response_definition: Optional JSON schema or description of expected response format
+        response_definition: Optional response type (e.g. `list[Discussion]`); the
+            response is validated into it in a single pass
+        session: Optional session prepared ahead of time by `open_llm_session`
     """
     logger = logging.getLogger("consilio.utils")
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        msg = "GOOGLE_API_KEY environment variable not set"
-        raise click.ClickException(msg)
-    client = genai.Client(api_key=api_key)
-
-    system_prompt = render_template("system.j2")
-    logger.debug("System prompt: %s", system_prompt)
-    logger.debug("User prompt: %s", prompt)
+    client = get_client()
+    session = session or open_llm_session()
+    model = model or session.model
+    log_transcript("system prompt", session.system_prompt)
+    log_transcript("prompt", prompt)
+    logger.debug(
+        "Sending prompt (%s chars) after %s earlier turns",
+        len(prompt),
+        len(session.turns),
+    )
 
-    config_args = {
-        "system_instruction": system_prompt,
+    config_args: dict[str, Any] = {
+        "system_instruction": session.system_prompt,
         "temperature": temperature,
         "response_mime_type": "application/json",
     }
     if response_definition is not None:
         config_args["response_schema"] = response_definition
 
+    # With a cached prefix only the remainder (the user's input) goes over the wire
+    remainder = prompt.removeprefix(session.prefix)
+    cache_usable = session.cache_name and session.model == model
+    contents = [*session.turns, user_turn(prompt)]
+    if cache_usable and session.turns:
+        del config_args["system_instruction"]
+        config_args["cached_content"] = session.cache_name
+        contents = [user_turn(prompt)]
+    elif cache_usable and remainder != prompt and remainder.strip():
+        del config_args["system_instruction"]
+        config_args["cached_content"] = session.cache_name
+        contents = [user_turn(remainder)]
+
     config = types.GenerateContentConfig(**config_args)
     response = client.models.generate_content(
         # model="gemini-2.0-flash-thinking-exp-01-21",
-        model="gemini-2.0-pro-exp-02-05",
-        contents=[types.Part(text=prompt)],
+        model=model,
+        contents=contents,
         config=config,
     )
-    logger.debug("Response: %s", response.text)
-    return json.loads(response.text)  # type: ignore
+    log_transcript("response", response.text or "")
+    logger.debug("Response received (%s chars)", len(response.text or ""))
+    if response.candidates and (
+        response.candidates[0].finish_reason == types.FinishReason.MAX_TOKENS
+    ):
+        raise TruncatedResponseError(f"{model} response was truncated")
+    return response_adapter(response_definition or Any).validate_json(response.text)  # type: ignore
 
 
 if __name__ == "__main__":
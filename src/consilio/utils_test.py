@@ -0,0 +1,52 @@
+import pytest
+from google.genai import types
+from pydantic import ValidationError
+
+from consilio.loadtest import stub_llm
+from consilio.models import Discussion
+from consilio.utils import TruncatedResponseError, get_llm_response
+
+
+def answer(
+    monkeypatch: pytest.MonkeyPatch, client: object, text: str, reason: str
+) -> None:
+    """Make the stub client reply with text and a finish reason"""
+    response = types.GenerateContentResponse(
+        candidates=[
+            types.Candidate(
+                content=types.Content(parts=[types.Part(text=text)]),
+                finish_reason=types.FinishReason(reason),
+            ),
+        ],
+    )
+    monkeypatch.setattr(client.models, "generate_content", lambda **_: response)
+
+
+def test_responses_are_validated_into_models(monkeypatch: pytest.MonkeyPatch) -> None:
+    with stub_llm(latency=0.0, error_rate=0.0) as client:
+        answer(
+            monkeypatch, client, '[{"perspective": "CFO", "opinion": "Wait"}]', "STOP"
+        )
+        response = get_llm_response("Decide", list[Discussion])
+    assert response == [Discussion(perspective="CFO", opinion="Wait")]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ['[{"perspective": "CFO"}]', '{"perspective": "CFO", "opinion": "Wait"}', "[{"],
+)
+def test_malformed_responses_are_rejected(
+    monkeypatch: pytest.MonkeyPatch,
+    text: str,
+) -> None:
+    with stub_llm(latency=0.0, error_rate=0.0) as client:
+        answer(monkeypatch, client, text, "STOP")
+        with pytest.raises(ValidationError):
+            get_llm_response("Decide", list[Discussion])
+
+
+def test_truncated_responses_are_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    with stub_llm(latency=0.0, error_rate=0.0) as client:
+        answer(monkeypatch, client, '[{"perspective": "CFO", "opin', "MAX_TOKENS")
+        with pytest.raises(TruncatedResponseError):
+            get_llm_response("Decide", list[Discussion])